@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+from .http_client import FetchResult, HttpClient
+from .retry_policy import compute_retry_delay
+
+
+class AsyncFetchEngine:
+    """
+    Asynchrone Abruf-Engine fuer die Link-Suche und die Inhalts-Extraktion.
+    `max_in_flight` begrenzt die gleichzeitig bearbeiteten URLs, `max_workers` die Threads.
+    Eine URL ist "in flight", sobald sie zugelassen ist; sie belegt aber nur waehrend der
+    eigentlichen Anfrage (requests, blockierend) einen Thread. Wartezeiten des HostSchedulers
+    und Retry-Backoffs laufen in der Event-Loop, daher duerfen deutlich mehr URLs in flight sein
+    als Threads existieren; mehr gleichzeitige Anfragen als `concurrency["max"]` laesst der
+    Concurrency-Controller ohnehin nicht zu. Zusaetzlich gilt ein Limit pro Host; das
+    Abruf-Ergebnis wird an eine Parser-Funktion uebergeben.
+    """
+
+    def __init__(self, max_in_flight: int = 200, max_per_host: int = 8,
+                 retries: int = 3, backoff_factor: int = 3, max_workers: int | None = None):
+        self.max_in_flight = max_in_flight
+        self.max_workers = max_workers or max_in_flight
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+    @classmethod
+    def from_settings(cls, settings) -> 'AsyncFetchEngine':
+        """Erstellt die Engine; der Thread-Pool ist auf das Concurrency-Maximum (`concurrency["max"]`) begrenzt."""
+        return cls(settings.max_requests_in_flight, settings.max_requests_per_host,
+                   max_workers=settings.concurrency.get("max", 32))
+
+    async def _fetch_with_retries(self, url: str, loop, executor, store_validators: bool = True,
+                                  revalidate: bool = True) -> FetchResult:
+        """
+        Laedt eine URL im Executor. Voruebergehende Fehler werden gemaess Retry-After bzw.
+        Backoff wiederholt, ohne die Event-Loop zu blockieren.
+        """
+        result = None
+        for attempt in range(self.retries):
+            if HttpClient.host_scheduler:
+                await HttpClient.host_scheduler.acquire_async(url)
+            result = await loop.run_in_executor(executor, partial(HttpClient.fetch, url, revalidate=revalidate, paced=False,
+                                                                  store_validators=store_validators))
+            wait_time = compute_retry_delay(result, attempt, self.retries, self.backoff_factor)
+            if wait_time is None:
+                return result
+
+            print(f"[AsyncFetchEngine] {result.outcome.value} bei {url}. Warte {wait_time:.1f}s vor Versuch {attempt + 2}...")
+            await asyncio.sleep(wait_time)
+        return result
+
+    async def _fetch_one(self, url: str, handler: Callable[[str, FetchResult], Any],
+                         global_limit: asyncio.Semaphore, host_limits: dict, loop, executor,
+                         store_validators: bool = True, unconditional: frozenset = frozenset()):
+        host = urlparse(url).netloc
+        host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with global_limit, host_limit:
+            result = await self._fetch_with_retries(url, loop, executor, store_validators, url not in unconditional)
+        return await loop.run_in_executor(executor, handler, url, result)
+
+    async def _fetch_all(self, urls: list[str], handler: Callable[[str, FetchResult], Any],
+                         store_validators: bool = True, unconditional: frozenset = frozenset()) -> list:
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.max_in_flight)
+        host_limits = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tasks = [self._fetch_one(url, handler, global_limit, host_limits, loop, executor, store_validators,
+                                     unconditional) for url in urls]
+            return await asyncio.gather(*tasks)
+
+    def fetch_all(self, urls: list[str], handler: Callable[[str, FetchResult], Any],
+                  store_validators: bool = True, unconditional=()) -> list:
+        """
+        Laedt alle URLs nebenlaeufig (per Conditional GET) und ruft `handler(url, result)`
+        fuer jede URL auf. `result.content` ist None, wenn der Abruf endgueltig fehlgeschlagen
+        oder die Seite unveraendert ist. `store_validators` wird an HttpClient.fetch weitergereicht;
+        URLs aus `unconditional` werden ohne Conditional GET geladen.
+        Die Ergebnisse werden in der Reihenfolge der Eingabe zurueckgegeben.
+        """
+        if not urls:
+            return []
+        print(f"[AsyncFetchEngine] Lade {len(urls)} URLs (max. {self.max_in_flight} gleichzeitig, "
+              f"{self.max_per_host} pro Host, {self.max_workers} Threads)...")
+        return asyncio.run(self._fetch_all(urls, handler, store_validators, frozenset(unconditional)))
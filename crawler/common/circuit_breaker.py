@@ -0,0 +1,58 @@
+import threading
+import time
+
+from .run_stats import run_stats
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker pro Host. Nach `failure_threshold` aufeinanderfolgenden Fehlern
+    (Timeouts, Verbindungsfehler, 429/5xx) wird der Host fuer `reset_timeout` Sekunden
+    gesperrt. Danach ist genau ein Probeaufruf erlaubt; schlaegt er fehl, bleibt der
+    Host weiter gesperrt, ein Erfolg schliesst den Breaker wieder.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> 'CircuitBreaker':
+        """Erstellt den Breaker aus dem Eintrag `circuit_breaker` der Benutzereinstellungen."""
+        config = settings.circuit_breaker
+        return cls(config.get("failure_threshold", 5), config.get("reset_timeout", 300.0))
+
+    def allow(self, host: str) -> bool:
+        """Prueft, ob eine Anfrage an den Host gestellt werden darf."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if not state or state["opened_at"] is None:
+                return True
+            if time.monotonic() - state["opened_at"] >= self.reset_timeout and not state["trial_in_flight"]:
+                state["trial_in_flight"] = True
+                return True
+            return False
+
+    def record(self, host: str, failed: bool):
+        """Meldet das Ergebnis einer Anfrage an den Host."""
+        with self._lock:
+            if not failed:
+                self._hosts.pop(host, None)
+                return
+
+            state = self._hosts.setdefault(host, {"failures": 0, "opened_at": None, "trial_in_flight": False})
+            state["failures"] += 1
+            was_open = state["opened_at"] is not None
+            state["trial_in_flight"] = False
+            if was_open or state["failures"] >= self.failure_threshold:
+                state["opened_at"] = time.monotonic()
+                if not was_open:
+                    print(f"[CircuitBreaker] {host} nach {state['failures']} Fehlern in Folge gesperrt.")
+                    run_stats.increment("circuits_opened")
+
+    def open_hosts(self) -> list[str]:
+        """Gibt alle aktuell gesperrten Hosts zurueck."""
+        with self._lock:
+            return sorted(host for host, state in self._hosts.items() if state["opened_at"] is not None)
@@ -0,0 +1,91 @@
+import threading
+
+
+class AdaptiveConcurrencyController:
+    """
+    Passt die Anzahl gleichzeitiger Anfragen global und pro Host nach dem AIMD-Prinzip an:
+    Jede erfolgreiche, zuegige Antwort erhoeht das Limit additiv, Timeouts, 429/5xx-Antworten,
+    Verbindungsfehler und deutlich steigende Antwortzeiten senken es multiplikativ.
+    """
+    GLOBAL_DECREASE_FACTOR = 0.75
+    LATENCY_SMOOTHING = 0.2
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 32,
+                 per_host_initial: int = 2, per_host_max: int = 8,
+                 latency_factor: float = 3.0, decrease_factor: float = 0.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.per_host_initial = per_host_initial
+        self.per_host_max = per_host_max
+        self.latency_factor = latency_factor
+        self.decrease_factor = decrease_factor
+
+        self.global_limit = float(min(max(initial, minimum), maximum))
+        self.host_limits = {}
+        self._in_flight = 0
+        self._host_in_flight = {}
+        self._latency = {}
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_settings(cls, settings) -> 'AdaptiveConcurrencyController':
+        """Erstellt den Controller aus dem Eintrag `concurrency` der Benutzereinstellungen."""
+        config = settings.concurrency
+        return cls(
+            initial=config.get("initial", 4), minimum=config.get("min", 1), maximum=config.get("max", 32),
+            per_host_initial=config.get("per_host_initial", 2), per_host_max=settings.max_requests_per_host,
+            latency_factor=config.get("latency_factor", 3.0)
+        )
+
+    def _host_limit(self, host: str) -> float:
+        return self.host_limits.setdefault(host, float(min(self.per_host_initial, self.per_host_max)))
+
+    def _has_capacity(self, host: str) -> bool:
+        return (self._in_flight < int(self.global_limit)
+                and self._host_in_flight.get(host, 0) < int(self._host_limit(host)))
+
+    def acquire(self, host: str):
+        """Blockiert, bis global und fuer den Host ein freier Anfrage-Slot verfuegbar ist."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._has_capacity(host))
+            self._in_flight += 1
+            self._host_in_flight[host] = self._host_in_flight.get(host, 0) + 1
+
+    def release(self, host: str, latency: float | None, outcome):
+        """
+        Gibt einen Slot frei und passt die Limits an. `outcome` ist der HTTP-Statuscode
+        oder 'timeout' bzw. 'error' fuer Anfragen ohne Antwort.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._host_in_flight[host] -= 1
+            self._adjust(host, latency, outcome)
+            self._condition.notify_all()
+
+    def _is_slow(self, host: str, latency: float) -> bool:
+        """Fuehrt einen gleitenden Mittelwert der Antwortzeit und vergleicht ihn mit der besten Zeit."""
+        stats = self._latency.setdefault(host, {"ewma": latency, "min": latency})
+        stats["ewma"] = (1 - self.LATENCY_SMOOTHING) * stats["ewma"] + self.LATENCY_SMOOTHING * latency
+        stats["min"] = min(stats["min"], latency)
+        return stats["ewma"] > self.latency_factor * max(stats["min"], 0.05)
+
+    def _adjust(self, host: str, latency: float | None, outcome):
+        host_limit = self._host_limit(host)
+        throttled = outcome in ("timeout", "error") or (isinstance(outcome, int) and (outcome == 429 or outcome >= 500))
+
+        if throttled or (latency is not None and self._is_slow(host, latency)):
+            self.host_limits[host] = max(1.0, host_limit * self.decrease_factor)
+        else:
+            self.host_limits[host] = min(float(self.per_host_max), host_limit + 1 / host_limit)
+            self.global_limit = min(float(self.maximum), self.global_limit + 1 / self.global_limit)
+
+        if outcome == "timeout":
+            self.global_limit = max(float(self.minimum), self.global_limit * self.GLOBAL_DECREASE_FACTOR)
+
+    def limits(self) -> dict:
+        """Momentaufnahme der aktuellen Limits fuer die Laufstatistik."""
+        with self._condition:
+            return {
+                "global": int(self.global_limit),
+                "hosts": {host: int(limit) for host, limit in sorted(self.host_limits.items())}
+            }
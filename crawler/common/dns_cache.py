@@ -0,0 +1,87 @@
+import ipaddress
+import socket
+import threading
+import time
+
+from urllib3.util import connection as urllib3_connection
+
+from .run_stats import run_stats
+
+_system_create_connection = urllib3_connection.create_connection
+
+
+class DnsCache:
+    """
+    Prozessweiter DNS-Cache fuer den Verbindungsaufbau von urllib3 (und damit requests).
+    Aufgeloeste Adressen werden `ttl` Sekunden wiederverwendet, statt bei jeder neuen
+    Verbindung erneut den System-Resolver zu fragen. Der Resolver ist austauschbar,
+    damit sich der Cache ohne Netzwerk testen laesst.
+    """
+
+    def __init__(self, resolver=socket.getaddrinfo, ttl: float = 300.0):
+        self.resolver = resolver
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> 'DnsCache':
+        """Erstellt den Cache aus dem Eintrag `dns_cache` der Benutzereinstellungen."""
+        return cls(ttl=settings.dns_cache.get("ttl", 300.0))
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Gibt die IP-Adressen fuer host:port zurueck, bei Bedarf frisch aufgeloest."""
+        key = (host.lower(), port)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                run_stats.increment("dns_cache_hits")
+                return entry[0]
+
+        run_stats.increment("dns_cache_misses")
+        addresses = []
+        for _, _, _, _, sockaddr in self.resolver(host, port, 0, socket.SOCK_STREAM):
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        if addresses:
+            with self._lock:
+                self._entries[key] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        """Verwirft den Eintrag eines Hosts, z.B. wenn keine der Adressen erreichbar war."""
+        with self._lock:
+            self._entries.pop((host.lower(), port), None)
+
+    def create_connection(self, address, *args, **kwargs):
+        """
+        Ersatz fuer urllib3.util.connection.create_connection: verbindet der Reihe nach mit
+        den zwischengespeicherten Adressen. TLS (SNI, Zertifikatspruefung) arbeitet weiterhin
+        mit dem Hostnamen, da urllib3 den Socket erst danach umhuellt.
+        """
+        host, port = address
+        try:
+            ipaddress.ip_address(host.strip('[]'))
+            return _system_create_connection(address, *args, **kwargs)
+        except ValueError:
+            pass
+
+        last_error = None
+        for ip in self.resolve(host, port):
+            try:
+                return _system_create_connection((ip, port), *args, **kwargs)
+            except OSError as e:
+                last_error = e
+        self.invalidate(host, port)
+        if last_error is None:
+            raise socket.gaierror(f"Keine Adresse fuer {host} gefunden")
+        raise last_error
+
+    def install(self):
+        """Aktiviert den Cache fuer alle neuen Verbindungen von urllib3/requests."""
+        urllib3_connection.create_connection = self.create_connection
+
+    @staticmethod
+    def uninstall():
+        """Stellt den urspruenglichen Verbindungsaufbau von urllib3 wieder her."""
+        urllib3_connection.create_connection = _system_create_connection
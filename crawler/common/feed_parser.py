@@ -0,0 +1,136 @@
+import datetime
+import io
+import re
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator
+
+FEED_CONTENT_TYPES = (
+    'application/rss+xml', 'application/atom+xml', 'application/rdf+xml',
+    'application/feed+json', 'application/x-rss+xml'
+)
+FEED_ROOT_PATTERN = re.compile(rb'<(?:rss|feed|rdf:rdf)[\s>]')
+SNIFF_BYTES = 2048
+STALE_ENTRIES_BEFORE_STOP = 3
+
+
+def is_feed(content: bytes, content_type: str | None = None) -> bool:
+    """
+    Entscheidet anhand von Content-Type und den ersten Bytes, ob ein Dokument ein
+    RSS/Atom-Feed oder eine HTML-Seite ist. Viele Server liefern Feeds als text/html
+    oder text/xml aus, daher entscheidet im Zweifel das Wurzelelement.
+    """
+    mime_type = (content_type or '').split(';')[0].strip().lower()
+    if mime_type in FEED_CONTENT_TYPES:
+        return True
+
+    head = content[:SNIFF_BYTES].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if head.startswith(b'<!doctype html') or head.startswith(b'<html'):
+        return False
+
+    feed_root = FEED_ROOT_PATTERN.search(head)
+    if not feed_root:
+        return False
+    html_pos = head.find(b'<html')
+    return html_pos == -1 or feed_root.start() < html_pos
+
+
+def _local_name(tag: str) -> str:
+    """Entfernt den XML-Namespace aus einem Tag, z.B. '{http://www.w3.org/2005/Atom}entry' -> 'entry'."""
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def parse_feed_date(value: str | None) -> datetime.datetime | None:
+    """Parst RFC-822-Daten (RSS) und ISO-8601-Daten (Atom, Dublin Core) nach UTC."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+def _entry_from_element(element) -> dict:
+    """Baut aus einem <item>- bzw. <entry>-Element einen Eintrag mit feedparser-kompatiblen Schluesseln."""
+    entry = {}
+    for child in element:
+        name = _local_name(child.tag)
+        text = (child.text or '').strip()
+        if name == 'link':
+            href = child.get('href')
+            if href is None and text:
+                entry.setdefault('link', text)
+            elif href and child.get('rel', 'alternate') == 'alternate':
+                entry.setdefault('link', href.strip())
+        elif name == 'guid' and text and child.get('isPermaLink', 'true') == 'true':
+            entry.setdefault('guid_link', text)
+        elif name in ('pubdate', 'published', 'issued', 'date'):
+            entry.setdefault('published', parse_feed_date(text))
+        elif name in ('updated', 'modified'):
+            entry.setdefault('updated', parse_feed_date(text))
+        elif name in ('encoded', 'content'):
+            if child.get('type') == 'xhtml':
+                text = ''.join(ET.tostring(node, encoding='unicode') for node in child)
+            if text:
+                entry.setdefault('content', []).append({'value': text})
+
+    if 'link' not in entry and entry.get('guid_link', '').startswith('http'):
+        entry['link'] = entry['guid_link']
+    entry.pop('guid_link', None)
+    for key in ('published', 'updated'):
+        timestamp = entry.pop(key, None)
+        if timestamp:
+            entry[f'{key}_parsed'] = timestamp.utctimetuple()
+    return entry
+
+
+def entry_timestamp(entry) -> datetime.datetime | None:
+    """Liefert den juengsten Zeitpunkt (updated oder published) eines Feed-Eintrags in UTC."""
+    parsed_times = [entry.get(key) for key in ('updated_parsed', 'published_parsed')]
+    timestamps = [datetime.datetime(*t[:6], tzinfo=datetime.timezone.utc) for t in parsed_times if t]
+    return max(timestamps, default=None)
+
+
+def take_until_stale(entries: Iterable, stop_before: datetime.datetime | None = None) -> list:
+    """
+    Uebernimmt Feed-Eintraege, bis STALE_ENTRIES_BEFORE_STOP Eintraege in Folge aelter als
+    `stop_before` sind (Feeds sind neueste-zuerst sortiert). Bis dahin gelesene aeltere
+    Eintraege bleiben erhalten; ob sie schon verarbeitet wurden, entscheidet erst die Scan-Historie.
+    """
+    taken = []
+    stale_in_row = 0
+    for entry in entries:
+        taken.append(entry)
+        newest = entry_timestamp(entry)
+        if stop_before and newest and newest < stop_before:
+            stale_in_row += 1
+            if stale_in_row >= STALE_ENTRIES_BEFORE_STOP:
+                break
+        else:
+            stale_in_row = 0
+    return taken
+
+
+def _iterparse_entries(content: bytes) -> Iterator[dict]:
+    for _, element in ET.iterparse(io.BytesIO(content), events=('end',)):
+        if _local_name(element.tag) in ('item', 'entry'):
+            entry = _entry_from_element(element)
+            element.clear()
+            yield entry
+
+
+def iter_feed_entries(content: bytes, stop_before: datetime.datetime | None = None) -> list[dict]:
+    """
+    Schneller, streamender RSS/Atom-Leser auf Basis von ElementTree.iterparse. Liefert nur
+    Link, Zeitstempel und ggf. den Artikel-Body pro Eintrag. Das Lesen endet vorzeitig, sobald
+    mehrere Eintraege in Folge aelter als `stop_before` sind (siehe `take_until_stale`).
+    Wirft ET.ParseError bei fehlerhaftem XML; der Aufrufer faellt dann auf feedparser zurueck.
+    """
+    return take_until_stale(_iterparse_entries(content), stop_before)
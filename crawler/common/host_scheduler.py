@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable
+from urllib.parse import urlparse
+
+
+def interleave_by_host(items: list, key: Callable | None = None) -> list:
+    """
+    Ordnet URLs (bzw. Eintraege, deren URL `key` liefert) reihum nach Host an
+    (a1, b1, c1, a2, b2, ...); die Reihenfolge pro Host bleibt erhalten. Worker-Threads warten
+    im HostScheduler und im Concurrency-Controller blockierend auf einen Slot ihres Hosts.
+    Ein nach Host gruppierter Batch wuerde so alle Worker an einen dominanten Host binden,
+    waehrend Anfragen an andere Hosts liegen bleiben.
+    """
+    queues = {}
+    for item in items:
+        host = urlparse(key(item) if key else item).netloc.lower()
+        queues.setdefault(host, deque()).append(item)
+
+    interleaved = []
+    while queues:
+        for host in list(queues):
+            interleaved.append(queues[host].popleft())
+            if not queues[host]:
+                del queues[host]
+    return interleaved
+
+
+class HostScheduler:
+    """
+    Zentraler Hoeflichkeits-Scheduler mit einem Token-Bucket pro Host.
+    Jeder Host erhaelt `rate` Anfragen pro Sekunde mit einem Burst von `burst` Anfragen;
+    `crawl_delay` erzwingt zusaetzlich einen Mindestabstand zwischen zwei Anfragen.
+    Anfragen an verschiedene Hosts warten nie aufeinander.
+    """
+    DEFAULT_POLICY = {"rate": 2.0, "burst": 4, "crawl_delay": 0.0}
+
+    def __init__(self, default_policy: dict | None = None, domain_policies: dict | None = None):
+        self.default_policy = {**self.DEFAULT_POLICY, **(default_policy or {})}
+        self.domain_policies = {domain.lower(): policy for domain, policy in (domain_policies or {}).items()}
+        self._crawl_delays = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> 'HostScheduler':
+        """Erstellt den Scheduler aus dem Eintrag `host_politeness` der Benutzereinstellungen."""
+        politeness = settings.host_politeness
+        return cls(politeness.get("default"), politeness.get("domains"))
+
+    def policy_for(self, host: str) -> dict:
+        """
+        Liefert die Richtlinie fuer einen Host. Eine Domain-Regel gilt auch fuer alle
+        Subdomains (z.B. 'example.com' fuer 'www.example.com').
+        """
+        host = host.lower()
+        policy = dict(self.default_policy)
+        parts = host.split('.')
+        for i in range(len(parts)):
+            domain_policy = self.domain_policies.get('.'.join(parts[i:]))
+            if domain_policy:
+                policy.update(domain_policy)
+                break
+        if host in self._crawl_delays:
+            policy["crawl_delay"] = max(policy["crawl_delay"], self._crawl_delays[host])
+        return policy
+
+    def set_crawl_delay(self, host: str, crawl_delay: float):
+        """Hinterlegt einen extern ermittelten Crawl-Delay (z.B. aus robots.txt) fuer einen Host."""
+        host = host.lower()
+        with self._lock:
+            self._crawl_delays[host] = crawl_delay
+            if host in self._buckets:
+                self._buckets[host]["crawl_delay"] = float(self.policy_for(host)["crawl_delay"])
+
+    def _reserve(self, host: str) -> float:
+        """Reserviert den naechsten Slot fuer einen Host und gibt die Wartezeit in Sekunden zurueck."""
+        host = host.lower()
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                policy = self.policy_for(host)
+                bucket = {
+                    "rate": float(policy["rate"]), "burst": float(policy["burst"]),
+                    "crawl_delay": float(policy["crawl_delay"]),
+                    "tokens": float(policy["burst"]), "last_refill": now, "last_start": float('-inf')
+                }
+                self._buckets[host] = bucket
+
+            elapsed = now - bucket["last_refill"]
+            bucket["tokens"] = min(bucket["burst"], bucket["tokens"] + elapsed * bucket["rate"])
+            bucket["last_refill"] = now
+            bucket["tokens"] -= 1
+
+            token_ready = now if bucket["tokens"] >= 0 else now + (-bucket["tokens"]) / bucket["rate"]
+            start = max(token_ready, bucket["last_start"] + bucket["crawl_delay"])
+            bucket["last_start"] = start
+            return start - now
+
+    def acquire(self, url: str):
+        """Blockiert, bis fuer den Host der URL ein Anfrage-Slot frei ist."""
+        wait_time = self._reserve(urlparse(url).netloc)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self, url: str):
+        """Wie `acquire`, wartet aber, ohne die Event-Loop zu blockieren."""
+        wait_time = self._reserve(urlparse(url).netloc)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
@@ -0,0 +1,53 @@
+from bs4 import BeautifulSoup, UnicodeDammit
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+PARSER_BACKENDS = ("auto", "lxml", "html.parser")
+
+
+def resolve_parser_backend(name: str) -> str:
+    """
+    Bestimmt den BeautifulSoup-Parser fuer die Einstellung `html_parser`.
+    'auto' waehlt lxml, sofern installiert; sonst wird auf html.parser zurueckgefallen.
+    """
+    if name not in PARSER_BACKENDS:
+        print(f"[HtmlParser] WARNUNG: Unbekannter Parser '{name}'. Verwende 'auto'.")
+        name = "auto"
+    if name == "html.parser":
+        return name
+    if LXML_AVAILABLE:
+        return "lxml"
+    if name == "lxml":
+        print("[HtmlParser] WARNUNG: lxml ist nicht installiert. Verwende html.parser.")
+    return "html.parser"
+
+
+def charset_from_content_type(content_type: str | None) -> str | None:
+    """Liest das im Content-Type-Header deklarierte Charset aus, z.B. 'text/html; charset=utf-8'."""
+    if not content_type:
+        return None
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset' and value.strip():
+            return value.strip().strip('"\'').lower()
+    return None
+
+
+def parse_html(content: bytes, encoding: str | None = None, backend: str = "html.parser") -> BeautifulSoup:
+    """
+    Parst HTML-Bytes mit dem gewaehlten Backend. Ist das Encoding per HTTP bekannt,
+    wird es direkt uebergeben und die Zeichensatz-Erkennung entfaellt.
+    """
+    return BeautifulSoup(content, backend, from_encoding=encoding)
+
+
+def decode_html(content: bytes, encoding: str | None = None) -> str:
+    """
+    Dekodiert HTML-Bytes ohne einen Baum aufzubauen: zuerst mit dem per HTTP deklarierten
+    Encoding, sonst ueber die Zeichensatz-Erkennung von BeautifulSoup (BOM, <meta charset>).
+    """
+    return UnicodeDammit(content, [encoding] if encoding else [], is_html=True).unicode_markup or ''
@@ -1,19 +1,403 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from urllib.parse import urlparse
+
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+
+from .circuit_breaker import CircuitBreaker
+from .concurrency import AdaptiveConcurrencyController
+from .dns_cache import DnsCache
+from .host_scheduler import HostScheduler
+from .html_parser import charset_from_content_type, parse_html, resolve_parser_backend
+from .response_cache import ResponseCache
+from .retry_policy import parse_retry_after
+from .robots_cache import RobotsCache
+from .run_stats import run_stats
+
+
+class FetchOutcome(Enum):
+    """Art des Ergebnisses eines Abrufs."""
+    OK = "ok"
+    NOT_MODIFIED = "not_modified"
+    CLIENT_ERROR = "client_error"
+    SERVER_ERROR = "server_error"
+    THROTTLED = "throttled"
+    TIMEOUT = "timeout"
+    NETWORK_ERROR = "network_error"
+    CIRCUIT_OPEN = "circuit_open"
+    REJECTED = "rejected"
+
+
+RETRYABLE_OUTCOMES = {FetchOutcome.SERVER_ERROR, FetchOutcome.THROTTLED, FetchOutcome.TIMEOUT,
+                      FetchOutcome.NETWORK_ERROR}
+
+MARKUP_CONTENT_TYPES = {
+    'text/html', 'application/xhtml+xml', 'text/xml', 'application/xml',
+    'application/rss+xml', 'application/atom+xml', 'application/rdf+xml', 'text/plain'
+}
+GENERIC_CONTENT_TYPES = {'', 'application/octet-stream', 'binary/octet-stream'}
+GZIP_CONTENT_TYPES = {'application/gzip', 'application/x-gzip'}
+GZIP_SIGNATURE = b'\x1f\x8b'
+BINARY_SIGNATURES = (b'%PDF', b'PK\x03\x04', b'\x1f\x8b', b'\x89PNG', b'GIF8', b'\xff\xd8\xff',
+                     b'Rar!', b'7z\xbc\xaf', b'MZ')
+
+
+@dataclass
+class FetchResult:
+    """
+    Ergebnis eines Abrufs. Voruebergehende Fehler (5xx, 429, Timeouts, Verbindungsfehler)
+    sind `retryable`; dauerhafte 4xx-Fehler, abgelehnte Inhalte und ein offener Circuit
+    Breaker nicht. `retry_later` fasst beides zusammen, was in einem spaeteren Lauf erneut
+    versucht werden sollte (voruebergehender Fehler oder offener Circuit). `truncated` ist gesetzt, wenn der Body an der Groessengrenze abgeschnitten wurde.
+    `validators` enthaelt ETag/Last-Modified der Antwort (nicht bei abgeschnittenen Bodies).
+    `elapsed` ist die Dauer von Anfrage und Body-Download in Sekunden, ohne Wartezeit auf
+    Host-Scheduler und Concurrency-Controller.
+    """
+    url: str
+    outcome: FetchOutcome = FetchOutcome.OK
+    content: bytes | None = None
+    status_code: int | None = None
+    content_type: str | None = None
+    encoding: str | None = None
+    truncated: bool = False
+    retry_after: float | None = None
+    error: str | None = None
+    validators: dict | None = None
+    elapsed: float | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.outcome == FetchOutcome.NOT_MODIFIED
+
+    @property
+    def retryable(self) -> bool:
+        return self.outcome in RETRYABLE_OUTCOMES
+
+    @property
+    def retry_later(self) -> bool:
+        return self.retryable or self.outcome == FetchOutcome.CIRCUIT_OPEN
+
+
+def _outcome_for_status(status_code: int) -> FetchOutcome:
+    if status_code == 429:
+        return FetchOutcome.THROTTLED
+    if status_code == 408:
+        return FetchOutcome.TIMEOUT
+    if status_code >= 500:
+        return FetchOutcome.SERVER_ERROR
+    return FetchOutcome.CLIENT_ERROR
+
+
+def _looks_binary(first_chunk: bytes) -> bool:
+    """Erkennt Binaerdateien anhand bekannter Signaturen oder Null-Bytes im ersten Block."""
+    head = first_chunk[:1024]
+    return head.startswith(BINARY_SIGNATURES) or b'\x00' in head
+
 
 class HttpClient:
+    """
+    Zentraler HTTP-Zugang des Crawlers. Alle Instanzen teilen sich eine Session mit
+    einem thread-sicheren Keep-Alive-Verbindungspool, damit wiederholte Anfragen an
+    denselben Host keinen neuen TCP/TLS-Handshake benoetigen.
+    """
     HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
     }
+    MAX_POOLED_HOSTS = 32
+    MAX_CONNECTIONS_PER_HOST = 8
+    MAX_BODY_BYTES = 5 * 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
+    PARSER_BACKEND = resolve_parser_backend("auto")
 
-    @staticmethod
-    def get_soup(url: str, timeout: int = 15) -> BeautifulSoup | None:
-        """Fuehrt eine GET-Anfrage aus und gibt bei Erfolg ein BeautifulSoup-Objekt zurueck."""
+    _session: requests.Session | None = None
+    _session_lock = threading.Lock()
+    response_cache: ResponseCache | None = None
+    host_scheduler: HostScheduler | None = None
+    concurrency: AdaptiveConcurrencyController | None = None
+    circuit_breaker: CircuitBreaker | None = None
+    robots_cache: RobotsCache | None = None
+    dns_cache: DnsCache | None = None
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        """Erstellt eine Session, deren Adapter die Verbindungen pro Host begrenzt."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=cls.MAX_POOLED_HOSTS,
+            pool_maxsize=cls.MAX_CONNECTIONS_PER_HOST,
+            pool_block=True
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(cls.HEADERS)
+        return session
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Gibt die prozessweit geteilte Session zurueck und erstellt sie bei Bedarf."""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    cls._session = cls._create_session()
+        return cls._session
+
+    @classmethod
+    def close_session(cls):
+        """Schliesst die geteilte Session und alle offenen Verbindungen im Pool."""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+    @classmethod
+    def configure(cls, settings):
+        """Uebernimmt die Netzwerk-Einstellungen und baut den Pool bei Aenderungen neu auf."""
+        max_per_host = int(settings.max_requests_per_host)
+        if max_per_host != cls.MAX_CONNECTIONS_PER_HOST:
+            cls.MAX_CONNECTIONS_PER_HOST = max_per_host
+            cls.close_session()
+        cls.MAX_BODY_BYTES = int(settings.max_body_bytes)
+        cls.PARSER_BACKEND = resolve_parser_backend(settings.html_parser)
+        cls.response_cache = None
+        if settings.http_cache_enabled:
+            cls.response_cache = ResponseCache.from_settings(settings)
+            cls.response_cache.prune()
+        cls.host_scheduler = HostScheduler.from_settings(settings)
+        cls.concurrency = AdaptiveConcurrencyController.from_settings(settings)
+        cls.circuit_breaker = CircuitBreaker.from_settings(settings)
+        cls.robots_cache = None
+        if settings.robots_txt.get("enabled", True):
+            cls.robots_cache = RobotsCache.from_settings(settings, cls._fetch_robots_txt, cls.host_scheduler)
+        DnsCache.uninstall()
+        cls.dns_cache = None
+        if settings.dns_cache.get("enabled", True):
+            cls.dns_cache = DnsCache.from_settings(settings)
+            cls.dns_cache.install()
+
+    @classmethod
+    def get(cls, url: str, timeout: int = 15, **kwargs) -> requests.Response:
+        """
+        Fuehrt eine GET-Anfrage ueber den geteilten Verbindungspool aus. Ist ein
+        Concurrency-Controller konfiguriert, belegt die Anfrage einen seiner Slots und
+        meldet Antwortzeit und Ergebnis zurueck.
+        """
+        with cls._request_slot(url) as slot:
+            try:
+                response = cls.get_session().get(url, timeout=timeout, **kwargs)
+            except requests.exceptions.Timeout:
+                slot["outcome"] = "timeout"
+                raise
+            slot["outcome"] = response.status_code
+            return response
+
+    @classmethod
+    @contextmanager
+    def _request_slot(cls, url: str):
+        """
+        Belegt fuer die Dauer des Blocks einen Slot des Concurrency-Controllers. Der Aufrufer
+        traegt das Ergebnis in `slot["outcome"]` ein (Statuscode, 'timeout' oder 'error');
+        bei der Freigabe wird die seit Erhalt des Slots verstrichene Zeit als Antwortzeit
+        gemeldet und in `slot["elapsed"]` abgelegt.
+        """
+        controller = cls.concurrency
+        host = urlparse(url).netloc
+        if controller:
+            controller.acquire(host)
+        slot = {"outcome": "error"}
+        start_time = time.perf_counter()
+        try:
+            yield slot
+        finally:
+            slot["elapsed"] = time.perf_counter() - start_time
+            if controller:
+                latency = None if slot["outcome"] in ("timeout", "error") else slot["elapsed"]
+                controller.release(host, latency, slot["outcome"])
+
+    @classmethod
+    def fetch(cls, url: str, timeout: int = 15, revalidate: bool = False, paced: bool = True,
+              allow_gzip: bool = False, store_validators: bool = True) -> FetchResult:
+        """
+        Fuehrt eine GET-Anfrage aus und liefert ein typisiertes FetchResult.
+        Mit `revalidate=True` werden die im Response-Cache gespeicherten Validatoren
+        mitgeschickt; ein 304 wird als NOT_MODIFIED gemeldet. Mit `paced=True` wartet
+        der Aufruf vorher auf einen Slot im Host-Scheduler. Ist der Circuit Breaker
+        des Hosts offen, wird gar nicht erst angefragt. `allow_gzip=True` laesst
+        gzip-komprimierte Dateien (z.B. sitemap.xml.gz) als Inhalt zu. Mit
+        `store_validators=False` werden die Validatoren nur im Ergebnis geliefert; der Aufrufer
+        speichert sie per `remember_validators`, sobald der Inhalt erfolgreich verarbeitet wurde.
+        """
+        host = urlparse(url).netloc
+        breaker = cls.circuit_breaker
+        if breaker and not breaker.allow(host):
+            print(f"[HttpClient] Host {host} ist gesperrt (Circuit Breaker). Ueberspringe {url}.")
+            run_stats.increment("http_circuit_open")
+            return FetchResult(url, FetchOutcome.CIRCUIT_OPEN, error=f"Circuit Breaker fuer {host} offen")
+
+        if paced and cls.host_scheduler:
+            cls.host_scheduler.acquire(url)
         print(f"[HttpClient] Rufe auf: {url}")
+        cache = cls.response_cache if revalidate else None
+        conditional_headers = cache.conditional_headers(url) if cache else {}
+        run_stats.increment("http_requests")
+
+        result = cls._request(url, timeout, conditional_headers, cache if store_validators else None, allow_gzip)
+        if breaker:
+            breaker.record(host, failed=result.retryable)
+        if result.outcome not in (FetchOutcome.OK, FetchOutcome.NOT_MODIFIED):
+            print(f"[HttpClient] Fehler beim Abrufen von {url}: {result.error}")
+            run_stats.increment(f"http_{result.outcome.value}")
+        return result
+
+    @classmethod
+    def _request(cls, url: str, timeout: int, conditional_headers: dict, cache: ResponseCache | None,
+                 allow_gzip: bool = False) -> FetchResult:
+        """
+        Fuehrt die eigentliche Anfrage aus. Der Slot des Concurrency-Controllers bleibt belegt,
+        bis der Body gelesen ist, damit Antwortzeit und Ergebnis (auch Abbrueche beim Lesen)
+        die tatsaechliche Last des Hosts widerspiegeln.
+        """
+        with cls._request_slot(url) as slot:
+            result = cls._send(url, timeout, conditional_headers, cache, allow_gzip)
+            if result.status_code is not None:
+                slot["outcome"] = result.status_code
+            elif result.outcome == FetchOutcome.TIMEOUT:
+                slot["outcome"] = "timeout"
+        result.elapsed = slot["elapsed"]
+        return result
+
+    @classmethod
+    def _send(cls, url: str, timeout: int, conditional_headers: dict, cache: ResponseCache | None,
+              allow_gzip: bool = False) -> FetchResult:
+        """
+        Sendet die Anfrage gestreamt und ordnet die Antwort einem FetchOutcome zu.
+        Nicht-HTML/XML-Inhalte werden anhand des Content-Type oder der ersten Bytes abgelehnt,
+        ohne den Rest herunterzuladen; Bodies ueber MAX_BODY_BYTES werden abgeschnitten.
+        """
+        kwargs = {'headers': conditional_headers} if conditional_headers else {}
         try:
-            response = requests.get(url, headers=HttpClient.HEADERS, timeout=timeout)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            response = cls.get_session().get(url, timeout=timeout, stream=True, **kwargs)
+        except requests.exceptions.Timeout as e:
+            return FetchResult(url, FetchOutcome.TIMEOUT, error=str(e))
         except requests.exceptions.RequestException as e:
-            print(f"[HttpClient] Fehler beim Abrufen von {url}: {e}")
-            return None
\ No newline at end of file
+            return FetchResult(url, FetchOutcome.NETWORK_ERROR, error=str(e))
+
+        with response:
+            if response.status_code == 304:
+                print(f"[HttpClient] {url} ist unveraendert (304).")
+                run_stats.increment("http_not_modified")
+                return FetchResult(url, FetchOutcome.NOT_MODIFIED, status_code=304)
+            if response.status_code >= 400:
+                return FetchResult(
+                    url, _outcome_for_status(response.status_code), status_code=response.status_code,
+                    retry_after=parse_retry_after(response.headers.get('Retry-After')),
+                    error=f"HTTP {response.status_code}"
+                )
+
+            content_type = response.headers.get('Content-Type', '')
+            mime_type = content_type.split(';')[0].strip().lower()
+            gzip_allowed = allow_gzip and mime_type in GZIP_CONTENT_TYPES
+            if mime_type not in GENERIC_CONTENT_TYPES and mime_type not in MARKUP_CONTENT_TYPES \
+                    and not mime_type.endswith('+xml') and not gzip_allowed:
+                return FetchResult(url, FetchOutcome.REJECTED, status_code=response.status_code,
+                                   content_type=content_type, error=f"Content-Type '{mime_type}' abgelehnt")
+
+            try:
+                content, truncated = cls._read_body(response, allow_gzip)
+            except requests.exceptions.RequestException as e:
+                # requests meldet Lese-Timeouts waehrend iter_content als ConnectionError.
+                timed_out = isinstance(e, requests.exceptions.Timeout) or \
+                    any(isinstance(arg, ReadTimeoutError) for arg in e.args)
+                return FetchResult(url, FetchOutcome.TIMEOUT if timed_out else FetchOutcome.NETWORK_ERROR,
+                                   error=str(e))
+            if content is None:
+                return FetchResult(url, FetchOutcome.REJECTED, status_code=response.status_code,
+                                   content_type=content_type, error="Binaerer Inhalt erkannt")
+
+            # Validatoren eines abgeschnittenen Bodies wuerden den unvollstaendigen Stand per 304 festschreiben.
+            validators = None
+            if truncated:
+                print(f"[HttpClient] WARNUNG: {url} nach {cls.MAX_BODY_BYTES} Bytes abgeschnitten.")
+                run_stats.increment("http_truncated")
+            else:
+                validators = {name: response.headers[name] for name in ('ETag', 'Last-Modified')
+                              if response.headers.get(name)}
+                if cache:
+                    cache.store(url, validators)
+            return FetchResult(url, content=content, status_code=response.status_code,
+                               content_type=content_type, encoding=charset_from_content_type(content_type),
+                               truncated=truncated, validators=validators)
+
+    @classmethod
+    def remember_validators(cls, url: str, validators: dict | None):
+        """Speichert die Validatoren eines erfolgreich verarbeiteten Abrufs im Response-Cache."""
+        if cls.response_cache and validators:
+            cls.response_cache.store(url, validators)
+
+    @classmethod
+    def _read_body(cls, response: requests.Response, allow_gzip: bool = False) -> tuple[bytes | None, bool]:
+        """
+        Liest den Body blockweise bis MAX_BODY_BYTES. Gibt (None, False) zurueck, wenn der
+        erste Block nach einer Binaerdatei aussieht (gzip nur, wenn nicht erlaubt).
+        """
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=cls.CHUNK_SIZE):
+            if not chunk:
+                continue
+            if size == 0 and _looks_binary(chunk) and not (allow_gzip and chunk.startswith(GZIP_SIGNATURE)):
+                return None, False
+            if size + len(chunk) > cls.MAX_BODY_BYTES:
+                chunks.append(chunk[:cls.MAX_BODY_BYTES - size])
+                return b''.join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b''.join(chunks), False
+
+    @classmethod
+    def _fetch_robots_txt(cls, robots_url: str) -> tuple[int | None, str | None]:
+        """
+        Laedt eine robots.txt fuer den RobotsCache. Gibt (Statuscode, Text) zurueck;
+        (None, None) bedeutet, dass die Datei nicht erreichbar war.
+        """
+        result = cls.fetch(robots_url, timeout=10)
+        if result.content is not None:
+            return result.status_code or 200, result.content.decode(result.encoding or 'utf-8', errors='replace')
+        if result.outcome in (FetchOutcome.CLIENT_ERROR, FetchOutcome.REJECTED):
+            return result.status_code or 404, None
+        return None, None
+
+    @classmethod
+    def sitemaps_for(cls, url: str) -> list[str]:
+        """Gibt die in der robots.txt des Hosts angegebenen Sitemaps zurueck."""
+        if cls.robots_cache is None:
+            return []
+        return cls.robots_cache.sitemaps(url)
+
+    @classmethod
+    def is_allowed(cls, url: str) -> bool:
+        """Prueft die URL gegen die robots.txt ihres Hosts. Ohne RobotsCache ist alles erlaubt."""
+        if cls.robots_cache is None:
+            return True
+        return cls.robots_cache.can_fetch(url)
+
+    @classmethod
+    def parse_html(cls, content: bytes, encoding: str | None = None) -> BeautifulSoup:
+        """
+        Parst bereits heruntergeladene Bytes mit dem konfigurierten Parser-Backend.
+        Ein per HTTP deklariertes `encoding` erspart die Zeichensatz-Erkennung.
+        """
+        return parse_html(content, encoding, cls.PARSER_BACKEND)
+
+    @classmethod
+    def get_soup(cls, url: str, timeout: int = 15) -> BeautifulSoup | None:
+        """Fuehrt eine GET-Anfrage aus und gibt bei Erfolg ein BeautifulSoup-Objekt zurueck."""
+        result = cls.fetch(url, timeout=timeout)
+        if result.content is None:
+            return None
+        return cls.parse_html(result.content, result.encoding)
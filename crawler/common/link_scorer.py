@@ -0,0 +1,123 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+from urllib.parse import urljoin, urlsplit
+
+from .url_canonicalizer import dedupe_by_canonical
+
+DATED_PATH_PATTERN = re.compile(r'/\d{4}/\d{2}/')
+
+
+@dataclass(frozen=True)
+class LinkRuleProfile:
+    """Vorkompilierte Bewertungsregeln fuer die Links eines Hosts."""
+    blacklist: re.Pattern | None
+    min_score: int = 3
+    article_pattern: re.Pattern | None = None
+    article_pattern_bonus: int = 2
+
+    def is_blacklisted(self, path: str) -> bool:
+        return bool(self.blacklist and self.blacklist.search(path))
+
+    def score(self, path: str, word_count: int) -> int:
+        """Bewertet einen Link anhand der Wortzahl seines Textes und der Form seines Pfads."""
+        score = 0
+        if word_count >= 4:
+            score += 2
+        elif word_count >= 3:
+            score += 1
+        if path.count('/') >= 3:
+            score += 1
+        if DATED_PATH_PATTERN.search(path) or path.endswith(('.html', '.htm')):
+            score += 1
+        if not path.endswith('/'):
+            score += 1
+        if self.article_pattern and self.article_pattern.search(path):
+            score += self.article_pattern_bonus
+        return score
+
+
+class LinkScorer:
+    """
+    Bewertet Links von Listenseiten mit einmalig kompilierten Regelprofilen. Die Blacklist
+    (interne Eintraege, globale `blacklist_keywords` und die des Profils) wird zu einem
+    einzigen regulaeren Ausdruck zusammengefasst. Profile pro Domain gelten wie beim
+    HostScheduler auch fuer Subdomains und ergaenzen das Standardprofil.
+    """
+    DEFAULT_PROFILE = {"min_score": 3, "blacklist_keywords": [], "article_pattern": None, "article_pattern_bonus": 2}
+
+    def __init__(self, blacklist_keywords: list[str], default_profile: dict | None = None,
+                 domain_profiles: dict | None = None):
+        self.blacklist_keywords = list(blacklist_keywords)
+        self.default_profile = {**self.DEFAULT_PROFILE, **(default_profile or {})}
+        self.domain_profiles = {domain.lower(): profile for domain, profile in (domain_profiles or {}).items()}
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, internal_blacklist: list[str]) -> 'LinkScorer':
+        """Erstellt den Scorer aus `blacklist_keywords` und `link_rules` der Benutzereinstellungen."""
+        rules = settings.link_rules
+        return cls(list(internal_blacklist) + list(settings.blacklist_keywords), rules.get("default"),
+                   rules.get("domains"))
+
+    def _compile(self, domain: str | None) -> LinkRuleProfile:
+        profile = dict(self.default_profile)
+        if domain:
+            profile.update(self.domain_profiles[domain])
+        keywords = self.blacklist_keywords + list(profile.get("blacklist_keywords") or [])
+        blacklist = re.compile('|'.join(f'(?:{keyword})' for keyword in keywords), re.IGNORECASE) if keywords else None
+        article_pattern = re.compile(profile["article_pattern"], re.IGNORECASE) if profile.get("article_pattern") else None
+        return LinkRuleProfile(blacklist, int(profile["min_score"]), article_pattern,
+                               int(profile["article_pattern_bonus"]))
+
+    def profile_for(self, host: str) -> LinkRuleProfile:
+        """Gibt das (beim ersten Zugriff kompilierte) Profil fuer einen Host zurueck."""
+        parts = host.lower().split('.')
+        domain = next(('.'.join(parts[i:]) for i in range(len(parts)) if '.'.join(parts[i:]) in self.domain_profiles),
+                      None)
+        profile = self._compiled.get(domain)
+        if profile is None:
+            with self._lock:
+                profile = self._compiled.get(domain)
+                if profile is None:
+                    profile = self._compiled[domain] = self._compile(domain)
+        return profile
+
+    def is_blacklisted(self, url: str) -> bool:
+        """Prueft den Pfad einer absoluten URL gegen die Blacklist des zugehoerigen Hosts."""
+        parsed = urlsplit(url)
+        return self.profile_for(parsed.hostname or '').is_blacklisted(parsed.path)
+
+    def select_article_links(self, anchors: Iterable[tuple[str, str]], source_url: str) -> list[str]:
+        """
+        Waehlt aus (href, Linktext)-Paaren einer Listenseite die Artikel-Links aus. Jeder
+        href wird nur einmal aufgeloest und bewertet; von mehreren Ankern mit demselben
+        Ziel zaehlt der mit dem laengsten Text. Geliefert werden die gefundenen URLs, pro
+        normalisierter URL (`canonicalize_url`) nur die erste.
+        """
+        word_counts = {}
+        for href, link_text in anchors:
+            href = href.strip() if href else ''
+            if not href or href in ('#', '/'):
+                continue
+            word_count = len(link_text.split())
+            if word_count > word_counts.get(href, -1):
+                word_counts[href] = word_count
+
+        source_domain = urlsplit(source_url).netloc
+        profile = self.profile_for(urlsplit(source_url).hostname or '')
+        article_links = []
+        for href, word_count in word_counts.items():
+            if not word_count:
+                continue
+            parsed_url = urlsplit(urljoin(source_url, href))
+            path = parsed_url.path
+            if parsed_url.netloc != source_domain or parsed_url.fragment or not path:
+                continue
+            if profile.is_blacklisted(path):
+                continue
+            if profile.score(path, word_count) >= profile.min_score:
+                article_links.append(parsed_url.geturl())
+        return sorted(dedupe_by_canonical(article_links))
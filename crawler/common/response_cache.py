@@ -0,0 +1,118 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+def _find_project_root():
+    """Findet das Projekt-Hauptverzeichnis, indem es nach der .gitignore-Datei sucht."""
+    current_path = Path(__file__).resolve()
+    while not (current_path / '.gitignore').exists():
+        if current_path.parent == current_path:
+            return Path.cwd()
+        current_path = current_path.parent
+    return current_path
+
+
+class ResponseCache:
+    """
+    Persistenter Cache fuer HTTP-Validatoren (ETag / Last-Modified), abgelegt als eine
+    JSON-Datei pro URL. Dient dazu, bekannte Seiten per Conditional GET zu pruefen.
+    Eintraege verfallen nach `max_age_days`; es werden hoechstens `max_entries` behalten.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_age_days: float = 30, max_entries: int = 20000):
+        self.cache_dir = Path(cache_dir) if cache_dir else _find_project_root() / "http_cache"
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+
+    @classmethod
+    def from_settings(cls, settings) -> 'ResponseCache':
+        """Erstellt den Cache mit Verfallszeit und Obergrenze aus `http_cache_retention`."""
+        retention = settings.http_cache_retention
+        return cls(max_age_days=retention.get("max_age_days", 30), max_entries=retention.get("max_entries", 20000))
+
+    def prune(self) -> int:
+        """
+        Entfernt verfallene Eintraege und darueber hinaus die aeltesten, bis hoechstens
+        `max_entries` uebrig sind. Gibt die Anzahl der entfernten Eintraege zurueck.
+        """
+        entries = []
+        for entry_path in self.cache_dir.glob('*.json'):
+            try:
+                entries.append((entry_path.stat().st_mtime, entry_path))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        cutoff = time.time() - self.max_age_days * 86400
+
+        removed = 0
+        for position, (stored_at, entry_path) in enumerate(entries):
+            if stored_at >= cutoff and position < self.max_entries:
+                continue
+            try:
+                entry_path.unlink(missing_ok=True)
+                removed += 1
+            except OSError as e:
+                print(f"[ResponseCache] WARNUNG: Cache-Eintrag {entry_path.name} konnte nicht entfernt werden: {e}")
+        if removed:
+            print(f"[ResponseCache] {removed} verfallene Cache-Eintraege entfernt.")
+        return removed
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> dict | None:
+        """Gibt den gespeicherten Eintrag fuer eine URL zurueck oder None."""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get('url') == url else None
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        except OSError as e:
+            print(f"[ResponseCache] WARNUNG: Cache-Eintrag fuer {url} nicht lesbar: {e}")
+            return None
+
+    def conditional_headers(self, url: str) -> dict:
+        """Baut die If-None-Match/If-Modified-Since-Header aus dem gespeicherten Eintrag."""
+        entry = self.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, response_headers) -> None:
+        """
+        Speichert ETag und Last-Modified einer Antwort. Antworten ohne Validatoren
+        entfernen einen eventuell vorhandenen alten Eintrag.
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        entry_path = self._entry_path(url)
+
+        if not etag and not last_modified:
+            entry_path.unlink(missing_ok=True)
+            return
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': datetime.datetime.now(datetime.timezone.utc).isoformat()
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"[ResponseCache] WARNUNG: Cache-Eintrag fuer {url} konnte nicht gespeichert werden: {e}")
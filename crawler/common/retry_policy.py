@@ -0,0 +1,44 @@
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .http_client import FetchResult
+
+MAX_RETRY_AFTER = 60.0
+JITTER_RATIO = 0.5
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Wandelt einen Retry-After-Header (Sekunden oder HTTP-Datum) in Sekunden um."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def compute_retry_delay(result: 'FetchResult', attempt: int, retries: int, backoff_factor: float) -> float | None:
+    """
+    Bestimmt die Wartezeit vor dem naechsten Versuch oder None, wenn nicht erneut versucht
+    werden soll: bei dauerhaften Fehlern, nach dem letzten Versuch oder wenn der Server per
+    Retry-After laenger als MAX_RETRY_AFTER Sekunden Pause verlangt. Ohne Retry-After gilt
+    exponentielles Backoff; in beiden Faellen kommt ein zufaelliger Jitter hinzu.
+    """
+    if not result.retryable or attempt >= retries - 1:
+        return None
+    if result.retry_after is not None:
+        if result.retry_after > MAX_RETRY_AFTER:
+            return None
+        base_delay = result.retry_after
+    else:
+        base_delay = backoff_factor * (2 ** attempt)
+    return base_delay + random.uniform(0, base_delay * JITTER_RATIO)
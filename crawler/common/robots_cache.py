@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from .host_scheduler import HostScheduler
+from .run_stats import run_stats
+
+
+class RobotsCache:
+    """
+    Cache fuer robots.txt-Regeln pro Host (Schema + Host). Jede robots.txt wird hoechstens
+    einmal pro `ttl` Sekunden geladen. Ein Crawl-Delay bzw. eine Request-Rate wird an den
+    HostScheduler weitergegeben.
+    Wie bei urllib.robotparser gilt: 401/403 sperrt den Host, andere 4xx erlauben alles.
+    Ist die robots.txt nicht erreichbar (5xx, Timeout), wird der Host fuer `error_ttl`
+    Sekunden als gesperrt behandelt.
+    """
+
+    def __init__(self, fetch_robots: Callable[[str], tuple[int | None, str | None]],
+                 host_scheduler: HostScheduler | None = None, ttl: float = 86400.0,
+                 error_ttl: float = 600.0, user_agent: str = "*"):
+        self.fetch_robots = fetch_robots
+        self.host_scheduler = host_scheduler
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self._entries = {}
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, fetch_robots, host_scheduler=None) -> 'RobotsCache':
+        """Erstellt den Cache aus dem Eintrag `robots_txt` der Benutzereinstellungen."""
+        config = settings.robots_txt
+        return cls(fetch_robots, host_scheduler, config.get("ttl", 86400.0), config.get("error_ttl", 600.0),
+                   config.get("user_agent", "*"))
+
+    def _host_lock(self, origin: str) -> threading.Lock:
+        with self._lock:
+            return self._host_locks.setdefault(origin, threading.Lock())
+
+    def _load(self, origin: str) -> tuple[RobotFileParser, float]:
+        """Laedt und parst die robots.txt eines Hosts; gibt Parser und Ablaufzeitpunkt zurueck."""
+        status_code, text = self.fetch_robots(f"{origin}/robots.txt")
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        ttl = self.ttl
+        if status_code is None or status_code >= 500:
+            print(f"[RobotsCache] robots.txt von {origin} nicht erreichbar. Host wird voruebergehend gesperrt.")
+            parser.disallow_all = True
+            ttl = self.error_ttl
+        elif status_code in (401, 403):
+            parser.disallow_all = True
+        elif status_code >= 400 or text is None:
+            parser.allow_all = True
+        else:
+            parser.parse(text.splitlines())
+            self._apply_crawl_delay(origin, parser)
+        run_stats.increment("robots_fetched")
+        return parser, time.monotonic() + ttl
+
+    def _apply_crawl_delay(self, origin: str, parser: RobotFileParser):
+        delay = parser.crawl_delay(self.user_agent) or 0
+        request_rate = parser.request_rate(self.user_agent)
+        if request_rate and request_rate.requests:
+            delay = max(delay, request_rate.seconds / request_rate.requests)
+        if delay and self.host_scheduler:
+            print(f"[RobotsCache] Crawl-Delay von {delay}s fuer {origin} uebernommen.")
+            self.host_scheduler.set_crawl_delay(urlparse(origin).netloc, float(delay))
+
+    def rules_for(self, url: str) -> RobotFileParser:
+        """Gibt die (ggf. frisch geladenen) robots.txt-Regeln fuer den Host einer URL zurueck."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc.lower()}"
+        entry = self._entries.get(origin)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        with self._host_lock(origin):
+            entry = self._entries.get(origin)
+            if entry is None or entry[1] <= time.monotonic():
+                entry = self._load(origin)
+                self._entries[origin] = entry
+        return entry[0]
+
+    def can_fetch(self, url: str) -> bool:
+        """Prueft, ob die URL laut robots.txt abgerufen werden darf."""
+        return self.rules_for(url).can_fetch(self.user_agent, url)
+
+    def sitemaps(self, url: str) -> list[str]:
+        """Gibt die in der robots.txt des Hosts angegebenen Sitemaps zurueck."""
+        return self.rules_for(url).site_maps() or []
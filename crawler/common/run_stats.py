@@ -0,0 +1,45 @@
+import threading
+
+
+class RunStatistics:
+    """
+    Thread-sichere Sammelstelle fuer die Kennzahlen eines Crawler-Laufs.
+    Zaehler werden per `increment` erhoeht, Momentaufnahmen per `set_value` abgelegt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def increment(self, key: str, amount: int = 1):
+        with self._lock:
+            self._data[key] = self._data.get(key, 0) + amount
+
+    def set_value(self, key: str, value):
+        with self._lock:
+            self._data[key] = value
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def snapshot(self) -> dict:
+        """Gibt eine Kopie aller bisher gesammelten Kennzahlen zurueck."""
+        with self._lock:
+            return dict(self._data)
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+    def print_summary(self):
+        """Gibt alle Kennzahlen des Laufs sortiert auf der Konsole aus."""
+        data = self.snapshot()
+        if not data:
+            return
+        print("\n[RunStats] Kennzahlen des Laufs:")
+        for key in sorted(data):
+            print(f"[RunStats]   {key}: {data[key]}")
+
+
+run_stats = RunStatistics()
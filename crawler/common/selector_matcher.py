@@ -0,0 +1,61 @@
+import re
+
+from bs4 import Tag
+
+SIMPLE_SELECTOR_PATTERN = re.compile(r'^(?P<name>[a-z][a-z0-9]*)(?:#(?P<id>[\w-]+))?(?P<classes>(?:\.[\w-]+)*)$', re.IGNORECASE)
+
+
+class ContainerMatcher:
+    """
+    Ordnet Links in einem einzigen Durchlauf durch das Dokument ihrem Inhaltscontainer zu.
+    Unterstuetzt einfache Selektoren der Form 'tag', 'tag#id' und 'tag.klasse1.klasse2';
+    die Position in der Liste ist die Prioritaet (0 = hoechste). Ein Link erhaelt die
+    hoechste Prioritaet aller Container, in denen er liegt (einschliesslich seiner selbst,
+    z.B. 'a.story-link'), und wird genau einmal geliefert.
+    """
+
+    def __init__(self, selectors: list[str]):
+        self._rules = {}
+        for priority, selector in enumerate(selectors):
+            match = SIMPLE_SELECTOR_PATTERN.match(selector.strip())
+            if not match:
+                raise ValueError(f"Nicht unterstuetzter Selektor: '{selector}'")
+            classes = frozenset(filter(None, match.group('classes').split('.')))
+            self._rules.setdefault(match.group('name').lower(), []).append((priority, match.group('id'), classes))
+
+    def priority_for(self, name: str, tag_id: str | None, classes) -> int | None:
+        """Gibt die hoechste Prioritaet der Selektoren zurueck, auf die ein Element passt, sonst None."""
+        best = None
+        for priority, rule_id, rule_classes in self._rules.get(name, ()):
+            if best is not None and priority >= best:
+                continue
+            if rule_id and tag_id != rule_id:
+                continue
+            if rule_classes and not rule_classes.issubset(classes):
+                continue
+            best = priority
+        return best
+
+    def _priority_of(self, tag: Tag) -> int | None:
+        return self.priority_for(tag.name, tag.get('id'), tag.get('class', ()))
+
+    def match_links(self, root: Tag) -> tuple[list[tuple[Tag, int]] | None, list[Tag]]:
+        """
+        Gibt ([(Link, Prioritaet) fuer Links in Containern], [alle Links mit href]) in
+        Dokumentreihenfolge zurueck. Wurde kein Container gefunden, ist die erste Liste None.
+        """
+        contained, all_links, found_container = [], [], False
+        stack = [(root, None)]
+        while stack:
+            node, inherited = stack.pop()
+            own = self._priority_of(node)
+            if own is not None:
+                found_container = True
+                if inherited is None or own < inherited:
+                    inherited = own
+            if node.name == 'a' and node.has_attr('href'):
+                all_links.append(node)
+                if inherited is not None:
+                    contained.append((node, inherited))
+            stack.extend((child, inherited) for child in reversed(node.contents) if isinstance(child, Tag))
+        return (contained if found_container else None), all_links
@@ -0,0 +1,77 @@
+import hashlib
+import re
+from collections import Counter
+
+FINGERPRINT_BITS = 64
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def _shingle_hash(shingle: str) -> int:
+    """Stabiler 64-Bit-Hash (unabhaengig von PYTHONHASHSEED), damit Fingerprints in der DB vergleichbar bleiben."""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Berechnet den 64-Bit-SimHash eines Textes ueber Wort-Shingles. Texte, die sich nur
+    in wenigen Saetzen unterscheiden (Syndikation, Nachdrucke mit anderem Teaser),
+    ergeben Fingerprints mit geringer Hamming-Distanz.
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < shingle_size:
+        shingles = Counter([' '.join(tokens)] if tokens else [])
+    else:
+        shingles = Counter(' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        value = _shingle_hash(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Anzahl der unterschiedlichen Bits zweier Fingerprints."""
+    return (first ^ second).bit_count()
+
+
+class SimHashIndex:
+    """
+    Index fuer die Suche nach Fingerprints mit hoechstens `max_distance` abweichenden Bits.
+    Der Fingerprint wird in max_distance + 1 Bereiche geteilt; zwei Fingerprints innerhalb
+    der Distanz stimmen in mindestens einem Bereich exakt ueberein. Verglichen werden daher
+    nur Kandidaten mit einem gemeinsamen Bereich statt aller bekannten Artikel.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        band_count = max_distance + 1
+        band_width = -(-FINGERPRINT_BITS // band_count)
+        self._bands = [(offset, (1 << min(band_width, FINGERPRINT_BITS - offset)) - 1)
+                       for offset in range(0, FINGERPRINT_BITS, band_width)]
+        self._buckets = {}
+        self._fingerprints = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _keys(self, fingerprint: int):
+        for band, (offset, mask) in enumerate(self._bands):
+            yield band, fingerprint >> offset & mask
+
+    def add(self, url: str, fingerprint: int):
+        """Nimmt den Fingerprint eines Artikels in den Index auf."""
+        self._fingerprints[url] = fingerprint
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, []).append(url)
+
+    def find(self, fingerprint: int) -> str | None:
+        """Gibt die URL des aehnlichsten bekannten Artikels innerhalb der Distanz zurueck, sonst None."""
+        best_url, best_distance = None, self.max_distance + 1
+        for key in self._keys(fingerprint):
+            for url in self._buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, self._fingerprints[url])
+                if distance < best_distance:
+                    best_url, best_distance = url, distance
+        return best_url
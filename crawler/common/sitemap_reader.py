@@ -0,0 +1,43 @@
+import datetime
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from typing import Iterator
+
+from .feed_parser import _local_name, parse_feed_date
+
+GZIP_SIGNATURE = b'\x1f\x8b'
+
+
+def iter_sitemap(content: bytes, not_before: datetime.datetime | None = None) -> Iterator[tuple[str, str, datetime.datetime | None]]:
+    """
+    Liest eine sitemap.xml bzw. einen Sitemap-Index streamend (auch gzip-komprimiert) und
+    liefert Tupel (Art, URL, lastmod). Art ist 'sitemapindex' fuer verschachtelte Sitemaps,
+    sonst 'urlset'. Eintraege mit lastmod vor `not_before` werden uebersprungen; Eintraege
+    ohne lastmod werden immer geliefert. Wirft ET.ParseError bei fehlerhaftem XML.
+    """
+    stream = io.BytesIO(content)
+    if content.startswith(GZIP_SIGNATURE):
+        stream = gzip.GzipFile(fileobj=stream)
+
+    kind = None
+    loc, lastmod = None, None
+    try:
+        for event, element in ET.iterparse(stream, events=('start', 'end')):
+            name = _local_name(element.tag)
+            if event == 'start':
+                if kind is None:
+                    kind = name
+                continue
+            # Erweiterungen (z.B. image:loc) folgen auf die eigentliche <loc> und werden ignoriert.
+            if name == 'loc' and loc is None:
+                loc = (element.text or '').strip()
+            elif name == 'lastmod' and lastmod is None:
+                lastmod = parse_feed_date(element.text)
+            elif name in ('url', 'sitemap'):
+                if loc and not (not_before and lastmod and lastmod <= not_before):
+                    yield kind, loc, lastmod
+                loc, lastmod = None, None
+                element.clear()
+    except (EOFError, gzip.BadGzipFile) as e:
+        raise ET.ParseError(f"Defekte gzip-Sitemap: {e}") from e
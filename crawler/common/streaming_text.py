@@ -0,0 +1,109 @@
+from html.parser import HTMLParser
+
+from .selector_matcher import ContainerMatcher
+
+
+class StreamingTextExtractor(HTMLParser):
+    """
+    Ereignisbasierte Textextraktion auf Basis von html.parser, ohne DOM-Baum.
+    Ein Skip-Stack blendet Skripte, Navigation, Footer usw. aus; Text wird pro
+    Block-Element (h1-h4, p, li, pre, code, table) gesammelt, verschachtelte Bloecke
+    (z.B. li in table) nur einmal ueber den aeussersten Block. Jeder Block merkt sich den
+    Inhaltscontainer mit der hoechsten Prioritaet, in dem er liegt.
+    """
+    SKIP_TAGS = frozenset({'script', 'style', 'form', 'nav', 'footer', 'header', 'noscript', 'template', 'svg'})
+    SKIP_CLASS_SETS = (frozenset({'ad'}), frozenset({'advertisement'}), frozenset({'author-box'}),
+                       frozenset({'related-posts'}), frozenset({'share'}), frozenset({'tags'}),
+                       frozenset({'cf', 'note-b'}))
+    BLOCK_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'p', 'li', 'pre', 'code', 'table'})
+    VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+                           'source', 'track', 'wbr'})
+    # Tags, deren Start ein noch offenes Element gleichen Namens implizit schliesst (<li>a<li>b).
+    SELF_CLOSING_SIBLINGS = frozenset({'p', 'li'})
+
+    def __init__(self, container_selectors: list[str], require_container: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.container_selectors = container_selectors
+        self.require_container = require_container
+        self.matcher = ContainerMatcher(container_selectors)
+        self.canonical_href = None
+        self._stack = []
+        self._skip_depth = 0
+        self._container = None
+        self._container_count = 0
+        self._block = None
+        self._blocks = []
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag == 'link':
+            if 'canonical' in (attributes.get('rel') or '').lower().split() and self.canonical_href is None:
+                self.canonical_href = attributes.get('href')
+            return
+        if tag in self.VOID_TAGS:
+            return
+        if tag in self.SELF_CLOSING_SIBLINGS and self._stack and self._stack[-1][0] == tag:
+            self._close_top()
+
+        classes = (attributes.get('class') or '').split()
+        skip = tag in self.SKIP_TAGS or any(class_set.issubset(classes) for class_set in self.SKIP_CLASS_SETS)
+        container = self._container
+        if not skip and not self._skip_depth:
+            priority = self.matcher.priority_for(tag, attributes.get('id'), classes)
+            if priority is not None and (container is None or priority < container[0]):
+                self._container_count += 1
+                container = (priority, self._container_count)
+
+        block_start = not skip and not self._skip_depth and self._block is None and tag in self.BLOCK_TAGS
+        if block_start:
+            self._block = []
+        self._stack.append((tag, skip, self._container, block_start))
+        self._container = container
+        if skip:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if not any(entry[0] == tag for entry in self._stack):
+            return
+        while self._close_top() != tag:
+            pass
+
+    def handle_data(self, data):
+        if self._skip_depth or self._block is None:
+            return
+        data = data.strip()
+        if data:
+            self._block.append(data)
+
+    def _close_top(self) -> str:
+        tag, skip, outer_container, block_start = self._stack.pop()
+        if skip:
+            self._skip_depth -= 1
+        if block_start:
+            text = ' '.join(self._block)
+            self._block = None
+            if text:
+                self._blocks.append((self._container, text))
+        self._container = outer_container
+        return tag
+
+    def extract(self, html: str) -> tuple[str | None, str | None]:
+        """
+        Verarbeitet das Dokument und gibt (Text, Selektor) des ersten Containers mit der
+        hoechsten Prioritaet zurueck, der Text enthaelt. Liegt kein Block in einem
+        Container, wird (None, None) geliefert bzw. ohne `require_container` der Text
+        aller Bloecke (ohne Selektor).
+        """
+        self.feed(html)
+        self.close()
+        while self._stack:
+            self._close_top()
+
+        containers = [container for container, _ in self._blocks if container]
+        if not containers:
+            if self.require_container or not self._blocks:
+                return None, None
+            return "\n".join(text for _, text in self._blocks), None
+        chosen = min(containers)
+        text = "\n".join(text for container, text in self._blocks if container == chosen)
+        return text, self.container_selectors[chosen[0]]
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from bs4 import CData, NavigableString, Tag
+
+# Wie Tag.get_text: Kommentare, Skript- und Stylesheet-Inhalte zaehlen nicht als Text.
+TEXT_TYPES = (NavigableString, CData)
+
+
+@dataclass(frozen=True)
+class NodeStats:
+    """Kennzahlen eines Teilbaums: Textlaenge (wie get_text(strip=True)), davon in Links, Anzahl Tags."""
+    text_length: int
+    link_text_length: int
+    tag_count: int
+
+    @property
+    def link_density(self) -> float:
+        return self.link_text_length / self.text_length if self.text_length else 0.0
+
+
+def compute_node_stats(root: Tag, is_candidate: Callable[[Tag], bool] | None = None) -> tuple[dict, list]:
+    """
+    Berechnet die Kennzahlen aller Knoten in einem einzigen Bottom-up-Durchlauf (iterativ,
+    ohne Rekursionslimit). Jeder Knoten summiert nur die Werte seiner direkten Kinder, statt
+    wie get_text() den gesamten Teilbaum erneut abzulaufen.
+    Gibt ({id(Tag): NodeStats}, [Kandidaten in Post-Order]) zurueck.
+    """
+    stats, candidates = {}, []
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.contents if isinstance(child, Tag))
+            continue
+
+        text_length, link_text_length, tag_count = 0, 0, 1
+        for child in node.contents:
+            if isinstance(child, Tag):
+                child_stats = stats[id(child)]
+                text_length += child_stats.text_length
+                link_text_length += child_stats.link_text_length
+                tag_count += child_stats.tag_count
+            elif type(child) in TEXT_TYPES:
+                text_length += len(child.strip())
+        if node.name == 'a':
+            link_text_length = text_length
+        stats[id(node)] = NodeStats(text_length, link_text_length, tag_count)
+        if is_candidate and is_candidate(node):
+            candidates.append(node)
+    return stats, candidates
+
+
+def select_content_block(root: Tag, is_candidate: Callable[[Tag], bool], max_link_density: float = 0.5) -> Tag | None:
+    """
+    Waehlt unter den Kandidaten den Block mit dem meisten Text ausserhalb von Links.
+    Navigationsbloecke (Linkdichte ueber `max_link_density`) scheiden aus; bei gleichem
+    Textanteil gewinnt der Block mit weniger Tags, also der innere Container statt eines
+    Wrappers, der nur zusaetzliche Links enthaelt.
+    """
+    stats, candidates = compute_node_stats(root, is_candidate)
+    ranked = [node for node in candidates if stats[id(node)].link_density <= max_link_density]
+    if not ranked:
+        return None
+
+    def rank(node):
+        node_stats = stats[id(node)]
+        return node_stats.text_length - node_stats.link_text_length, -node_stats.tag_count
+
+    return max(ranked, key=rank)
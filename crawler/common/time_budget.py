@@ -0,0 +1,61 @@
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from .run_stats import run_stats
+
+
+class BudgetExceeded(Exception):
+    """Das Zeitbudget eines Artikels ist in der angegebenen Phase aufgebraucht."""
+
+    def __init__(self, phase: str):
+        super().__init__(f"Zeitbudget in Phase '{phase}' ueberschritten")
+        self.phase = phase
+
+    @property
+    def reason(self) -> str:
+        """Abbruchgrund, wie er im Scan-Verlauf gespeichert wird."""
+        return f"budget_exceeded:{self.phase}"
+
+
+def can_interrupt() -> bool:
+    """Ein laufender Block laesst sich nur im Haupt-Thread eines Prozesses (per SIGALRM) unterbrechen."""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds: float | None, phase: str):
+    """
+    Begrenzt die Laufzeit eines Blocks auf `seconds` (None = unbegrenzt). Im Haupt-Thread
+    unter Unix bricht ein Timer den Block hart mit BudgetExceeded ab (Watchdog). In anderen
+    Threads (z.B. wenn die UI den Crawler startet) laesst sich der Block nicht unterbrechen;
+    er laeuft zu Ende, sein Ergebnis bleibt erhalten und die Ueberschreitung wird nur gezaehlt.
+    Ist das Budget schon vorher aufgebraucht, wird der Block gar nicht erst begonnen.
+    """
+    if seconds is None:
+        yield
+        return
+    if seconds <= 0:
+        raise BudgetExceeded(phase)
+
+    if not can_interrupt():
+        start = time.monotonic()
+        yield
+        elapsed = time.monotonic() - start
+        if elapsed > seconds:
+            print(f"[TimeBudget] Phase '{phase}' ueberschritt das Restbudget ({elapsed:.1f}s > {seconds:.1f}s); "
+                  f"nicht unterbrechbar, Ergebnis wird behalten.")
+            run_stats.increment("budget_overruns")
+        return
+
+    def on_alarm(signum, frame):
+        raise BudgetExceeded(phase)
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
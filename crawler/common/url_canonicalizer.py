@@ -0,0 +1,78 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', '_ga', '_gl',
+    'ncid', 'cmpid', 'sr_share', 'share', 'ref', 'ref_src', 'via', 'spm', 'yclid', 'oly_enc_id',
+    'oly_anon_id', 'vero_id', 'mkt_tok', 'hsenc', '_hsenc', '_hsmi', 'rss', 'amp'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalisiert eine Artikel-URL zu einem Schluessel, unter dem Varianten derselben Seite
+    zusammenfallen (Deduplizierung, Scan-Verlauf). Abgerufen wird dagegen immer die
+    gefundene URL, da die Normalisierung die angefragte Seite veraendern kann:
+    https statt http, Host in Kleinbuchstaben ohne Standard-Port, ohne Fragment,
+    ohne Tracking-Parameter (utm_*, fbclid, ...), sortierte Query und Pfad ohne
+    abschliessenden Slash. Andere Schemata (mailto:, ...) und URLs mit fehlerhaftem
+    Host oder Port (z.B. 'example.com:443x') bleiben unveraendert.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.rstrip('.')
+    if ':' in host:
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query_params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(query_params))
+    return urlunsplit(('https', host, path, query, ''))
+
+
+def dedupe_by_canonical(urls) -> list[str]:
+    """
+    Entfernt Varianten derselben Seite und behaelt jeweils die erste tatsaechlich gefundene
+    URL (in der Reihenfolge der Eingabe), da nur sie sicher abrufbar ist.
+    """
+    unique = {}
+    for url in urls:
+        unique.setdefault(canonicalize_url(url), url)
+    return list(unique.values())
+
+
+def canonical_link_from_href(href: str | None, page_url: str) -> str | None:
+    """
+    Normalisiert das href eines <link rel="canonical"> relativ zur geladenen Seite.
+    Verweise auf die Startseite werden ignoriert, da sie meist auf falsch konfigurierte
+    Vorlagen zurueckgehen.
+    """
+    if not href or not href.strip():
+        return None
+    canonical = canonicalize_url(urljoin(page_url, href))
+    if urlsplit(canonical).path in ('', '/'):
+        return None
+    return canonical
+
+
+def canonical_link_from_soup(soup, page_url: str) -> str | None:
+    """Liest <link rel="canonical"> einer geladenen Seite und gibt die normalisierte URL zurueck."""
+    link_tag = soup.select_one('link[rel~=canonical][href]')
+    return canonical_link_from_href(link_tag['href'], page_url) if link_tag else None
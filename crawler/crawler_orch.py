@@ -1,6 +1,9 @@
 import time
 from settings.user_settings import UserSettings
 from db.crawler_db_handler import CrawlerDBHandler
+from .common.http_client import HttpClient
+from .common.run_stats import run_stats
+from .common.simhash import SimHashIndex, simhash
 from .processors.a_link_finder import LinkFinder
 from .processors.b_content_extractor import ContentExtractor
 from .processors.c_ioc_extractor import IocExtractorProcessor
@@ -13,42 +16,71 @@ class CrawlerOrchestrator:
         print("[Orchestrator] Initialisiere Crawler-Workflow...")
         self.settings = UserSettings()
         self.db_handler = CrawlerDBHandler()
+        HttpClient.configure(self.settings)
 
         self.link_finder = LinkFinder(self.settings, self.db_handler)
-        self.content_extractor = ContentExtractor()
+        self.content_extractor = ContentExtractor(self.settings, self.db_handler)
         self.ioc_extractor = IocExtractorProcessor(self.db_handler)
         self.enrichment_processor = EnrichmentProcessor(self.db_handler)
         self.output_processor = OutputProcessor(self.db_handler, self.settings)
 
     def run(self):
+        run_stats.reset()
+        try:
+            self._run_pipeline()
+        finally:
+            if HttpClient.concurrency:
+                run_stats.set_value("concurrency_limits", HttpClient.concurrency.limits())
+            run_stats.print_summary()
+
+    def _run_pipeline(self):
         print("Starte den Prozess der Datenerfassung...")
         print("=" * 40)
         start_time = time.perf_counter()
 
-        # Module 1: Links finden und filtern
-        links_to_process = self.link_finder.process(self.settings.source_urls)
+        # Module 1: Links finden, filtern und in die Frontier einreihen
+        self.link_finder.process(self.settings.source_urls)
+        frontier_batch = self.db_handler.get_frontier_batch(self.settings.frontier["batch_size"])
+        links_to_process = [url for url, _ in frontier_batch]
         if not links_to_process:
             print("[Main] Keine neuen Artikel zum Verarbeiten gefunden.")
             return
 
-        # Module 2: Inhalte extrahieren
-        article_data_map = self.content_extractor.process(links_to_process)
+        # Module 2: Inhalte extrahieren (in Prioritaetsreihenfolge aus der Frontier);
+        # zuvor am Zeitbudget gescheiterte Artikel mit der leichteren Strategie
+        light_urls = self.db_handler.get_abandoned_urls(links_to_process)
+        article_data_map = self.content_extractor.process(links_to_process, self.link_finder.feed_contents, light_urls)
+        extracted_indices = list(article_data_map['texts'])
+        # Voruebergehend gescheiterte Abrufe (5xx, Timeout, offener Circuit) bleiben in der Frontier offen.
+        pending = set(article_data_map.get('pending', ()))
+        processed_links = [url for url in links_to_process if url not in pending]
+        if pending:
+            print(f"[Main] {len(pending)} Artikel voruebergehend nicht abrufbar. Sie bleiben fuer den naechsten Lauf offen.")
+        self.db_handler.mark_frontier_done(processed_links)
+        fingerprints, duplicates = self._skip_near_duplicates(article_data_map)
 
         # Module 3: IOCs extrahieren
         annotated_iocs = self.ioc_extractor.process(article_data_map)
-        if not annotated_iocs:
-            print("[Main] Keine IOCs in den Artikeln gefunden.")
-            return
+        if annotated_iocs:
+            # Module 4: IOCs anreichern
+            enrichment_input = {'annotated_iocs': annotated_iocs,'article_data_map': article_data_map}
+            structured_iocs = self.enrichment_processor.process(enrichment_input)
 
-        # Module 4: IOCs anreichern
-        enrichment_input = {'annotated_iocs': annotated_iocs,'article_data_map': article_data_map}
-        structured_iocs = self.enrichment_processor.process(enrichment_input)
+            # Module 5: Ergebnisse speichern
+            self.output_processor.process(structured_iocs)
+        else:
+            print("[Main] Keine IOCs in den Artikeln gefunden.")
 
-        # Module 5: Ergebnisse speichern
-        self.output_processor.process(structured_iocs)
+        # Beinahe-Duplikate erhalten die Sightings ihres Originals erst jetzt, da dieses
+        # auch im selben Lauf in Modul 5 gespeichert worden sein kann.
+        self._drop_abandoned_originals(fingerprints, duplicates, article_data_map.setdefault('abandoned', {}))
+        self.db_handler.add_duplicate_sightings(duplicates)
 
         print("\n[Main] Aktualisiere den Scan-Verlauf in der Datenbank...")
-        self.db_handler.update_article_scan_history(links_to_process)
+        canonical_urls = [url for url in article_data_map['urls'] if url not in links_to_process]
+        extracted_urls = self._extracted_urls(links_to_process, extracted_indices, article_data_map)
+        self.db_handler.update_article_scan_history(processed_links + canonical_urls, fingerprints, extracted_urls)
+        self._record_abandoned(article_data_map.get('abandoned', {}))
         print("[Main] Scan-Verlauf erfolgreich aktualisiert.")
 
         duration = time.perf_counter() - start_time
@@ -56,6 +88,84 @@ class CrawlerOrchestrator:
         print(f"[Main] Gesamter Prozess abgeschlossen in {duration:.2f} Sekunden.")
         print("==================================================")
 
+    @staticmethod
+    def _extracted_urls(links_to_process: list, extracted_indices: list, article_data_map: dict) -> set:
+        """
+        URLs (geladene und kanonische) der Artikel, aus denen Text extrahiert wurde und die
+        auch in Modul 3 nicht am Zeitbudget gescheitert sind. Beinahe-Duplikate zaehlen mit,
+        da ihr Text extrahiert wurde.
+        """
+        abandoned = article_data_map.get('abandoned', {})
+        extracted_urls = set()
+        for idx in extracted_indices:
+            urls = {links_to_process[idx], article_data_map['urls'][idx]}
+            if not urls & abandoned.keys():
+                extracted_urls |= urls
+        return extracted_urls
+
+    def _record_abandoned(self, abandoned: dict):
+        """
+        Vermerkt am Zeitbudget abgebrochene Artikel mit Grund im Scan-Verlauf und reiht
+        erstmals abgebrochene mit niedrigster Prioritaet erneut in die Frontier ein; beim
+        naechsten Versuch werden sie mit der leichteren Strategie verarbeitet.
+        """
+        if not abandoned:
+            return
+        retry_urls = self.db_handler.record_abandoned_articles(abandoned)
+        if retry_urls:
+            print(f"[Main] {len(retry_urls)} abgebrochene Artikel werden spaeter mit der leichten Strategie wiederholt.")
+            self.db_handler.add_to_frontier([(url, 0, 0) for url in retry_urls])
+
+    @staticmethod
+    def _drop_abandoned_originals(fingerprints: dict, duplicates: dict, abandoned: dict):
+        """
+        Modul 3 kann ein Original am Zeitbudget abbrechen, dessen Beinahe-Duplikate schon
+        uebersprungen wurden. Abgebrochene Artikel hinterlassen keinen Fingerprint; Duplikate
+        eines abgebrochenen Originals erhalten keine kopierten Sightings, sondern gelten mit
+        dessen Grund ebenfalls als abgebrochen und werden mit ihm erneut versucht.
+        """
+        for duplicate, original in list(duplicates.items()):
+            if original in abandoned:
+                print(f"[Main] Original {original} von {duplicate} wurde abgebrochen. Duplikat wird erneut versucht.")
+                del duplicates[duplicate]
+                abandoned[duplicate] = abandoned[original]
+        for url in abandoned:
+            fingerprints.pop(url, None)
+
+    def _skip_near_duplicates(self, article_data_map: dict) -> tuple[dict, dict]:
+        """
+        Berechnet den SimHash jedes extrahierten Textes. Texte, die einem bereits verarbeiteten
+        oder frueher im selben Lauf extrahierten Artikel nahezu gleichen, werden aus
+        `article_data_map` entfernt und durchlaufen Modul 3-4 nicht erneut.
+        Gibt ({URL: Fingerprint}, {Duplikat-URL: Original-URL}) zurueck.
+        """
+        config = self.settings.near_duplicate
+        if not config.get("enabled", True):
+            return {}, {}
+
+        batch_urls = set(article_data_map['urls'])
+        index = SimHashIndex(config.get("max_distance", 3))
+        for url, fingerprint in self.db_handler.get_article_fingerprints().items():
+            # Erneut gescannte Artikel werden nicht mit ihrer eigenen frueheren Fassung verglichen.
+            if url not in batch_urls:
+                index.add(url, fingerprint)
+
+        fingerprints, duplicates = {}, {}
+        for idx in sorted(article_data_map['texts']):
+            url = article_data_map['urls'][idx]
+            fingerprints[url] = simhash(article_data_map['texts'][idx])
+            original = index.find(fingerprints[url])
+            if original:
+                print(f"[Main] {url} ist ein Beinahe-Duplikat von {original}. Ueberspringe IOC-Analyse.")
+                duplicates[url] = original
+                del article_data_map['texts'][idx]
+            else:
+                index.add(url, fingerprints[url])
+
+        if duplicates:
+            run_stats.increment("near_duplicates_skipped", len(duplicates))
+        return fingerprints, duplicates
+
 if __name__ == "__main__":
     orchestrator = CrawlerOrchestrator()
     orchestrator.run()
\ No newline at end of file
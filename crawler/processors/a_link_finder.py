@@ -1,135 +1,397 @@
 import feedparser
 import re
+import xml.etree.ElementTree as ET
 from urllib.parse import urlparse, urljoin
 from concurrent.futures import ThreadPoolExecutor
 
 from .base_processor import BaseProcessor
-from ..common.http_client import HttpClient
+from ..common.async_fetcher import AsyncFetchEngine
+from ..common.feed_parser import entry_timestamp, is_feed, iter_feed_entries, take_until_stale
+from ..common.host_scheduler import interleave_by_host
+from ..common.http_client import FetchResult, HttpClient
+from ..common.link_scorer import LinkScorer
+from ..common.run_stats import run_stats
+from ..common.selector_matcher import ContainerMatcher
+from ..common.sitemap_reader import iter_sitemap
+from ..common.url_canonicalizer import canonicalize_url, dedupe_by_canonical
 from db.crawler_db_handler import CrawlerDBHandler
 from settings.user_settings import UserSettings
 import datetime
 
 
-def filter_links_by_timestamp(all_links_from_source, scan_history_map, days_to_rescan=5):
+def filter_links_by_timestamp(all_links_from_source, scan_history_map, days_to_rescan=5,
+                              entry_dates=None, max_age_days=None):
+    """
+    Waehlt die zu verarbeitenden Links aus. Fuer Feed-Eintraege mit bekanntem Datum
+    (`entry_dates`) gilt: Eintraege aelter als `max_age_days` werden verworfen, bereits
+    gescannte Eintraege nur dann erneut verarbeitet, wenn sie seit dem Scan aktualisiert wurden.
+    Alle anderen Links werden nach `days_to_rescan` Tagen erneut geprueft. Scan-Verlauf und
+    `entry_dates` sind nach der normalisierten URL (`canonicalize_url`) geschluesselt.
+    """
+    entry_dates = entry_dates or {}
     links_to_process = []
     now_utc = datetime.datetime.now(datetime.timezone.utc)
     rescan_threshold = now_utc - datetime.timedelta(days=days_to_rescan)
+    age_threshold = now_utc - datetime.timedelta(days=max_age_days) if max_age_days else None
     for link in all_links_from_source:
-        if link not in scan_history_map:
+        history_key = canonicalize_url(link)
+        entry_date = entry_dates.get(history_key)
+        if entry_date and age_threshold and entry_date < age_threshold:
+            continue
+        if history_key not in scan_history_map:
             links_to_process.append(link)
         else:
-            timestamp_from_db = scan_history_map[link]
+            timestamp_from_db = scan_history_map[history_key]
             if timestamp_from_db:
                 aware_last_seen = timestamp_from_db.replace(tzinfo=datetime.timezone.utc)
-                if aware_last_seen < rescan_threshold:
+                if entry_date:
+                    if entry_date > aware_last_seen:
+                        links_to_process.append(link)
+                elif aware_last_seen < rescan_threshold:
                     links_to_process.append(link)
     return links_to_process
 
 
+def canonical_scan_history(scan_history_map) -> dict:
+    """Fasst Scan-Eintraege zusammen, die nach der URL-Normalisierung auf denselben Artikel zeigen."""
+    canonical_map = {}
+    for url, last_scanned in scan_history_map.items():
+        canonical = canonicalize_url(url)
+        previous = canonical_map.get(canonical)
+        if previous is None or (last_scanned and last_scanned > previous):
+            canonical_map[canonical] = last_scanned
+    return canonical_map
+
+
+def frontier_priority(depth: int) -> int:
+    """Prioritaet eines Frontier-Eintrags: je naeher an der Quelle, desto frueher wird er verarbeitet."""
+    return max(0, 100 - 10 * depth)
+
+
+def host_watermarks(scan_history_map) -> dict:
+    """Ermittelt pro Host den Zeitpunkt des letzten Scans (juengster Eintrag im Scan-Verlauf) in UTC."""
+    watermarks = {}
+    for url, last_scanned in scan_history_map.items():
+        if not last_scanned:
+            continue
+        host = urlparse(url).netloc.lower()
+        aware_last_scanned = last_scanned.replace(tzinfo=datetime.timezone.utc)
+        if host not in watermarks or aware_last_scanned > watermarks[host]:
+            watermarks[host] = aware_last_scanned
+    return watermarks
+
+
 class LinkFinder(BaseProcessor):
     INTERNAL_BLACKLIST = [
         '/search', '/tag/', '/author/', '/login', '/signup', '/forums', '/forum/',
         '/legal/', '/glossary/', '/news-tip/', 'mailto:', 'tel:', '/about',
         '/offer/', '/deals/', '/deals', '/categories'
     ]
+    PAGINATION_TEXTS = {
+        'next', 'next page', 'older posts', 'older entries', 'older', 'more articles', 'load more',
+        'weiter', 'nächste', 'nächste seite', 'ältere beiträge', '»', '›', '>', '>>'
+    }
+    CONTENT_SELECTORS = [
+        'article', 'main', 'div#main-col', 'div.bc_latest_news', 'div#content',
+        'div.content', 'div#main', 'div.main-content', 'div.posts',
+        'div.body-post', 'section.post-content', 'a.story-link'
+    ]
+    CONTAINER_MATCHER = ContainerMatcher(CONTENT_SELECTORS)
+    PAGINATION_CLASSES = {'next', 'older', 'next-page', 'nav-next', 'older-posts', 'next-posts', 'pagination-next'}
+    PAGINATION_PATTERN = re.compile(r'(/page/\d+/?$|[?&](page|paged)=\d+|/\d{4}/\d{2}/?$)', re.IGNORECASE)
 
     def __init__(self, settings: UserSettings, db_handler: CrawlerDBHandler):
         self.settings = settings
         self.db_handler = db_handler
         self.http_client = HttpClient()
+        self.feed_contents = {}
+        self.entry_dates = {}
+        self.host_watermarks = {}
+        self.source_watermarks = {}
+        self.source_fetch_times = {}
+        self.run_started = datetime.datetime.now(datetime.timezone.utc)
+        self.link_depths = {}
+        self.listing_links = {}
+        self.source_validators = {}
+        self._robots_dropped = set()
+        self.link_scorer = LinkScorer.from_settings(settings, self.INTERNAL_BLACKLIST)
+
+    def _is_blacklisted(self, url: str) -> bool:
+        return self.link_scorer.is_blacklisted(url)
 
     def _extract_links_from_html(self, soup, source_url: str) -> list[str]:
         """
         Extrahiert Artikel-Links aus einem BeautifulSoup-Objekt mit einer flexiblen,
-        Score-basierten Funktion.
+        Score-basierten Funktion. Beruecksichtigt werden nur Links in Inhaltscontainern
+        (`CONTENT_SELECTORS`, in einem Durchlauf zugeordnet), sonst alle Links der Seite.
+        Die Bewertung uebernimmt der LinkScorer mit dem Regelprofil der Quelle.
         """
-        article_links = set()
-        source_domain = urlparse(source_url).netloc
+        contained_links, all_links = self.CONTAINER_MATCHER.match_links(soup)
+        potential_links = all_links if contained_links is None else [link_tag for link_tag, _ in contained_links]
 
-        full_blacklist = self.INTERNAL_BLACKLIST + self.settings.blacklist_keywords
-
-        content_selectors = [
-            'article', 'main', 'div#main-col', 'div.bc_latest_news', 'div#content',
-            'div.content', 'div#main', 'div.main-content', 'div.posts',
-            'div.body-post', 'section.post-content', 'a.story-link'
-        ]
-
-        potential_links = []
-        found_main_content = False
-        for selector in content_selectors:
-            content_areas = soup.select(selector)
-            if content_areas:
-                for area in content_areas:
-                    potential_links.extend(area.find_all('a', href=True))
-                found_main_content = True
-
-        if not found_main_content:
-            potential_links = soup.find_all('a', href=True)
-
-        for link_tag in potential_links:
-            href = link_tag.get('href')
-            if not href or href.strip() in ['#', '/']:
-                continue
+        anchors = ((link_tag.get('href'), link_tag.get_text(strip=True)) for link_tag in potential_links)
+        return self.link_scorer.select_article_links(anchors, source_url)
 
-            absolute_url = urljoin(source_url, href)
-            parsed_url = urlparse(absolute_url)
+    def _process_source(self, source_url: str) -> list:
+        """Verarbeitet eine einzelne Quell-URL (RSS oder HTML) mit einem Conditional GET."""
+        result = self.http_client.fetch(source_url, revalidate=True, store_validators=False)
+        return self._links_from_result(source_url, result)
 
-            if parsed_url.netloc != source_domain or parsed_url.fragment:
-                continue
+    def _links_from_result(self, source_url: str, result: FetchResult, depth: int = 0) -> list:
+        """
+        Liefert die erlaubten Links einer Quelle; per robots.txt gesperrte Links werden verworfen.
+        Validatoren und Abrufzeitpunkt der Quelle werden nur vorgemerkt, wenn kein Link gesperrt
+        wurde: ein spaeteres 304 bzw. ein frueher Abbruch am Wasserstand wuerde verworfene Links
+        (z.B. bei nicht erreichbarer robots.txt) sonst dauerhaft verbergen. Gespeichert werden
+        beide erst, wenn die Links in der Frontier sind.
+        """
+        links = self._drop_disallowed(source_url, self._extract_links_from_result(source_url, result, depth))
+        for link in links:
+            key = canonicalize_url(link)
+            self.link_depths[key] = min(depth, self.link_depths.get(key, depth))
+        if depth == 0 and source_url not in self._robots_dropped:
+            if result.validators:
+                self.source_validators[source_url] = result.validators
+            if result.content is not None or result.not_modified:
+                self.source_fetch_times[source_url] = self.run_started
+        return links
 
-            path = parsed_url.path
-            link_text = link_tag.get_text(strip=True)
+    def _drop_disallowed(self, source_url: str, links: list) -> list:
+        """Entfernt Links, deren Abruf die robots.txt des jeweiligen Hosts verbietet."""
+        allowed = [link for link in links if self.http_client.is_allowed(link)]
+        if len(allowed) < len(links):
+            self._robots_dropped.add(source_url)
+            print(f"[LinkFinder] {len(links) - len(allowed)} Links von {source_url} durch robots.txt gesperrt.")
+            run_stats.increment("robots_disallowed", len(links) - len(allowed))
+        return allowed
 
-            if not path or not link_text:
-                continue
+    def _extract_links_from_result(self, source_url: str, result: FetchResult, depth: int = 0) -> list:
+        """
+        Extrahiert die Links aus dem Abruf-Ergebnis einer Quelle. Die Bytes werden nur
+        einmal geladen und je nach Dokumenttyp an feedparser oder den HTML-Parser gegeben.
+        """
+        if result.not_modified:
+            print(f"[LinkFinder] Quelle {source_url} ist seit dem letzten Lauf unveraendert. Ueberspringe.")
+            return []
+        if result.content is None:
+            return []
+
+        if is_feed(result.content, result.content_type):
+            entries = self._parse_feed(source_url, result)
+            for entry in entries:
+                if entry.get('link'):
+                    entry['link'] = entry['link'].strip()
+            links = [entry.get('link') for entry in entries if entry.get('link')]
+            self._collect_feed_contents(entries)
+            self._collect_entry_dates(entries)
+            print(f"[LinkFinder] {len(links)} Links aus RSS-Feed ({source_url}) extrahiert.")
+            return links
+
+        if self.settings.sitemap_discovery.get("enabled"):
+            links = self._links_from_sitemaps(source_url)
+            if links is not None:
+                print(f"[LinkFinder] {len(links)} neue Links aus Sitemaps ({source_url}) extrahiert.")
+                return links
 
-            if any(re.search(keyword, path, re.IGNORECASE) for keyword in full_blacklist):
+        soup = self.http_client.parse_html(result.content, result.encoding)
+        links = self._extract_links_from_html(soup, source_url)
+        print(f"[LinkFinder] {len(links)} Links aus HTML ({source_url}) extrahiert.")
+        if depth < self.settings.frontier.get("max_depth", 0):
+            for listing_url in self._drop_disallowed(source_url, self._extract_pagination_links(soup, source_url)):
+                self.listing_links[listing_url] = min(depth + 1, self.listing_links.get(listing_url, depth + 1))
+        return links
+
+    def _extract_pagination_links(self, soup, source_url: str) -> list[str]:
+        """
+        Findet "Naechste Seite"- und Archiv-Links einer Listenseite (rel=next, typische
+        Beschriftungen, /page/N/, ?page=N, Monatsarchive /JJJJ/MM/) auf derselben Domain.
+        """
+        source_domain = urlparse(source_url).netloc
+        candidates = [tag.get('href') for tag in soup.select('link[rel~=next][href], a[rel~=next][href]')]
+        for link_tag in soup.find_all('a', href=True):
+            link_text = link_tag.get_text(strip=True).lower()
+            classes = {css_class.lower() for css_class in link_tag.get('class', [])}
+            href = link_tag['href']
+            if link_text in self.PAGINATION_TEXTS or classes & self.PAGINATION_CLASSES \
+                    or self.PAGINATION_PATTERN.search(href):
+                candidates.append(href)
+
+        source_key = canonicalize_url(source_url)
+        listing_links = []
+        for href in candidates:
+            absolute_url = urljoin(source_url, href.strip())
+            parsed_url = urlparse(absolute_url)
+            if parsed_url.netloc != source_domain or canonicalize_url(absolute_url) == source_key:
                 continue
+            if self._is_blacklisted(absolute_url):
+                continue
+            listing_links.append(absolute_url)
+        return sorted(dedupe_by_canonical(listing_links))
 
-            score = 0
-            if len(link_text.split()) >= 4:
-                score += 2
-            elif len(link_text.split()) >= 3:
-                score += 1
-            if path.count('/') >= 3: score += 1
-            if re.search(r'/\d{4}/\d{2}/', path) or path.endswith(('.html', '.htm')): score += 1
-            if not path.endswith('/'): score += 1
+    def _expand_listings(self) -> list:
+        """
+        Expandiert offene Listen-/Archivseiten aus der Frontier in Prioritaetsreihenfolge und
+        markiert sie als erledigt, damit sie in spaeteren Laeufen nicht erneut abgelaufen werden.
+        Seiten, deren Abruf voruebergehend scheiterte (5xx, Timeout, offener Circuit), bleiben offen.
+        """
+        listing_pages = self.db_handler.get_frontier_batch(self.settings.frontier.get("listing_pages_per_run", 10),
+                                                           kind='listing')
+        if not listing_pages:
+            return []
+        print(f"[LinkFinder] Expandiere {len(listing_pages)} Listenseiten aus der Frontier...")
 
-            if score >= 3:
-                article_links.add(absolute_url)
+        def expand(listing):
+            url, depth = listing
+            result = self.http_client.fetch(url)
+            return url, result.retry_later, self._links_from_result(url, result, depth)
 
-        return sorted(list(article_links))
+        found_links, expanded_pages = [], []
+        listing_pages_by_host = interleave_by_host(listing_pages, key=lambda listing: listing[0])
+        with ThreadPoolExecutor(max_workers=self.settings.concurrency.get("max", 32)) as executor:
+            for url, retry_later, result_list in executor.map(expand, listing_pages_by_host):
+                found_links.extend(result_list)
+                if not retry_later:
+                    expanded_pages.append(url)
+        self.db_handler.mark_frontier_done(expanded_pages)
+        return found_links
 
-    def _process_source(self, source_url: str) -> list:
-        """Verarbeitet eine einzelne Quell-URL (RSS oder HTML)."""
-        feed = feedparser.parse(source_url, agent=self.http_client.HEADERS['User-Agent'])
-        if feed.entries:
-            links = [entry.link for entry in feed.entries if hasattr(entry, 'link') and entry.link]
-            if links:
-                print(f"[LinkFinder] {len(links)} Links aus RSS-Feed ({source_url}) extrahiert.")
-                return links
+    def _links_from_sitemaps(self, source_url: str) -> list | None:
+        """
+        Inkrementelle Link-Suche ueber die Sitemaps des Hosts (aus robots.txt, sonst /sitemap.xml).
+        Sitemap-Indizes werden aufgeloest; es werden nur URLs unterhalb des Quell-Pfads geliefert,
+        deren lastmod nach dem letzten Scan des Hosts liegt. Gibt None zurueck, wenn der Host
+        keine lesbare Sitemap hat; dann greift die HTML-Extraktion.
+        """
+        parsed_source = urlparse(source_url)
+        source_path = parsed_source.path or '/'
+        path_prefix = source_path if source_path.endswith('/') else source_path.rsplit('/', 1)[0] + '/'
+        watermark = self.host_watermarks.get(parsed_source.netloc.lower())
+        queue = self.http_client.sitemaps_for(source_url) or [f"{parsed_source.scheme}://{parsed_source.netloc}/sitemap.xml"]
+        max_sitemaps = self.settings.sitemap_discovery.get("max_sitemaps", 20)
 
-        soup = self.http_client.get_soup(source_url)
-        if soup:
-            links = self._extract_links_from_html(soup, source_url)
-            print(f"[LinkFinder] {len(links)} Links aus HTML ({source_url}) extrahiert.")
-            return links
+        visited, links, found = set(), [], False
+        while queue and len(visited) < max_sitemaps:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            result = self.http_client.fetch(sitemap_url, revalidate=True, allow_gzip=True)
+            if result.not_modified:
+                found = True
+                continue
+            if result.content is None:
+                continue
+            try:
+                for kind, loc, lastmod in iter_sitemap(result.content, watermark):
+                    found = True
+                    if kind == 'sitemapindex':
+                        queue.append(loc)
+                        continue
+                    parsed_loc = urlparse(loc)
+                    if parsed_loc.netloc != parsed_source.netloc or not parsed_loc.path.startswith(path_prefix) \
+                            or self._is_blacklisted(loc):
+                        continue
+                    links.append(loc)
+                    if lastmod:
+                        key = canonicalize_url(loc)
+                        self.entry_dates[key] = max(lastmod, self.entry_dates.get(key, lastmod))
+            except ET.ParseError as e:
+                print(f"[LinkFinder] Sitemap {sitemap_url} ist fehlerhaft ({e}). Verwende die bis dahin gelesenen Eintraege.")
+        return links if found else None
+
+    def _parse_feed(self, source_url: str, result: FetchResult) -> list:
+        """
+        Liest die Feed-Eintraege mit dem streamenden Parser und hoert auf, sobald mehrere Eintraege
+        in Folge vor dem letzten erfolgreichen Abruf dieser Quelle (Wasserstand) liegen oder ohnehin
+        zu alt sind. Einzelne Eintraege werden dabei nicht verworfen; das uebernimmt der Abgleich mit
+        der Scan-Historie. Fehlerhafte Feeds werden an das tolerantere feedparser uebergeben, fuer
+        das dieselbe Abbruchregel gilt.
+        """
+        stop_before = self.source_watermarks.get(source_url)
+        if self.settings.feed_max_age_days:
+            age_cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+                days=self.settings.feed_max_age_days)
+            stop_before = max(stop_before, age_cutoff) if stop_before else age_cutoff
+        try:
+            return iter_feed_entries(result.content, stop_before)
+        except ET.ParseError as e:
+            print(f"[LinkFinder] Feed {source_url} ist kein wohlgeformtes XML ({e}). Verwende feedparser.")
+            feed = feedparser.parse(result.content, response_headers={'content-type': result.content_type or ''})
+            return take_until_stale(feed.entries, stop_before)
+
+    def _collect_feed_contents(self, entries):
+        """
+        Merkt sich den vom Feed mitgelieferten Artikel-Body (content:encoded bzw. entry.content),
+        damit Modul 2 den Artikel nicht erneut laden muss. Reine Zusammenfassungen werden ignoriert.
+        """
+        if not self.settings.use_feed_content:
+            return
+        for entry in entries:
+            link = entry.get('link')
+            contents = entry.get('content') or []
+            body = max((c.get('value', '') for c in contents), key=len, default='')
+            if link and body:
+                self.feed_contents[link] = body
 
-        return []
+    def _collect_entry_dates(self, entries):
+        """Merkt sich pro (normalisiertem) Link den Veroeffentlichungs- bzw. Aktualisierungszeitpunkt aus dem Feed."""
+        for entry in entries:
+            link = entry.get('link')
+            timestamp = entry_timestamp(entry)
+            if link and timestamp:
+                key = canonicalize_url(link)
+                self.entry_dates[key] = max(timestamp, self.entry_dates.get(key, timestamp))
 
     def process(self, source_urls: list[str]) -> list[str]:
         print(f"\n[Prozessor 1] Starte Link-Suche fuer {len(source_urls)} Quellen parallel...")
         all_found_links = []
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_results = executor.map(self._process_source, source_urls)
+        self.feed_contents = {}
+        self.entry_dates = {}
+        self.link_depths = {}
+        self.listing_links = {}
+        self.source_validators = {}
+        self.source_fetch_times = {}
+        self._robots_dropped = set()
+        self.run_started = datetime.datetime.now(datetime.timezone.utc)
+        scan_history = canonical_scan_history(self.db_handler.get_article_scan_history(""))  # Komplette Historie
+        self.host_watermarks = host_watermarks(scan_history)
+        self.source_watermarks = self.db_handler.get_source_fetch_times()
+        source_urls = interleave_by_host(source_urls)
+        if self.settings.fetch_engine == "asyncio":
+            engine = AsyncFetchEngine.from_settings(self.settings)
+            future_results = engine.fetch_all(source_urls, self._links_from_result, store_validators=False)
             for result_list in future_results:
                 all_found_links.extend(result_list)
+        else:
+            # Die tatsaechliche Parallelitaet regelt der Concurrency-Controller im HttpClient.
+            with ThreadPoolExecutor(max_workers=self.settings.concurrency.get("max", 32)) as executor:
+                future_results = executor.map(self._process_source, source_urls)
+                for result_list in future_results:
+                    all_found_links.extend(result_list)
 
-        unique_links = sorted(list(set(all_found_links)))
+        self._enqueue_listings()
+        all_found_links.extend(self._expand_listings())
+        self._enqueue_listings()
+
+        # Varianten desselben Artikels fallen zusammen; abgerufen wird die zuerst gefundene URL.
+        unique_links = sorted(dedupe_by_canonical(all_found_links))
         print(f"[Prozessor 1] {len(unique_links)} einzigartige Links gefunden. Filtere gegen DB-Historie...")
 
-        scan_history = self.db_handler.get_article_scan_history("")  # Holt die komplette Historie
-        links_to_process = filter_links_by_timestamp(unique_links, scan_history)
+        links_to_process = filter_links_by_timestamp(unique_links, scan_history, entry_dates=self.entry_dates,
+                                                     max_age_days=self.settings.feed_max_age_days)
+
+        depths = [self.link_depths.get(canonicalize_url(link), 0) for link in links_to_process]
+        self.db_handler.add_to_frontier(
+            [(link, depth, frontier_priority(depth)) for link, depth in zip(links_to_process, depths)], kind='article')
+        for source_url, validators in self.source_validators.items():
+            self.http_client.remember_validators(source_url, validators)
+        self.db_handler.update_source_fetch_times(self.source_fetch_times)
 
         print(f"[Prozessor 1] Link-Suche abgeschlossen. {len(links_to_process)} Links zur Verarbeitung ausgewaehlt.")
-        return links_to_process
\ No newline at end of file
+        return links_to_process
+
+    def _enqueue_listings(self):
+        """Uebertraegt die gefundenen Listenseiten in die Frontier."""
+        listing_links, self.listing_links = self.listing_links, {}
+        self.db_handler.add_to_frontier(
+            [(url, depth, frontier_priority(depth)) for url, depth in sorted(listing_links.items())], kind='listing')
\ No newline at end of file
@@ -1,10 +1,25 @@
-import random
+import multiprocessing
+import os
+import queue
 import time
 import re
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from .base_processor import BaseProcessor
-from ..common.http_client import HttpClient
+from ..common.async_fetcher import AsyncFetchEngine
+from ..common.http_client import FetchResult, HttpClient
+from ..common.retry_policy import compute_retry_delay
+from ..common.host_scheduler import interleave_by_host
+from ..common.html_parser import decode_html
+from ..common.run_stats import run_stats
+from ..common.streaming_text import StreamingTextExtractor
+from ..common.time_budget import BudgetExceeded, time_limit
+from ..common.text_density import select_content_block
+from ..common.url_canonicalizer import canonical_link_from_href, canonical_link_from_soup
+from db.crawler_db_handler import CrawlerDBHandler
+from settings.user_settings import UserSettings
 
 
 class ContentExtractor(BaseProcessor):
@@ -12,66 +27,357 @@ class ContentExtractor(BaseProcessor):
     Extrahiert parallel den sauberen Textinhalt von einer Liste von Artikel-URLs.
     Ersetzt die Logik aus module2.
     """
+    TRUNCATION_MARKERS = ('...', '\u2026', '[\u2026]', '[...]', 'read more', 'continue reading',
+                          'weiterlesen', 'mehr lesen')
+    KNOWN_SELECTORS = [
+        'div.articlebody',
+        'div.article-body',
+        'div.story-content',
+        'div.post-body',
+        'div#article-content',
+        'div.td-post-content'
+    ]
+    CSS_IDENTIFIER = re.compile(r'^-?[A-Za-z_][\w-]*$')
+    CONTAINER_KEYWORDS = ('article', 'content', 'post', 'news', 'story', 'main', 'body')
 
-    def __init__(self):
+    def __init__(self, settings: UserSettings, db_handler: CrawlerDBHandler | None = None):
+        self.settings = settings
+        self.db_handler = db_handler
         self.http_client = HttpClient()
+        self.canonical_urls = {}
+        self.content_profiles = {}
+        self._changed_profiles = {}
+        self._profile_lock = threading.Lock()
+        self.light_urls = set()
+        self.abandoned = {}
+        self.pending = set()
+        self.time_spent = {}
+        self._validators = {}
 
-    def _extract_worker(self, url: str, retries: int = 3, backoff_factor: int = 3) -> tuple[str, str | None]:
+    def _remaining_budget(self, url: str) -> float | None:
+        """Verbleibendes Zeitbudget eines Artikels in Sekunden laut `article_budget` (None = unbegrenzt)."""
+        config = self.settings.article_budget
+        if not config.get("enabled"):
+            return None
+        return config.get("seconds", 60) - self.time_spent.get(url, 0.0)
+
+    def _abandon(self, url: str, reason: str):
+        print(f"[{self.__class__.__name__}] Zeitbudget fuer {url} aufgebraucht ({reason}). Artikel wird abgebrochen.")
+        run_stats.increment("articles_abandoned")
+        self.abandoned[url] = reason
+
+    def _fetch_document(self, url: str, retries: int = 3, backoff_factor: int = 3) -> FetchResult | None:
         """
-        Worker-Funktion, die den Inhalt einer URL extrahiert und bereinigt.
+        Laedt eine Artikel-URL mit Wiederholungsversuchen und gibt das Ergebnis zurueck, sofern
+        es verwertbaren Inhalt hat. Die Drosselung pro Host uebernimmt der HostScheduler des HttpClient.
+        Die Validatoren werden erst gespeichert, wenn aus dem Artikel Text extrahiert wurde.
+        Artikel aus `light_urls` werden ohne Conditional GET geladen: ihr erster Versuch wurde
+        abgebrochen, ein 304 wuerde den erneuten Versuch sonst verhindern. Auf das Zeitbudget
+        zaehlt nur die Dauer der Anfrage selbst (`FetchResult.elapsed`), nicht das Warten auf
+        Host-Scheduler und Concurrency-Controller.
         """
-        time.sleep(random.uniform(0.5, 2.0))
-
-        soup = None
+        revalidate = url not in self.light_urls
+        result = None
         for attempt in range(retries):
-            soup = self.http_client.get_soup(url)
-            if soup:
+            result = self.http_client.fetch(url, revalidate=revalidate, store_validators=False)
+            self.time_spent[url] = self.time_spent.get(url, 0.0) + (result.elapsed or 0.0)
+            wait_time = compute_retry_delay(result, attempt, retries, backoff_factor)
+            if wait_time is None:
                 break
 
-            if attempt < retries - 1:
-                wait_time = backoff_factor * (2 ** attempt)
-                print(
-                    f"[{self.__class__.__name__}] Netzwerkfehler bei {url}. Warte {wait_time}s vor Versuch {attempt + 2}...")
-                time.sleep(wait_time)
-
-        if not soup:
+            remaining = self._remaining_budget(url)
+            if remaining is not None and wait_time >= remaining:
+                self._abandon(url, BudgetExceeded("fetch").reason)
+                return None
             print(
-                f"[{self.__class__.__name__}] FEHLER: Konnte Inhalt fuer {url} nach {retries} Netzwerk-Versuchen nicht abrufen.")
-            return url, None
-
-        main_content_element = None
-
-        known_selectors = [
-            'div.articlebody',
-            'div.article-body',
-            'div.story-content',
-            'div.post-body',
-            'div#article-content',
-            'div.td-post-content'
-        ]
-        for selector in known_selectors:
+                f"[{self.__class__.__name__}] {result.outcome.value} bei {url}. Warte {wait_time:.1f}s vor Versuch {attempt + 2}...")
+            time.sleep(wait_time)
+            self.time_spent[url] += wait_time
+        return self._usable_result(url, result)
+
+    def _usable_result(self, url: str, result: FetchResult) -> FetchResult | None:
+        """
+        Gibt das Ergebnis zurueck, wenn es Inhalt zum Extrahieren hat, sonst None (mit Log-Ausgabe).
+        Voruebergehend gescheiterte Abrufe (5xx, Timeout, offener Circuit) werden in `pending` vermerkt.
+        """
+        if result.validators:
+            self._validators[url] = result.validators
+        if result.retry_later:
+            self.pending.add(url)
+        if result.not_modified:
+            print(f"[{self.__class__.__name__}] {url} ist seit dem letzten Scan unveraendert. Ueberspringe Extraktion.")
+            return None
+        if result.content is None:
+            print(f"[{self.__class__.__name__}] FEHLER: Konnte Inhalt fuer {url} nicht abrufen ({result.outcome.value}).")
+            return None
+        return result
+
+    def _extract_worker(self, url: str, retries: int = 3, backoff_factor: int = 3) -> tuple[str, str | None]:
+        """
+        Worker-Funktion, die den Inhalt einer URL laedt, extrahiert und bereinigt.
+        """
+        result = self._fetch_document(url, retries, backoff_factor)
+        return url, self._parse_within_budget(url, result) if result else None
+
+    def _extract_from_result(self, url: str, result: FetchResult) -> tuple[str, str | None]:
+        """
+        Parser-Funktion fuer die asynchrone Engine: verarbeitet ein bereits geladenes Ergebnis.
+        """
+        result = self._usable_result(url, result)
+        return url, self._parse_within_budget(url, result) if result else None
+
+    def _parse_pool_size(self) -> int:
+        """Anzahl der Parse-Prozesse laut `parse_pool` (0 = Anzahl der CPU-Kerne); 0 bei deaktiviertem Pool."""
+        config = self.settings.parse_pool
+        if not config.get("enabled"):
+            return 0
+        return config.get("max_workers") or os.cpu_count() or 1
+
+    def _download_all(self, urls: list[str], on_downloaded):
+        """I/O-Stufe: laedt nur die Bytes und reicht jedes Ergebnis sofort an `on_downloaded` weiter."""
+        if self.settings.fetch_engine == "asyncio":
+            engine = AsyncFetchEngine.from_settings(self.settings)
+            engine.fetch_all(urls, lambda url, result: on_downloaded(url, self._usable_result(url, result)),
+                             store_validators=False, unconditional=self.light_urls)
+        else:
+            with ThreadPoolExecutor(max_workers=self.settings.concurrency.get("max", 32)) as executor:
+                list(executor.map(lambda url: on_downloaded(url, self._fetch_document(url)), urls))
+
+    def _extract_with_parse_pool(self, urls: list[str], pool_size: int) -> list[tuple[str, str | None]]:
+        """
+        Zweistufige Extraktion: I/O-Threads laden die Artikel, ein ProcessPoolExecutor parst sie
+        ausserhalb des GIL. Die Ergebnisse werden in der Reihenfolge ihrer Fertigstellung
+        eingesammelt, waehrend weitere Downloads laufen. Faellt der Pool aus, wird im
+        Hauptprozess geparst.
+        """
+        print(f"[{self.__class__.__name__}] Parse {len(urls)} Artikel in bis zu {pool_size} Prozessen.")
+        finished = queue.Queue()
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+        results = []
+        with ProcessPoolExecutor(max_workers=pool_size, mp_context=context, initializer=_init_parse_worker,
+                                 initargs=(self.settings, HttpClient.PARSER_BACKEND)) as parse_pool:
+
+            dispatched = set()
+
+            def on_downloaded(url, result):
+                dispatched.add(url)
+                if result is None:
+                    finished.put((url, None, None))
+                    return
+                profile = self.content_profiles.get(urlparse(url).netloc.lower())
+                try:
+                    future = parse_pool.submit(_parse_in_worker, url, result.content, result.encoding, profile,
+                                               self.time_spent.get(url, 0.0), url in self.light_urls)
+                except Exception:
+                    finished.put((url, result, None))
+                    return
+                future.add_done_callback(lambda done, url=url, result=result: finished.put((url, result, done)))
+
+            def download():
+                try:
+                    self._download_all(urls, on_downloaded)
+                except Exception as e:
+                    print(f"[{self.__class__.__name__}] FEHLER beim Laden der Artikel: {e}")
+                finally:
+                    # Jede URL liefert genau ein Ergebnis, damit das Einsammeln nicht haengen bleibt.
+                    for url in set(urls) - dispatched:
+                        finished.put((url, None, None))
+
+            downloader = threading.Thread(target=download, daemon=True)
+            downloader.start()
+            for _ in urls:
+                url, result, done = finished.get()
+                results.append((url, self._collect_parsed(url, result, done)))
+            downloader.join()
+        return results
+
+    def _collect_parsed(self, url: str, result: FetchResult | None, done) -> str | None:
+        """Uebernimmt Text, rel=canonical, gelernte Profile und Kennzahlen eines Parse-Prozesses."""
+        if result is None:
+            return None
+        try:
+            if done is None:
+                raise RuntimeError("Parse-Pool nicht verfuegbar")
+            text, canonical, profiles, stats, abandon_reason, time_spent = done.result()
+        except Exception as e:
+            print(f"[{self.__class__.__name__}] Parse-Prozess fuer {url} fehlgeschlagen ({e}). Parse im Hauptprozess.")
+            return self._parse_within_budget(url, result)
+        self.time_spent[url] = time_spent
+        if abandon_reason:
+            self.abandoned[url] = abandon_reason
+        if canonical:
+            self.canonical_urls[url] = canonical
+        for domain, (strategy, selector) in profiles.items():
+            self._remember_profile(domain, strategy, selector)
+        for key, value in stats.items():
+            run_stats.increment(key, value)
+        return text
+
+    def _parse_within_budget(self, url: str, result: FetchResult) -> str | None:
+        """
+        Extrahiert den Text innerhalb des verbleibenden Zeitbudgets des Artikels; zuvor
+        abgebrochene Artikel (`light_urls`) mit der leichteren Strategie. Bricht der Watchdog
+        das Parsen ab (nur im Haupt-Thread, also im Parse-Pool), wird der Artikel mit Grund in
+        `abandoned` vermerkt; in Worker-Threads wird eine Ueberschreitung nur gezaehlt.
+        """
+        start = time.monotonic()
+        try:
+            with time_limit(self._remaining_budget(url), "parse"):
+                if url in self.light_urls:
+                    return self._extract_text_light(url, result)
+                return self._extract_text_from_document(url, result)
+        except BudgetExceeded as e:
+            self._abandon(url, e.reason)
+            return None
+        finally:
+            self.time_spent[url] = self.time_spent.get(url, 0.0) + time.monotonic() - start
+
+    def _extract_text_light(self, url: str, result: FetchResult) -> str | None:
+        """
+        Leichtere Strategie fuer Artikel, die bereits einmal am Zeitbudget gescheitert sind:
+        nur der Anfang des Dokuments (`light_max_bytes`), Streaming-Extraktion ohne DOM-Baum
+        und ein auf `light_max_chars` gekuerzter Text. Gekuerzt wird erst nach dem Dekodieren,
+        damit kein Mehrbyte-Zeichen an der Schnittstelle zerteilt wird.
+        """
+        config = self.settings.article_budget
+        extractor = StreamingTextExtractor(self.KNOWN_SELECTORS + ['article', 'main'], require_container=False)
+        html = decode_html(result.content, result.encoding)[:config.get("light_max_bytes", 512 * 1024)]
+        text, _ = extractor.extract(html)
+        canonical = canonical_link_from_href(extractor.canonical_href, url)
+        if canonical and canonical != url:
+            self.canonical_urls[url] = canonical
+
+        final_text = re.sub(r'\s{2,}', ' ', text).strip()[:config.get("light_max_chars", 100000)] if text else ''
+        if len(final_text) <= 50:
+            print(f"[{self.__class__.__name__}] Leichte Extraktion fuer {url} ohne ausreichenden Text.")
+            return None
+        print(f"[{self.__class__.__name__}] Inhalt fuer {url} mit der leichten Strategie extrahiert.")
+        return final_text
+
+    def _extract_text_from_document(self, url: str, result: FetchResult) -> str | None:
+        """
+        Parst ein geladenes Dokument, merkt sich dessen rel=canonical-URL und extrahiert den Text.
+        Im Modus `text_extraction = "streaming"` wird zuerst ohne DOM-Baum extrahiert; nur wenn
+        dabei kein Inhaltscontainer gefunden wird, folgt die baumbasierte Extraktion.
+        """
+        if self.settings.text_extraction == "streaming":
+            text = self._extract_text_streaming(url, result)
+            if text:
+                return text
+        soup = self.http_client.parse_html(result.content, result.encoding)
+        canonical = canonical_link_from_soup(soup, url)
+        if canonical and canonical != url:
+            self.canonical_urls[url] = canonical
+        return self._extract_text_from_soup(url, soup)
+
+    def _extract_text_streaming(self, url: str, result: FetchResult) -> str | None:
+        """
+        Schneller Pfad ueber html.parser-Ereignisse: gelernter Selektor der Domain, bekannte
+        Selektoren und semantische Container in dieser Reihenfolge. Gibt None zurueck, wenn
+        kein Container mit ausreichend Text gefunden wurde.
+        """
+        domain = urlparse(url).netloc.lower()
+        profile = self.content_profiles.get(domain)
+        selectors = self.KNOWN_SELECTORS + ['article', 'main']
+        if profile and profile[1] not in selectors:
+            selectors = [profile[1]] + selectors
+        try:
+            extractor = StreamingTextExtractor(selectors)
+        except ValueError:
+            extractor = StreamingTextExtractor(self.KNOWN_SELECTORS + ['article', 'main'])
+        text, selector = extractor.extract(decode_html(result.content, result.encoding))
+
+        canonical = canonical_link_from_href(extractor.canonical_href, url)
+        if canonical and canonical != url:
+            self.canonical_urls[url] = canonical
+
+        final_text = re.sub(r'\s{2,}', ' ', text).strip() if text else ''
+        if len(final_text) <= 50:
+            print(f"[{self.__class__.__name__}] Streaming-Extraktion ohne Ergebnis fuer {url}. Verwende den DOM-Baum.")
+            run_stats.increment("streaming_extraction_fallbacks")
+            return None
+
+        if profile and profile[1] == selector:
+            run_stats.increment("content_profile_hits")
+        else:
+            self._remember_profile(domain, 'known' if selector in self.KNOWN_SELECTORS else 'semantic', selector)
+        print(f"[{self.__class__.__name__}] Inhalt fuer {url} per Streaming aus '{selector}' extrahiert.")
+        return final_text
+
+    def _selector_for(self, tag) -> str | None:
+        """
+        Leitet einen CSS-Selektor ab, der den Container auch in anderen Artikeln der Domain
+        wiederfindet: bevorzugt Klassen, sonst die id. Bezeichner mit Ziffern (z.B. `post-4711`)
+        sind meist artikelspezifisch und werden uebergangen.
+        """
+        classes = [c for c in tag.get('class', []) if self._is_stable_identifier(c)]
+        if classes:
+            return f"{tag.name}.{'.'.join(classes)}"
+        if tag.get('id') and self._is_stable_identifier(tag['id']):
+            return f"{tag.name}#{tag['id']}"
+        return None
+
+    def _is_stable_identifier(self, identifier: str) -> bool:
+        return bool(self.CSS_IDENTIFIER.match(identifier)) and not any(char.isdigit() for char in identifier)
+
+    def _is_keyword_container(self, tag) -> bool:
+        """Kandidat fuer den Keyword-Fallback: div/section mit passender id oder Klasse."""
+        if tag.name not in ('div', 'section'):
+            return False
+        attributes_string = f"{tag.get('id', '')} {' '.join(tag.get('class', []))}".lower()
+        return any(keyword in attributes_string for keyword in self.CONTAINER_KEYWORDS)
+
+    def _remember_profile(self, domain: str, strategy: str, selector: str | None):
+        if not selector or self.content_profiles.get(domain) == (strategy, selector):
+            return
+        with self._profile_lock:
+            self.content_profiles[domain] = (strategy, selector)
+            self._changed_profiles[domain] = (strategy, selector)
+
+    def _find_main_content(self, url: str, soup):
+        """
+        Sucht den Hauptinhalt: zuerst mit dem fuer die Domain gelernten Selektor, sonst ueber
+        die vollstaendige Kaskade (bekannte Selektoren, semantische Tags, Keyword-Fallback).
+        Der erfolgreiche Selektor wird als Profil der Domain gemerkt.
+        """
+        domain = urlparse(url).netloc.lower()
+        profile = self.content_profiles.get(domain)
+        if profile:
+            main_content_element = soup.select_one(profile[1])
+            if main_content_element:
+                print(f"[{self.__class__.__name__}] Gelernten Container '{profile[1]}' für {url} gefunden.")
+                run_stats.increment("content_profile_hits")
+                return main_content_element
+            print(f"[{self.__class__.__name__}] Gelernter Container '{profile[1]}' fehlt bei {url}. Verwende die volle Suche.")
+            run_stats.increment("content_profile_misses")
+
+        for selector in self.KNOWN_SELECTORS:
             main_content_element = soup.select_one(selector)
             if main_content_element:
                 print(f"[{self.__class__.__name__}] Spezifischen Container '{selector}' für {url} gefunden.")
-                break
+                self._remember_profile(domain, 'known', selector)
+                return main_content_element
 
-        if not main_content_element:
-            main_content_element = soup.find('article') or soup.find('main')
-            if main_content_element:
-                print(
-                    f"[{self.__class__.__name__}] Semantischen Container '{main_content_element.name}' für {url} gefunden.")
-
-        if not main_content_element:
-            keywords = ['article', 'content', 'post', 'news', 'story', 'main', 'body']
-            candidate_containers = []
-            for tag in soup.find_all(['div', 'section']):
-                attributes_string = f"{tag.get('id', '')} {' '.join(tag.get('class', []))}".lower()
-                if any(keyword in attributes_string for keyword in keywords):
-                    candidate_containers.append(tag)
-            if candidate_containers:
-                main_content_element = max(candidate_containers, key=lambda t: len(t.get_text(strip=True)))
-                if main_content_element:
-                    print(f"[{self.__class__.__name__}] Fallback-Container per Keyword für {url} gefunden.")
+        main_content_element = soup.find('article') or soup.find('main')
+        if main_content_element:
+            print(
+                f"[{self.__class__.__name__}] Semantischen Container '{main_content_element.name}' für {url} gefunden.")
+            self._remember_profile(domain, 'semantic', main_content_element.name)
+            return main_content_element
+
+        main_content_element = select_content_block(soup, self._is_keyword_container)
+        if main_content_element:
+            print(f"[{self.__class__.__name__}] Fallback-Container per Keyword für {url} gefunden.")
+            self._remember_profile(domain, 'keyword', self._selector_for(main_content_element))
+            return main_content_element
+        return None
+
+    def _extract_text_from_soup(self, url: str, soup) -> str | None:
+        """
+        Sucht den Hauptinhalt im geparsten Dokument und gibt den bereinigten Text zurueck.
+        """
+        main_content_element = self._find_main_content(url, soup)
 
         if main_content_element:
             for unwanted_tag in main_content_element.select(
@@ -90,34 +396,138 @@ class ContentExtractor(BaseProcessor):
             final_text = re.sub(r'\s{2,}', ' ', clean_text).strip()
             if len(final_text) > 50:
                 print(f"[{self.__class__.__name__}] Inhalt fuer {url} erfolgreich extrahiert.")
-                return url, final_text
+                return final_text
             else:
                 print(
                     f"[{self.__class__.__name__}] Logik-Fehler: Inhalt fuer {url} abgerufen, aber Text ist zu kurz (<50 Zeichen).")
-                return url, None
+                return None
         else:
             print(f"[{self.__class__.__name__}] Logik-Fehler: Inhalt fuer {url} abgerufen, aber kein Text gefunden.")
-            return url, None
+            return None
 
-    def process(self, urls: list[str]) -> dict:
-        """Verarbeitet eine Liste von Artikel-URLs parallel."""
+    def _extract_text_from_feed(self, url: str, feed_html: str) -> str | None:
+        """
+        Bereinigt den vom Feed mitgelieferten Artikel-Body. Gibt None zurueck, wenn der Body
+        zu kurz oder erkennbar gekuerzt ist; der Artikel wird dann regulaer geladen.
+        """
+        soup = self.http_client.parse_html(feed_html.encode('utf-8'), 'utf-8')
+        for unwanted_tag in soup.select('script, style, form, iframe'):
+            unwanted_tag.decompose()
+        text_blocks = [tag.get_text(separator=' ', strip=True) for tag in
+                       soup.find_all(['h1', 'h2', 'h3', 'h4', 'p', 'li', 'pre', 'code', 'table'])]
+        clean_text = "\n".join(filter(None, text_blocks)) or soup.get_text(separator='\n', strip=True)
+        final_text = re.sub(r'\s{2,}', ' ', clean_text).strip()
+
+        if len(final_text) < self.settings.feed_fulltext_min_chars:
+            return None
+        if final_text[-40:].lower().rstrip(' >\u00bb\u2192').endswith(self.TRUNCATION_MARKERS):
+            return None
+        print(f"[{self.__class__.__name__}] Volltext fuer {url} aus dem Feed uebernommen.")
+        return final_text
+
+    def process(self, urls: list[str], feed_contents: dict | None = None, light_urls: set | None = None) -> dict:
+        """
+        Verarbeitet eine Liste von Artikel-URLs parallel. Liegt fuer eine URL bereits ein
+        vollstaendiger Body aus dem Feed vor (`feed_contents`), wird sie nicht geladen.
+        Gibt eine Seite per rel=canonical eine andere URL an, wird diese in `urls` eingetragen;
+        mehrere URLs mit demselben kanonischen Artikel werden nur einmal uebernommen.
+        Artikel aus `light_urls` werden mit der leichteren Strategie extrahiert. Am Zeitbudget
+        gescheiterte Artikel stehen mit Grund in `abandoned`, das Restbudget der uebrigen
+        fuer Modul 3 in `budgets`; URLs, deren Abruf voruebergehend scheiterte und spaeter erneut
+        versucht werden soll, in `pending` (jeweils in `article_data_map`).
+        """
         print(f"\n[Prozessor 2] Starte Inhalts-Extraktion fuer {len(urls)} Artikel parallel...")
 
-        article_data_map = {'urls': urls, 'texts': {}}
+        article_data_map = {'urls': list(urls), 'texts': {}, 'budgets': {}}
         successful_count = 0
+        self.canonical_urls = {}
+        self._changed_profiles = {}
+        self.light_urls = set(light_urls or ())
+        self.abandoned = {}
+        self.pending = set()
+        self.time_spent = {}
+        self._validators = {}
+        if self.db_handler:
+            self.content_profiles = self.db_handler.get_content_profiles()
+
+        url_to_index = {url: i for i, url in enumerate(urls)}
 
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            future_results = executor.map(self._extract_worker, urls)
+        results = []
+        for url in urls:
+            if feed_contents and url in feed_contents:
+                text = self._extract_text_from_feed(url, feed_contents[url])
+                if text:
+                    results.append((url, text))
+        from_feed = {url for url, _ in results}
+        # Reihum nach Host, damit ein dominanter Host nicht alle Worker blockiert.
+        urls_to_fetch = interleave_by_host([url for url in urls if url not in from_feed])
+        if results:
+            run_stats.increment("feed_fulltext_used", len(results))
+            print(f"[Prozessor 2] {len(results)} Texte aus Feeds uebernommen, {len(urls_to_fetch)} Artikel werden geladen.")
 
-            url_to_index = {url: i for i, url in enumerate(urls)}
+        pool_size = self._parse_pool_size() if urls_to_fetch else 0
+        if pool_size:
+            results.extend(self._extract_with_parse_pool(urls_to_fetch, pool_size))
+        elif self.settings.fetch_engine == "asyncio":
+            engine = AsyncFetchEngine.from_settings(self.settings)
+            results.extend(engine.fetch_all(urls_to_fetch, self._extract_from_result, store_validators=False,
+                                            unconditional=self.light_urls))
+        else:
+            # Die tatsaechliche Parallelitaet regelt der Concurrency-Controller im HttpClient.
+            with ThreadPoolExecutor(max_workers=self.settings.concurrency.get("max", 32)) as executor:
+                results.extend(executor.map(self._extract_worker, urls_to_fetch))
 
-            for url, content in future_results:
-                if content:
-                    idx = url_to_index[url]
-                    article_data_map['texts'][idx] = content
-                    successful_count += 1
+        seen_canonical = set()
+        for url, content in sorted(results, key=lambda item: url_to_index[item[0]]):
+            if not content:
+                continue
+            # Erst jetzt: ein spaeteres 304 darf nur Artikel ueberspringen, deren Text vorliegt.
+            self.http_client.remember_validators(url, self._validators.get(url))
+            idx = url_to_index[url]
+            canonical = self.canonical_urls.get(url, url)
+            if canonical in seen_canonical:
+                print(f"[{self.__class__.__name__}] {url} verweist per rel=canonical auf bereits extrahierten Artikel {canonical}.")
+                continue
+            seen_canonical.add(canonical)
+            article_data_map['urls'][idx] = canonical
+            article_data_map['texts'][idx] = content
+            remaining = self._remaining_budget(url)
+            if remaining is not None:
+                article_data_map['budgets'][idx] = remaining
+            successful_count += 1
+        article_data_map['abandoned'] = dict(self.abandoned)
+        article_data_map['pending'] = sorted(self.pending)
+
+        if self.db_handler and self._changed_profiles:
+            self.db_handler.save_content_profiles(self._changed_profiles)
 
         print(f"[Prozessor 2] Inhalts-Extraktion abgeschlossen. {successful_count} von {len(urls)} Texten extrahiert.")
         return article_data_map
 
 
+_parse_worker_extractor = None
+
+
+def _init_parse_worker(settings: UserSettings, parser_backend: str):
+    """Initialisiert einen Parse-Prozess mit eigenem ContentExtractor (ohne DB-Zugriff)."""
+    global _parse_worker_extractor
+    HttpClient.PARSER_BACKEND = parser_backend
+    _parse_worker_extractor = ContentExtractor(settings)
+
+
+def _parse_in_worker(url: str, content: bytes, encoding: str | None, profile: tuple[str, str] | None,
+                     time_spent: float = 0.0, light: bool = False):
+    """
+    Laeuft im Parse-Prozess: extrahiert den Text eines geladenen Artikels innerhalb seines
+    Restbudgets (hier per Watchdog hart abbrechbar) und gibt (Text, rel=canonical-URL,
+    gelernte Profile, Kennzahlen, Abbruchgrund, verbrauchte Zeit) an den Hauptprozess zurueck.
+    """
+    extractor = _parse_worker_extractor
+    extractor.canonical_urls, extractor._changed_profiles, extractor.abandoned = {}, {}, {}
+    extractor.content_profiles = {urlparse(url).netloc.lower(): profile} if profile else {}
+    extractor.light_urls = {url} if light else set()
+    extractor.time_spent = {url: time_spent}
+    run_stats.reset()
+    text = extractor._parse_within_budget(url, FetchResult(url, content=content, encoding=encoding))
+    return (text, extractor.canonical_urls.get(url), extractor._changed_profiles, run_stats.snapshot(),
+            extractor.abandoned.get(url), extractor.time_spent[url])
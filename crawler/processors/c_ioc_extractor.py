@@ -1,4 +1,6 @@
 from .base_processor import BaseProcessor
+from ..common.run_stats import run_stats
+from ..common.time_budget import BudgetExceeded, time_limit
 from ..module3.ioc_context import IOCExtractor
 from db.crawler_db_handler import CrawlerDBHandler
 
@@ -10,13 +12,27 @@ class IocExtractorProcessor(BaseProcessor):
     def process(self, article_data_map: dict) -> list:
         """
         Nimmt die Textdaten entgegen und verwendet die IOCExtractor-Klasse,
-        um alle annotierten IOCs zu finden.
+        um alle annotierten IOCs zu finden. Jeder Artikel wird innerhalb seines Restbudgets
+        (`budgets`) analysiert; bricht der Watchdog die Analyse ab, wird der Artikel mit Grund
+        in `abandoned` vermerkt (siehe time_limit).
         """
         print(f"\n[Prozessor 3] Übergebe {len(article_data_map.get('texts', {}))} Textinhalte zur IOC-Extraktion...")
 
-        article_contents_list = [article_data_map['texts'].get(i) for i in range(len(article_data_map['urls']))]
-
-        annotated_iocs = self.ioc_extractor.process_text_contents(article_contents_list)
+        budgets = article_data_map.get('budgets', {})
+        abandoned = article_data_map.setdefault('abandoned', {})
+        annotated_iocs = []
+        for i in range(len(article_data_map['urls'])):
+            text = article_data_map['texts'].get(i)
+            if not text:
+                continue
+            try:
+                with time_limit(budgets.get(i), "ioc_extraction"):
+                    annotated_iocs.extend(self.ioc_extractor.extract_iocs_from_text(text, i))
+            except BudgetExceeded as e:
+                url = article_data_map['urls'][i]
+                print(f"[Prozessor 3] Zeitbudget fuer {url} aufgebraucht. IOC-Extraktion abgebrochen.")
+                run_stats.increment("articles_abandoned")
+                abandoned[url] = e.reason
 
         print(f"[Prozessor 3] {len(annotated_iocs)} annotierte primäre IOCs extrahiert.")
-        return annotated_iocs
\ No newline at end of file
+        return annotated_iocs
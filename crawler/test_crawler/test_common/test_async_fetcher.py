@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from crawler.common.async_fetcher import AsyncFetchEngine
+from crawler.common.http_client import FetchOutcome, FetchResult
+
+
+class TestAsyncFetchEngine(unittest.TestCase):
+    """
+    Testfälle für die asynchrone Abruf-Engine.
+    """
+
+    @patch('crawler.common.async_fetcher.HttpClient.fetch')
+    def test_respects_per_host_limit(self, mock_fetch):
+        """Testet, dass pro Host nie mehr als `max_per_host` Anfragen gleichzeitig laufen."""
+        print("\n[TEST] test_respects_per_host_limit")
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+
+        def fake_fetch(url, revalidate=False, paced=True, store_validators=True):
+            host = url.split('/')[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            return FetchResult(url, content=url.encode())
+
+        mock_fetch.side_effect = fake_fetch
+        urls = [f"https://a.com/{i}" for i in range(10)] + [f"https://b.com/{i}" for i in range(10)]
+
+        engine = AsyncFetchEngine(max_in_flight=20, max_per_host=2)
+        results = engine.fetch_all(urls, lambda url, result: (url, result.content))
+
+        self.assertEqual(results, [(url, url.encode()) for url in urls])
+        self.assertLessEqual(peak["a.com"], 2)
+        self.assertLessEqual(peak["b.com"], 2)
+
+    @patch('crawler.common.async_fetcher.HttpClient.fetch')
+    def test_thread_pool_is_capped_at_concurrency_max(self, mock_fetch):
+        """
+        Testet, dass nie mehr Threads gleichzeitig abrufen als `concurrency["max"]` erlaubt,
+        waehrend `max_requests_in_flight` unabhaengig davon gilt.
+        """
+        print("\n[TEST] test_thread_pool_is_capped_at_concurrency_max")
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def fake_fetch(url, revalidate=False, paced=True, store_validators=True):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return FetchResult(url, content=b"x")
+
+        mock_fetch.side_effect = fake_fetch
+        settings = SimpleNamespace(max_requests_in_flight=200, max_requests_per_host=8, concurrency={"max": 3})
+
+        engine = AsyncFetchEngine.from_settings(settings)
+        engine.fetch_all([f"https://h{i}.com/" for i in range(12)], lambda url, result: None)
+
+        self.assertEqual(engine.max_in_flight, 200)
+        self.assertEqual(engine.max_workers, 3)
+        self.assertLessEqual(peak[0], 3)
+
+    @patch('crawler.common.async_fetcher.asyncio.sleep')
+    @patch('crawler.common.async_fetcher.HttpClient.fetch')
+    def test_failed_fetch_is_retried_then_reported_as_none(self, mock_fetch, mock_sleep):
+        """Testet, dass fehlgeschlagene Abrufe wiederholt und zuletzt mit None gemeldet werden."""
+        print("\n[TEST] test_failed_fetch_is_retried_then_reported_as_none")
+        mock_fetch.return_value = FetchResult("https://a.com/x", FetchOutcome.NETWORK_ERROR, error="down")
+
+        engine = AsyncFetchEngine(max_in_flight=5, max_per_host=1, retries=3)
+        results = engine.fetch_all(["https://a.com/x"], lambda url, result: result.content)
+
+        self.assertEqual(results, [None])
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertEqual(mock_sleep.await_count, 2)
+
+    @patch('crawler.common.async_fetcher.HttpClient.fetch')
+    def test_unconditional_urls_skip_revalidation(self, mock_fetch):
+        """Testet, dass URLs aus `unconditional` ohne Conditional GET geladen werden."""
+        print("\n[TEST] test_unconditional_urls_skip_revalidation")
+        mock_fetch.side_effect = lambda url, revalidate, paced, store_validators: FetchResult(url, content=b"x")
+
+        engine = AsyncFetchEngine(max_in_flight=5, max_per_host=1)
+        engine.fetch_all(["https://a.com/retry", "https://a.com/known"], lambda url, result: None,
+                         store_validators=False, unconditional={"https://a.com/retry"})
+
+        revalidated = {c.args[0]: c.kwargs['revalidate'] for c in mock_fetch.call_args_list}
+        self.assertEqual(revalidated, {"https://a.com/retry": False, "https://a.com/known": True})
+
+    @patch('crawler.common.async_fetcher.asyncio.sleep')
+    @patch('crawler.common.async_fetcher.HttpClient.fetch')
+    def test_not_modified_is_not_retried(self, mock_fetch, mock_sleep):
+        """Testet, dass ein 304 sofort an den Handler weitergegeben wird."""
+        print("\n[TEST] test_not_modified_is_not_retried")
+        mock_fetch.return_value = FetchResult("https://a.com/x", FetchOutcome.NOT_MODIFIED, status_code=304)
+
+        engine = AsyncFetchEngine(max_in_flight=5, max_per_host=1)
+        results = engine.fetch_all(["https://a.com/x"], lambda url, result: result.not_modified)
+
+        self.assertEqual(results, [True])
+        mock_fetch.assert_called_once()
+        mock_sleep.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()
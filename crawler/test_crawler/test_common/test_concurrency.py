@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+
+from crawler.common.concurrency import AdaptiveConcurrencyController
+from crawler.common.run_stats import RunStatistics
+
+
+class TestAdaptiveConcurrencyController(unittest.TestCase):
+    """
+    Testfälle für den AIMD-Concurrency-Controller und die Laufstatistik.
+    """
+
+    def test_successes_increase_limits_additively(self):
+        """Testet, dass schnelle Erfolge die Limits schrittweise bis zum Maximum anheben."""
+        print("\n[TEST] test_successes_increase_limits_additively")
+        controller = AdaptiveConcurrencyController(initial=2, maximum=4, per_host_initial=1, per_host_max=3)
+
+        for _ in range(50):
+            controller.acquire("a.com")
+            controller.release("a.com", 0.1, 200)
+
+        self.assertEqual(controller.limits(), {"global": 4, "hosts": {"a.com": 3}})
+
+    def test_throttling_and_timeouts_decrease_limits(self):
+        """Testet, dass 429/5xx das Host-Limit und Timeouts zusaetzlich das globale Limit senken."""
+        print("\n[TEST] test_throttling_and_timeouts_decrease_limits")
+        controller = AdaptiveConcurrencyController(initial=8, maximum=8, per_host_initial=8, per_host_max=8)
+
+        controller.acquire("a.com")
+        controller.release("a.com", 0.1, 429)
+        self.assertEqual(controller.limits()["hosts"]["a.com"], 4)
+        self.assertEqual(controller.limits()["global"], 8)
+
+        controller.acquire("b.com")
+        controller.release("b.com", None, "timeout")
+        self.assertEqual(controller.limits()["hosts"]["b.com"], 4)
+        self.assertEqual(controller.limits()["global"], 6)
+
+    def test_rising_latency_decreases_host_limit(self):
+        """Testet, dass deutlich steigende Antwortzeiten als Ueberlast gewertet werden."""
+        print("\n[TEST] test_rising_latency_decreases_host_limit")
+        controller = AdaptiveConcurrencyController(per_host_initial=4, per_host_max=4)
+
+        controller.acquire("a.com")
+        controller.release("a.com", 0.1, 200)
+        for _ in range(10):
+            controller.acquire("a.com")
+            controller.release("a.com", 5.0, 200)
+
+        self.assertEqual(controller.limits()["hosts"]["a.com"], 1)
+
+    def test_acquire_blocks_at_host_limit(self):
+        """Testet, dass nie mehr Anfragen gleichzeitig laufen, als das Host-Limit erlaubt."""
+        print("\n[TEST] test_acquire_blocks_at_host_limit")
+        controller = AdaptiveConcurrencyController(initial=10, per_host_initial=2, per_host_max=2)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def worker():
+            controller.acquire("a.com")
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            controller.release("a.com", 0.01, 200)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(state["peak"], 2)
+
+    def test_run_statistics_collects_values(self):
+        """Testet Zaehler und Momentaufnahmen der Laufstatistik."""
+        print("\n[TEST] test_run_statistics_collects_values")
+        stats = RunStatistics()
+        stats.increment("http_requests")
+        stats.increment("http_requests", 2)
+        stats.set_value("concurrency_limits", {"global": 4})
+
+        self.assertEqual(stats.snapshot(), {"http_requests": 3, "concurrency_limits": {"global": 4}})
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
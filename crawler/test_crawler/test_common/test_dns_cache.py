@@ -0,0 +1,91 @@
+import socket
+import unittest
+from unittest.mock import MagicMock, patch
+
+from urllib3.util import connection as urllib3_connection
+
+from crawler.common.dns_cache import DnsCache
+from crawler.common.run_stats import run_stats
+
+
+def _stub_resolver(*ips):
+    """Erstellt einen Resolver, der feste Adressen im Format von socket.getaddrinfo liefert."""
+    return MagicMock(return_value=[
+        (socket.AF_INET, socket.SOCK_STREAM, 6, '', (ip, 443)) for ip in ips
+    ])
+
+
+class TestDnsCache(unittest.TestCase):
+    """
+    Testfälle für den prozessweiten DNS-Cache.
+    """
+
+    def setUp(self):
+        run_stats.reset()
+
+    def tearDown(self):
+        DnsCache.uninstall()
+        run_stats.reset()
+
+    @patch('crawler.common.dns_cache.time.monotonic')
+    def test_resolve_uses_cache_until_ttl(self, mock_monotonic):
+        """Testet Treffer innerhalb der TTL, erneute Aufloesung danach und die Zaehler."""
+        print("\n[TEST] test_resolve_uses_cache_until_ttl")
+        mock_monotonic.return_value = 0.0
+        resolver = _stub_resolver("192.0.2.1", "192.0.2.1", "192.0.2.2")
+        cache = DnsCache(resolver, ttl=60)
+
+        self.assertEqual(cache.resolve("Example.com", 443), ["192.0.2.1", "192.0.2.2"])
+        mock_monotonic.return_value = 30.0
+        cache.resolve("example.com", 443)
+        mock_monotonic.return_value = 61.0
+        cache.resolve("example.com", 443)
+
+        self.assertEqual(resolver.call_count, 2)
+        self.assertEqual(run_stats.get("dns_cache_hits"), 1)
+        self.assertEqual(run_stats.get("dns_cache_misses"), 2)
+
+    @patch('crawler.common.dns_cache._system_create_connection')
+    def test_create_connection_tries_cached_addresses(self, mock_connect):
+        """Testet, dass bei einer nicht erreichbaren Adresse die naechste versucht wird."""
+        print("\n[TEST] test_create_connection_tries_cached_addresses")
+        sock = MagicMock()
+        mock_connect.side_effect = [ConnectionRefusedError("refused"), sock]
+        cache = DnsCache(_stub_resolver("192.0.2.1", "192.0.2.2"))
+        cache.install()
+
+        result = urllib3_connection.create_connection(("example.com", 443), 5)
+
+        self.assertIs(result, sock)
+        self.assertEqual([c.args[0] for c in mock_connect.call_args_list],
+                         [("192.0.2.1", 443), ("192.0.2.2", 443)])
+
+    @patch('crawler.common.dns_cache._system_create_connection')
+    def test_unreachable_host_is_invalidated(self, mock_connect):
+        """Testet, dass ein komplett unerreichbarer Host beim naechsten Mal neu aufgeloest wird."""
+        print("\n[TEST] test_unreachable_host_is_invalidated")
+        mock_connect.side_effect = ConnectionRefusedError("refused")
+        resolver = _stub_resolver("192.0.2.1")
+        cache = DnsCache(resolver)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionRefusedError):
+                cache.create_connection(("example.com", 443))
+
+        self.assertEqual(resolver.call_count, 2)
+
+    @patch('crawler.common.dns_cache._system_create_connection')
+    def test_ip_literals_bypass_cache(self, mock_connect):
+        """Testet, dass IP-Adressen nicht durch den Resolver laufen."""
+        print("\n[TEST] test_ip_literals_bypass_cache")
+        resolver = _stub_resolver("192.0.2.1")
+        cache = DnsCache(resolver)
+
+        cache.create_connection(("198.51.100.7", 80))
+
+        resolver.assert_not_called()
+        mock_connect.assert_called_once_with(("198.51.100.7", 80))
+
+
+if __name__ == '__main__':
+    unittest.main()
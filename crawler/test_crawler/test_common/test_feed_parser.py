@@ -0,0 +1,111 @@
+import datetime
+import unittest
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+from crawler.common import feed_parser
+from crawler.common.feed_parser import entry_timestamp, is_feed, iter_feed_entries
+
+
+class TestFeedSniffing(unittest.TestCase):
+    """
+    Testfälle für die Unterscheidung zwischen RSS/Atom-Feeds und HTML-Seiten.
+    """
+
+    def test_feed_detected_by_content_type(self):
+        """Testet, dass eindeutige Feed-Content-Types ohne Blick in den Body erkannt werden."""
+        print("\n[TEST] test_feed_detected_by_content_type")
+        self.assertTrue(is_feed(b"", "application/rss+xml; charset=utf-8"))
+        self.assertTrue(is_feed(b"", "application/atom+xml"))
+
+    def test_feed_detected_by_root_element(self):
+        """Testet, dass falsch deklarierte Feeds am Wurzelelement erkannt werden."""
+        print("\n[TEST] test_feed_detected_by_root_element")
+        rss = b'\xef\xbb\xbf<?xml version="1.0"?>\n<rss version="2.0"><channel></channel></rss>'
+        atom = b'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"></feed>'
+
+        self.assertTrue(is_feed(rss, "text/html"))
+        self.assertTrue(is_feed(atom, "text/xml"))
+
+    def test_html_is_not_a_feed(self):
+        """Testet, dass HTML-Seiten auch mit Feed-Begriffen im Text nicht als Feed gelten."""
+        print("\n[TEST] test_html_is_not_a_feed")
+        html = b'<!DOCTYPE html><html><body><feed>x</feed><a href="/rss">RSS</a></body></html>'
+        partial_html = b'<head><title>News</title></head><body><feedback>ok</feedback></body>'
+
+        self.assertFalse(is_feed(html, "text/html"))
+        self.assertFalse(is_feed(partial_html, None))
+
+
+class TestStreamingFeedParser(unittest.TestCase):
+    """
+    Testfälle für den streamenden RSS/Atom-Leser.
+    """
+
+    def test_reads_atom_entries(self):
+        """Testet Link, Zeitstempel und Inhalt von Atom-Eintraegen."""
+        print("\n[TEST] test_reads_atom_entries")
+        atom = b"""<?xml version="1.0" encoding="utf-8"?>
+        <feed xmlns="http://www.w3.org/2005/Atom">
+            <link href="https://example.com/"/>
+            <entry>
+                <link rel="replies" href="https://example.com/a1#comments"/>
+                <link href="https://example.com/a1"/>
+                <published>2025-03-01T10:00:00Z</published>
+                <updated>2025-03-02T08:30:00+02:00</updated>
+                <content type="html">&lt;p&gt;Voller Text&lt;/p&gt;</content>
+            </entry>
+        </feed>"""
+
+        entries = iter_feed_entries(atom)
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['link'], "https://example.com/a1")
+        self.assertEqual(entries[0]['content'], [{'value': "<p>Voller Text</p>"}])
+        self.assertEqual(entry_timestamp(entries[0]),
+                         datetime.datetime(2025, 3, 2, 6, 30, tzinfo=datetime.timezone.utc))
+
+    def test_reads_rss_content_encoded_and_pubdate(self):
+        """Testet content:encoded und RFC-822-Daten in RSS 2.0."""
+        print("\n[TEST] test_reads_rss_content_encoded_and_pubdate")
+        rss = b"""<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+            <item><link>https://example.com/r1</link><pubDate>Tue, 04 Mar 2025 09:15:00 +0000</pubDate>
+                <content:encoded><![CDATA[<p>Body</p>]]></content:encoded></item>
+        </channel></rss>"""
+
+        entries = iter_feed_entries(rss)
+
+        self.assertEqual(entries[0]['link'], "https://example.com/r1")
+        self.assertEqual(entries[0]['content'], [{'value': "<p>Body</p>"}])
+        self.assertEqual(entry_timestamp(entries[0]),
+                         datetime.datetime(2025, 3, 4, 9, 15, tzinfo=datetime.timezone.utc))
+
+    def test_stops_early_at_watermark(self):
+        """
+        Testet, dass nach mehreren zu alten Eintraegen in Folge nicht weitergelesen wird; die bis
+        dahin gelesenen aelteren Eintraege bleiben erhalten.
+        """
+        print("\n[TEST] test_stops_early_at_watermark")
+        items = "".join(
+            f"<item><link>https://example.com/{day}</link><pubDate>{day:02d} Jan 2025 00:00:00 GMT</pubDate></item>"
+            for day in (20, 18, 9, 15, 8, 7, 6, 5)
+        )
+        rss = f"<rss><channel>{items}</channel></rss>".encode()
+        not_before = datetime.datetime(2025, 1, 10, tzinfo=datetime.timezone.utc)
+
+        with patch('crawler.common.feed_parser._entry_from_element', wraps=feed_parser._entry_from_element) as spy:
+            entries = iter_feed_entries(rss, not_before)
+
+        self.assertEqual([e['link'] for e in entries],
+                         [f"https://example.com/{day}" for day in (20, 18, 9, 15, 8, 7, 6)])
+        self.assertEqual(spy.call_count, 7)
+
+    def test_malformed_xml_raises(self):
+        """Testet, dass fehlerhaftes XML signalisiert wird, damit feedparser uebernehmen kann."""
+        print("\n[TEST] test_malformed_xml_raises")
+        with self.assertRaises(ET.ParseError):
+            iter_feed_entries(b"<rss><channel><item><link>a&b</link></item></channel></rss>")
+
+
+if __name__ == '__main__':
+    unittest.main()
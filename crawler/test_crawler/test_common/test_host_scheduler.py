@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+
+from crawler.common.host_scheduler import HostScheduler, interleave_by_host
+
+
+class TestHostScheduler(unittest.TestCase):
+    """
+    Testfälle für den Token-Bucket-Scheduler pro Host.
+    """
+
+    @patch('crawler.common.host_scheduler.time.monotonic', return_value=100.0)
+    def test_burst_then_rate_limited(self, mock_monotonic):
+        """Testet, dass nach dem Burst jede weitere Anfrage 1/rate Sekunden spaeter startet."""
+        print("\n[TEST] test_burst_then_rate_limited")
+        scheduler = HostScheduler({"rate": 2.0, "burst": 2, "crawl_delay": 0.0})
+
+        waits = [scheduler._reserve("example.com") for _ in range(4)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.5, 1.0])
+
+    def test_interleave_by_host(self):
+        """Testet, dass ein nach Host gruppierter Batch reihum verteilt wird, pro Host in Originalreihenfolge."""
+        print("\n[TEST] test_interleave_by_host")
+        urls = [f"https://a.com/{i}" for i in range(4)] + ["https://B.com/1", "https://b.com/2", "https://c.com/1"]
+
+        self.assertEqual(interleave_by_host(urls), [
+            "https://a.com/0", "https://B.com/1", "https://c.com/1", "https://a.com/1", "https://b.com/2",
+            "https://a.com/2", "https://a.com/3"])
+        self.assertEqual(interleave_by_host([("https://a.com/x", 1), ("https://a.com/y", 2), ("https://b.com/z", 1)],
+                                            key=lambda item: item[0]),
+                         [("https://a.com/x", 1), ("https://b.com/z", 1), ("https://a.com/y", 2)])
+
+    @patch('crawler.common.host_scheduler.time.monotonic', return_value=100.0)
+    def test_hosts_are_independent(self, mock_monotonic):
+        """Testet, dass ein ausgelasteter Host andere Hosts nicht bremst."""
+        print("\n[TEST] test_hosts_are_independent")
+        scheduler = HostScheduler({"rate": 1.0, "burst": 1, "crawl_delay": 0.0})
+
+        scheduler._reserve("slow.com")
+        self.assertGreater(scheduler._reserve("slow.com"), 0)
+        self.assertEqual(scheduler._reserve("fast.com"), 0.0)
+
+    @patch('crawler.common.host_scheduler.time.monotonic', return_value=100.0)
+    def test_domain_policy_and_crawl_delay(self, mock_monotonic):
+        """Testet Domain-Regeln fuer Subdomains und den Mindestabstand per Crawl-Delay."""
+        print("\n[TEST] test_domain_policy_and_crawl_delay")
+        scheduler = HostScheduler(
+            {"rate": 10.0, "burst": 10, "crawl_delay": 0.0},
+            {"example.com": {"crawl_delay": 3.0}}
+        )
+
+        self.assertEqual(scheduler.policy_for("www.example.com")["crawl_delay"], 3.0)
+        self.assertEqual(scheduler._reserve("www.example.com"), 0.0)
+        self.assertEqual(scheduler._reserve("www.example.com"), 3.0)
+        self.assertEqual(scheduler._reserve("other.org"), 0.0)
+
+    @patch('crawler.common.host_scheduler.time.monotonic')
+    def test_tokens_refill_over_time(self, mock_monotonic):
+        """Testet, dass verbrauchte Tokens mit der konfigurierten Rate nachlaufen."""
+        print("\n[TEST] test_tokens_refill_over_time")
+        mock_monotonic.return_value = 0.0
+        scheduler = HostScheduler({"rate": 1.0, "burst": 1, "crawl_delay": 0.0})
+        scheduler._reserve("example.com")
+
+        mock_monotonic.return_value = 1.0
+        self.assertEqual(scheduler._reserve("example.com"), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,321 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from crawler.common.circuit_breaker import CircuitBreaker
+from crawler.common import html_parser
+from crawler.common.http_client import FetchOutcome, HttpClient
+from crawler.common.response_cache import ResponseCache
+
+
+def _make_response(status_code=200, content=b"", headers=None):
+    """Erstellt eine gestreamte Fake-Antwort fuer requests.Session.get."""
+    response = MagicMock(status_code=status_code, headers=headers or {})
+    response.iter_content.return_value = [content[i:i + 4] for i in range(0, len(content), 4)]
+    return response
+
+
+class TestHttpClient(unittest.TestCase):
+    """
+    Testfälle für den geteilten HttpClient.
+    """
+
+    def setUp(self):
+        """Sorgt dafür, dass jeder Test mit einer frischen Session startet."""
+        HttpClient.close_session()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        HttpClient.response_cache = ResponseCache(self.cache_dir.name)
+
+    def tearDown(self):
+        HttpClient.close_session()
+        HttpClient.response_cache = None
+        HttpClient.circuit_breaker = None
+        self.cache_dir.cleanup()
+
+    def test_session_is_shared_across_threads(self):
+        """Testet, dass alle Threads dieselbe Session und damit denselben Pool verwenden."""
+        print("\n[TEST] test_session_is_shared_across_threads")
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(HttpClient.get_session())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(s) for s in sessions}), 1)
+
+    def test_adapter_limits_connections_per_host(self):
+        """Testet, dass der Adapter die Verbindungen pro Host blockierend begrenzt."""
+        print("\n[TEST] test_adapter_limits_connections_per_host")
+        adapter = HttpClient.get_session().get_adapter("https://example.com/")
+
+        self.assertEqual(adapter._pool_maxsize, HttpClient.MAX_CONNECTIONS_PER_HOST)
+        self.assertTrue(adapter._pool_block)
+
+    @patch('requests.Session.get')
+    def test_get_soup_uses_shared_session(self, mock_session_get):
+        """Testet, dass get_soup ueber die geteilte Session abruft und HTML parst."""
+        print("\n[TEST] test_get_soup_uses_shared_session")
+        mock_session_get.return_value = _make_response(content=b"<html><body><p>Hallo</p></body></html>")
+
+        soup = HttpClient.get_soup("https://example.com/")
+
+        self.assertEqual(soup.p.get_text(), "Hallo")
+        mock_session_get.assert_called_once_with("https://example.com/", timeout=15, stream=True)
+
+    @patch('requests.Session.get')
+    def test_get_soup_returns_none_on_error(self, mock_session_get):
+        """Testet, dass Netzwerkfehler weiterhin zu None fuehren."""
+        print("\n[TEST] test_get_soup_returns_none_on_error")
+        mock_session_get.side_effect = requests.exceptions.ConnectionError("down")
+
+        self.assertIsNone(HttpClient.get_soup("https://example.com/"))
+
+    @patch('requests.Session.get')
+    def test_fetch_stores_validators_and_revalidates(self, mock_session_get):
+        """Testet, dass ETag/Last-Modified gespeichert und beim naechsten Abruf mitgeschickt werden."""
+        print("\n[TEST] test_fetch_stores_validators_and_revalidates")
+        url = "https://example.com/feed"
+        first_response = _make_response(content=b"<rss/>", headers={
+            'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Sep 2025 10:00:00 GMT'
+        })
+        second_response = _make_response(status_code=304)
+        mock_session_get.side_effect = [first_response, second_response]
+
+        first = HttpClient.fetch(url, revalidate=True)
+        second = HttpClient.fetch(url, revalidate=True)
+
+        self.assertEqual(first.content, b"<rss/>")
+        self.assertFalse(first.not_modified)
+        self.assertTrue(second.not_modified)
+        self.assertIsNone(second.content)
+        _, second_kwargs = mock_session_get.call_args_list[1]
+        self.assertEqual(second_kwargs['headers'], {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 01 Sep 2025 10:00:00 GMT'
+        })
+
+    @patch('requests.Session.get')
+    def test_validators_are_not_stored_for_truncated_or_deferred_fetches(self, mock_session_get):
+        """Testet, dass abgeschnittene Bodies keine Validatoren hinterlassen und `store_validators=False` sie nur liefert."""
+        print("\n[TEST] test_validators_are_not_stored_for_truncated_or_deferred_fetches")
+        headers = {'Content-Type': 'text/html', 'ETag': '"v1"'}
+        mock_session_get.side_effect = lambda *args, **kwargs: _make_response(content=b"<html>" + b"a" * 100,
+                                                                              headers=headers)
+
+        with patch.object(HttpClient, 'MAX_BODY_BYTES', 10):
+            truncated = HttpClient.fetch("https://example.com/huge", revalidate=True)
+        deferred = HttpClient.fetch("https://example.com/article", revalidate=True, store_validators=False)
+
+        self.assertIsNone(truncated.validators)
+        self.assertIsNone(HttpClient.response_cache.get("https://example.com/huge"))
+        self.assertEqual(deferred.validators, {'ETag': '"v1"'})
+        self.assertIsNone(HttpClient.response_cache.get("https://example.com/article"))
+
+        HttpClient.remember_validators("https://example.com/article", deferred.validators)
+        self.assertEqual(HttpClient.response_cache.conditional_headers("https://example.com/article"),
+                         {'If-None-Match': '"v1"'})
+
+    def test_response_cache_prune_expires_and_caps_entries(self):
+        """Testet, dass verfallene Eintraege und die aeltesten ueber der Obergrenze entfernt werden."""
+        print("\n[TEST] test_response_cache_prune_expires_and_caps_entries")
+        cache = ResponseCache(self.cache_dir.name, max_age_days=1, max_entries=2)
+        for i in range(4):
+            cache.store(f"https://example.com/{i}", {'ETag': f'"{i}"'})
+            os.utime(cache._entry_path(f"https://example.com/{i}"), (time.time() - 3600 * i,) * 2)
+        os.utime(cache._entry_path("https://example.com/3"), (time.time() - 3 * 86400,) * 2)
+
+        self.assertEqual(cache.prune(), 2)
+        self.assertIsNotNone(cache.get("https://example.com/0"))
+        self.assertIsNotNone(cache.get("https://example.com/1"))
+        self.assertIsNone(cache.get("https://example.com/2"))
+        self.assertIsNone(cache.get("https://example.com/3"))
+
+    @patch('requests.Session.get')
+    def test_fetch_without_revalidate_ignores_cache(self, mock_session_get):
+        """Testet, dass ohne `revalidate` keine Conditional-Header gesendet werden."""
+        print("\n[TEST] test_fetch_without_revalidate_ignores_cache")
+        url = "https://example.com/page"
+        HttpClient.response_cache.store(url, {'ETag': '"abc"'})
+        mock_session_get.return_value = _make_response(content=b"x")
+
+        HttpClient.fetch(url)
+
+        mock_session_get.assert_called_once_with(url, timeout=15, stream=True)
+
+    @patch('requests.Session.get')
+    def test_fetch_classifies_outcomes(self, mock_session_get):
+        """Testet die Zuordnung von Statuscodes und Ausnahmen zu typisierten Ergebnissen."""
+        print("\n[TEST] test_fetch_classifies_outcomes")
+        mock_session_get.side_effect = [
+            _make_response(status_code=404),
+            _make_response(status_code=503, headers={'Retry-After': '12'}),
+            _make_response(status_code=429),
+            requests.exceptions.ReadTimeout("slow"),
+            requests.exceptions.ConnectionError("refused"),
+        ]
+        url = "https://example.com/"
+
+        not_found = HttpClient.fetch(url)
+        unavailable = HttpClient.fetch(url)
+        throttled = HttpClient.fetch(url)
+        timeout = HttpClient.fetch(url)
+        network_error = HttpClient.fetch(url)
+
+        self.assertEqual(not_found.outcome, FetchOutcome.CLIENT_ERROR)
+        self.assertFalse(not_found.retryable)
+        self.assertEqual(unavailable.outcome, FetchOutcome.SERVER_ERROR)
+        self.assertEqual(unavailable.retry_after, 12.0)
+        self.assertEqual(throttled.outcome, FetchOutcome.THROTTLED)
+        self.assertEqual(timeout.outcome, FetchOutcome.TIMEOUT)
+        self.assertEqual(network_error.outcome, FetchOutcome.NETWORK_ERROR)
+        self.assertTrue(all(r.retryable for r in (unavailable, throttled, timeout, network_error)))
+
+    @patch('requests.Session.get')
+    def test_circuit_breaker_stops_requests_to_failing_host(self, mock_session_get):
+        """Testet, dass nach wiederholten Fehlern keine Anfragen mehr an den Host gehen."""
+        print("\n[TEST] test_circuit_breaker_stops_requests_to_failing_host")
+        HttpClient.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=300)
+        mock_session_get.side_effect = requests.exceptions.ConnectTimeout("dead")
+
+        results = [HttpClient.fetch(f"https://dead.example/{i}") for i in range(4)]
+
+        self.assertEqual([r.outcome for r in results], [
+            FetchOutcome.TIMEOUT, FetchOutcome.TIMEOUT, FetchOutcome.CIRCUIT_OPEN, FetchOutcome.CIRCUIT_OPEN
+        ])
+        self.assertEqual(mock_session_get.call_count, 2)
+        self.assertEqual(HttpClient.circuit_breaker.open_hosts(), ["dead.example"])
+
+    @patch('crawler.common.circuit_breaker.time.monotonic')
+    def test_circuit_breaker_half_open_trial(self, mock_monotonic):
+        """Testet, dass nach Ablauf der Sperrzeit genau ein Probeaufruf erlaubt ist."""
+        print("\n[TEST] test_circuit_breaker_half_open_trial")
+        mock_monotonic.return_value = 0.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record("a.com", failed=True)
+        self.assertFalse(breaker.allow("a.com"))
+
+        mock_monotonic.return_value = 61.0
+        self.assertTrue(breaker.allow("a.com"))
+        self.assertFalse(breaker.allow("a.com"))
+        breaker.record("a.com", failed=False)
+        self.assertTrue(breaker.allow("a.com"))
+
+    @patch('requests.Session.get')
+    def test_fetch_rejects_non_markup_content_type(self, mock_session_get):
+        """Testet, dass z.B. PDFs anhand des Content-Type abgelehnt werden, ohne den Body zu lesen."""
+        print("\n[TEST] test_fetch_rejects_non_markup_content_type")
+        response = _make_response(content=b"%PDF-1.7 ...", headers={'Content-Type': 'application/pdf'})
+        mock_session_get.return_value = response
+
+        result = HttpClient.fetch("https://example.com/report.pdf")
+
+        self.assertEqual(result.outcome, FetchOutcome.REJECTED)
+        self.assertFalse(result.retryable)
+        response.iter_content.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_fetch_sniffs_binary_without_content_type(self, mock_session_get):
+        """Testet, dass Binaerdaten ohne aussagekraeftigen Content-Type am ersten Block erkannt werden."""
+        print("\n[TEST] test_fetch_sniffs_binary_without_content_type")
+        mock_session_get.return_value = _make_response(content=b"\x00\x00\x00\x00CD001",
+                                                       headers={'Content-Type': 'application/octet-stream'})
+
+        result = HttpClient.fetch("https://example.com/image.iso")
+
+        self.assertEqual(result.outcome, FetchOutcome.REJECTED)
+
+    @patch('requests.Session.get')
+    def test_fetch_accepts_gzip_only_when_allowed(self, mock_session_get):
+        """Testet, dass gzip-Dateien (z.B. Sitemaps) nur mit `allow_gzip` angenommen werden."""
+        print("\n[TEST] test_fetch_accepts_gzip_only_when_allowed")
+        mock_session_get.side_effect = lambda *args, **kwargs: _make_response(
+            content=b"\x1f\x8b\x08\x00gz", headers={'Content-Type': 'application/x-gzip'})
+
+        self.assertEqual(HttpClient.fetch("https://example.com/sitemap.xml.gz").outcome, FetchOutcome.REJECTED)
+        allowed = HttpClient.fetch("https://example.com/sitemap.xml.gz", allow_gzip=True)
+        self.assertEqual(allowed.outcome, FetchOutcome.OK)
+        self.assertEqual(allowed.content, b"\x1f\x8b\x08\x00gz")
+
+    @patch('requests.Session.get')
+    def test_fetch_truncates_large_body(self, mock_session_get):
+        """Testet, dass Bodies ueber der Groessengrenze abgeschnitten und markiert werden."""
+        print("\n[TEST] test_fetch_truncates_large_body")
+        mock_session_get.return_value = _make_response(content=b"<html>" + b"a" * 100,
+                                                       headers={'Content-Type': 'text/html; charset=utf-8'})
+
+        with patch.object(HttpClient, 'MAX_BODY_BYTES', 10):
+            result = HttpClient.fetch("https://example.com/huge")
+
+        self.assertEqual(result.outcome, FetchOutcome.OK)
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.content, b"<html>aaaa")
+
+    @patch('requests.Session.get')
+    def test_concurrency_slot_is_held_until_body_is_read(self, mock_session_get):
+        """
+        Testet, dass der Controller-Slot erst nach dem Lesen des Bodies freigegeben wird und ein
+        Lese-Timeout mitten im Body als 'timeout' statt als Statuscode gemeldet wird.
+        """
+        print("\n[TEST] test_concurrency_slot_is_held_until_body_is_read")
+        controller = MagicMock()
+        events = []
+        controller.release.side_effect = lambda host, latency, outcome: events.append(("release", outcome))
+
+        def body(chunk_size):
+            events.append(("read", None))
+            yield b"<html>"
+            raise requests.exceptions.ConnectionError(ReadTimeoutError(None, None, "Read timed out."))
+
+        response = _make_response(headers={'Content-Type': 'text/html'})
+        response.iter_content.side_effect = body
+        mock_session_get.return_value = response
+
+        with patch.object(HttpClient, 'concurrency', controller):
+            result = HttpClient.fetch("https://example.com/slow", paced=False)
+
+        self.assertEqual(result.outcome, FetchOutcome.TIMEOUT)
+        self.assertEqual(events, [("read", None), ("release", "timeout")])
+        controller.acquire.assert_called_once_with("example.com")
+
+    @patch('requests.Session.get')
+    def test_declared_charset_is_passed_to_parser(self, mock_session_get):
+        """Testet, dass das per HTTP deklarierte Charset ohne Erkennung beim Parsen verwendet wird."""
+        print("\n[TEST] test_declared_charset_is_passed_to_parser")
+        mock_session_get.return_value = _make_response(
+            content="<html><body><p>Größe</p></body></html>".encode('latin-1'),
+            headers={'Content-Type': 'text/html; charset="ISO-8859-1"'}
+        )
+
+        soup = HttpClient.get_soup("https://example.com/latin")
+
+        self.assertEqual(soup.p.get_text(), "Größe")
+        self.assertEqual(soup.original_encoding, "iso-8859-1")
+
+    def test_parser_backend_resolution(self):
+        """Testet die Auswahl des Parser-Backends inklusive Fallback ohne lxml."""
+        print("\n[TEST] test_parser_backend_resolution")
+        self.assertEqual(html_parser.resolve_parser_backend("html.parser"), "html.parser")
+        with patch.object(html_parser, 'LXML_AVAILABLE', False):
+            self.assertEqual(html_parser.resolve_parser_backend("auto"), "html.parser")
+            self.assertEqual(html_parser.resolve_parser_backend("lxml"), "html.parser")
+        with patch.object(html_parser, 'LXML_AVAILABLE', True):
+            self.assertEqual(html_parser.resolve_parser_backend("auto"), "lxml")
+            self.assertEqual(html_parser.resolve_parser_backend("unknown"), "lxml")
+
+    def test_charset_from_content_type(self):
+        """Testet das Auslesen des Charsets aus dem Content-Type-Header."""
+        print("\n[TEST] test_charset_from_content_type")
+        self.assertEqual(html_parser.charset_from_content_type("text/html; charset=UTF-8"), "utf-8")
+        self.assertIsNone(html_parser.charset_from_content_type("text/html"))
+        self.assertIsNone(html_parser.charset_from_content_type(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
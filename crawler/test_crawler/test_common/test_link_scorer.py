@@ -0,0 +1,46 @@
+import unittest
+
+from crawler.common.link_scorer import LinkScorer
+
+
+class TestLinkScorer(unittest.TestCase):
+    """
+    Testfälle für die Link-Bewertung mit Regelprofilen.
+    """
+
+    def setUp(self):
+        self.scorer = LinkScorer(
+            ["/tag/", "/offer/"],
+            {"min_score": 3},
+            {"example.org": {"min_score": 2, "blacklist_keywords": [r"/video/"], "article_pattern": r"^/research/"}}
+        )
+
+    def test_default_profile_scores_unique_hrefs(self):
+        """Testet Bewertung, Blacklist und dass bei doppelten hrefs der Anker mit dem laengsten Text zaehlt."""
+        print("\n[TEST] test_default_profile_scores_unique_hrefs")
+        anchors = [
+            ("/2025/03/new-campaign.html", ""),
+            ("/2025/03/new-campaign.html", "New phishing campaign observed"),
+            ("/news/security/short", "Short"),
+            ("/tag/malware/some-post", "A long title about malware here"),
+            ("https://other.com/news/a/b", "A long title on another host"),
+            ("#", "Top"),
+        ]
+
+        self.assertEqual(self.scorer.select_article_links(anchors, "https://example.com/news/"),
+                         ["https://example.com/2025/03/new-campaign.html"])
+
+    def test_domain_profile_applies_to_subdomains(self):
+        """Testet, dass ein Domain-Profil Schwelle, Blacklist und Artikel-Muster fuer Subdomains ergaenzt."""
+        print("\n[TEST] test_domain_profile_applies_to_subdomains")
+        anchors = [("/research/apt-report", "Report"), ("/video/briefing/clip", "Weekly threat briefing video clip")]
+
+        self.assertEqual(self.scorer.select_article_links(anchors, "https://blog.example.org/"),
+                         ["https://blog.example.org/research/apt-report"])
+        self.assertTrue(self.scorer.is_blacklisted("https://www.example.org/video/x"))
+        self.assertFalse(self.scorer.is_blacklisted("https://example.com/video/x"))
+        self.assertTrue(self.scorer.is_blacklisted("https://example.com/Offer/x"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from crawler.common.host_scheduler import HostScheduler
+from crawler.common.robots_cache import RobotsCache
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private/
+Crawl-delay: 5
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+class TestRobotsCache(unittest.TestCase):
+    """
+    Testfälle für den robots.txt-Cache.
+    """
+
+    def test_disallow_rules_and_crawl_delay(self):
+        """Testet Disallow-Regeln und die Weitergabe des Crawl-Delays an den Scheduler."""
+        print("\n[TEST] test_disallow_rules_and_crawl_delay")
+        fetch_robots = MagicMock(return_value=(200, ROBOTS_TXT))
+        scheduler = HostScheduler()
+        cache = RobotsCache(fetch_robots, scheduler)
+
+        self.assertTrue(cache.can_fetch("https://example.com/news/article.html"))
+        self.assertFalse(cache.can_fetch("https://example.com/private/report.html"))
+        self.assertEqual(cache.sitemaps("https://example.com/"), ["https://example.com/sitemap.xml"])
+        self.assertEqual(scheduler.policy_for("example.com")["crawl_delay"], 5.0)
+        fetch_robots.assert_called_once_with("https://example.com/robots.txt")
+
+    @patch('crawler.common.robots_cache.time.monotonic')
+    def test_rules_are_reloaded_after_ttl(self, mock_monotonic):
+        """Testet, dass die robots.txt erst nach Ablauf der TTL erneut geladen wird."""
+        print("\n[TEST] test_rules_are_reloaded_after_ttl")
+        mock_monotonic.return_value = 0.0
+        fetch_robots = MagicMock(return_value=(200, ROBOTS_TXT))
+        cache = RobotsCache(fetch_robots, ttl=60)
+
+        cache.can_fetch("https://example.com/a")
+        mock_monotonic.return_value = 59.0
+        cache.can_fetch("https://example.com/b")
+        self.assertEqual(fetch_robots.call_count, 1)
+
+        mock_monotonic.return_value = 61.0
+        cache.can_fetch("https://example.com/c")
+        self.assertEqual(fetch_robots.call_count, 2)
+
+    def test_status_code_semantics(self):
+        """Testet: 404 erlaubt alles, 403 und eine nicht erreichbare robots.txt sperren den Host."""
+        print("\n[TEST] test_status_code_semantics")
+        responses = {
+            "https://missing.com/robots.txt": (404, None),
+            "https://forbidden.com/robots.txt": (403, None),
+            "https://down.com/robots.txt": (None, None),
+        }
+        cache = RobotsCache(lambda robots_url: responses[robots_url])
+
+        self.assertTrue(cache.can_fetch("https://missing.com/any"))
+        self.assertFalse(cache.can_fetch("https://forbidden.com/any"))
+        self.assertFalse(cache.can_fetch("https://down.com/any"))
+
+
+if __name__ == '__main__':
+    unittest.main()
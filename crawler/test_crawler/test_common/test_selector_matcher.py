@@ -0,0 +1,41 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from crawler.common.selector_matcher import ContainerMatcher
+
+
+class TestContainerMatcher(unittest.TestCase):
+    """
+    Testfälle für die Zuordnung von Links zu Inhaltscontainern in einem Durchlauf.
+    """
+
+    def test_nested_containers_yield_each_link_once_with_best_priority(self):
+        """Testet, dass verschachtelte Container Links nur einmal und mit der hoechsten Prioritaet liefern."""
+        print("\n[TEST] test_nested_containers_yield_each_link_once_with_best_priority")
+        soup = BeautifulSoup("""
+            <nav><a href="/menu">Menu</a></nav>
+            <main><a href="/m">M</a><article><a href="/a">A</a></article>
+                <div class="content extra"><a href="/c">C</a><a name="anchor">kein href</a></div></main>
+            <a class="story-link" href="/s">S</a>""", 'html.parser')
+        matcher = ContainerMatcher(['article', 'main', 'div.content', 'a.story-link'])
+
+        contained, all_links = matcher.match_links(soup)
+
+        self.assertEqual([(tag['href'], priority) for tag, priority in contained],
+                         [("/m", 1), ("/a", 0), ("/c", 1), ("/s", 3)])
+        self.assertEqual([tag['href'] for tag in all_links], ["/menu", "/m", "/a", "/c", "/s"])
+
+    def test_without_container_and_invalid_selector(self):
+        """Testet den Fall ohne Container (None statt leerer Liste) und die Ablehnung komplexer Selektoren."""
+        print("\n[TEST] test_without_container_and_invalid_selector")
+        matcher = ContainerMatcher(['div#main-col'])
+
+        self.assertIsNone(matcher.match_links(BeautifulSoup('<div id="other"><a href="/x">X</a></div>', 'html.parser'))[0])
+        self.assertEqual(matcher.match_links(BeautifulSoup('<div id="main-col"></div>', 'html.parser'))[0], [])
+        with self.assertRaises(ValueError):
+            ContainerMatcher(['div > a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from crawler.common.simhash import SimHashIndex, hamming_distance, simhash
+
+ARTICLE = (
+    "Researchers observed a new phishing campaign attributed to APT28 targeting government agencies in Europe. "
+    "The attackers used weaponized documents exploiting CVE-2023-23397 to steal credentials and deployed a "
+    "custom backdoor communicating with the command and control server at evil-update.com over HTTPS. "
+    "Victims were located in Germany, Poland and Ukraine, and the campaign has been active since early March. "
+    "Analysts recommend blocking the listed domains, enforcing multi-factor authentication and applying the Outlook "
+    "security update without delay. Additional indicators include the IP address 203.0.113.17 and a loader named "
+    "SnakeByte that is delivered through compressed archives attached to spoofed invitations."
+)
+
+
+class TestSimHash(unittest.TestCase):
+    """
+    Testfälle für die SimHash-Fingerprints und den Duplikat-Index.
+    """
+
+    def test_near_duplicates_have_small_distance(self):
+        """Testet, dass leicht veraenderte Texte nah und fremde Texte weit voneinander entfernt liegen."""
+        print("\n[TEST] test_near_duplicates_have_small_distance")
+        syndicated = "Source: Example News. " + ARTICLE.replace("Germany", "GERMANY")
+        other = ("The quarterly report covers ransomware trends in the healthcare sector, including LockBit "
+                 "affiliates and data leak sites, with recommendations for backup and recovery planning.")
+
+        self.assertEqual(simhash(ARTICLE), simhash(ARTICLE))
+        self.assertLessEqual(hamming_distance(simhash(ARTICLE), simhash(syndicated)), 3)
+        self.assertGreater(hamming_distance(simhash(ARTICLE), simhash(other)), 10)
+        self.assertEqual(simhash(""), 0)
+
+    def test_index_finds_closest_fingerprint_within_distance(self):
+        """Testet, dass der Index nur Fingerprints innerhalb der Distanz findet, auch bei Abweichungen in allen Bereichen."""
+        print("\n[TEST] test_index_finds_closest_fingerprint_within_distance")
+        index = SimHashIndex(max_distance=3)
+        base = 0x0123456789ABCDEF
+        index.add("https://a.com/original", base)
+        index.add("https://b.com/other", base ^ 0xFFFF0000FFFF0000)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.find(base ^ (1 << 0) ^ (1 << 20) ^ (1 << 40)), "https://a.com/original")
+        self.assertIsNone(index.find(base ^ (1 << 0) ^ (1 << 20) ^ (1 << 40) ^ (1 << 60)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import datetime
+import gzip
+import unittest
+import xml.etree.ElementTree as ET
+
+from crawler.common.sitemap_reader import iter_sitemap
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+    <url><loc>https://example.com/a</loc><lastmod>2025-03-02</lastmod>
+        <image:image><image:loc>https://example.com/a.png</image:loc></image:image></url>
+    <url><loc>https://example.com/b</loc><lastmod>2024-12-24T08:00:00+01:00</lastmod></url>
+    <url><loc>https://example.com/c</loc></url>
+</urlset>"""
+
+
+class TestSitemapReader(unittest.TestCase):
+    """
+    Testfälle für den streamenden Sitemap-Leser.
+    """
+
+    def test_reads_urlset_and_ignores_extensions(self):
+        """Testet URLs, lastmod-Werte und das Ignorieren von image:loc."""
+        print("\n[TEST] test_reads_urlset_and_ignores_extensions")
+        entries = list(iter_sitemap(URLSET))
+
+        self.assertEqual([(kind, loc) for kind, loc, _ in entries],
+                         [("urlset", "https://example.com/a"), ("urlset", "https://example.com/b"),
+                          ("urlset", "https://example.com/c")])
+        self.assertEqual(entries[1][2], datetime.datetime(2024, 12, 24, 7, 0, tzinfo=datetime.timezone.utc))
+        self.assertIsNone(entries[2][2])
+
+    def test_lastmod_watermark_and_gzip(self):
+        """Testet gzip-Sitemaps und das Ueberspringen von Eintraegen vor dem Wasserstand."""
+        print("\n[TEST] test_lastmod_watermark_and_gzip")
+        not_before = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+        locs = [loc for _, loc, _ in iter_sitemap(gzip.compress(URLSET), not_before)]
+
+        self.assertEqual(locs, ["https://example.com/a", "https://example.com/c"])
+
+    def test_sitemap_index(self):
+        """Testet, dass Sitemap-Indizes als solche gekennzeichnet werden."""
+        print("\n[TEST] test_sitemap_index")
+        index = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <sitemap><loc>https://example.com/sitemap-1.xml</loc></sitemap></sitemapindex>"""
+
+        self.assertEqual(list(iter_sitemap(index)), [("sitemapindex", "https://example.com/sitemap-1.xml", None)])
+
+    def test_truncated_gzip_raises_parse_error(self):
+        """Testet, dass eine abgeschnittene gzip-Sitemap als ParseError gemeldet wird."""
+        print("\n[TEST] test_truncated_gzip_raises_parse_error")
+        with self.assertRaises(ET.ParseError):
+            list(iter_sitemap(gzip.compress(URLSET)[:60]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from crawler.common.streaming_text import StreamingTextExtractor
+
+SELECTORS = ['div.article-body', 'article', 'main']
+
+
+class TestStreamingTextExtractor(unittest.TestCase):
+    """
+    Testfälle für die ereignisbasierte Textextraktion ohne DOM-Baum.
+    """
+
+    def test_blocks_skip_stack_and_container_priority(self):
+        """Testet Skip-Stack, einmalige Zaehlung verschachtelter Bloecke und die Container-Prioritaet."""
+        print("\n[TEST] test_blocks_skip_stack_and_container_priority")
+        html = """<html><head><link rel="canonical" href="/story"><script>var p = "<p>x</p>";</script></head>
+            <body><main><p>Teaser im Main-Bereich</p>
+            <div class="article-body"><h2>Titel &amp; mehr</h2>
+                <table><tr><td><ul><li>Eintrag <b>fett</b></li></ul></td></tr></table>
+                <div class="share"><p>Teilen</p></div>
+                <p>Absatz eins<p>Absatz zwei<br>mit Umbruch
+                <footer><p>Footer</p></footer>
+            </div></main></body></html>"""
+        extractor = StreamingTextExtractor(SELECTORS)
+
+        text, selector = extractor.extract(html)
+
+        self.assertEqual(selector, 'div.article-body')
+        self.assertEqual(text, "Titel & mehr\nEintrag fett\nAbsatz eins\nAbsatz zwei mit Umbruch")
+        self.assertEqual(extractor.canonical_href, "/story")
+
+    def test_first_container_wins_and_none_without_container(self):
+        """Testet, dass nur der erste passende Container zaehlt und ohne Container nichts geliefert wird."""
+        print("\n[TEST] test_first_container_wins_and_none_without_container")
+        html = "<article><p>Hauptartikel</p></article><article><p>Verwandter Artikel</p></article>"
+
+        self.assertEqual(StreamingTextExtractor(SELECTORS).extract(html), ("Hauptartikel", "article"))
+        self.assertEqual(StreamingTextExtractor(SELECTORS).extract("<div><p>Nur Text</p></div>"), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
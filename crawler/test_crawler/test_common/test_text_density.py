@@ -0,0 +1,58 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from crawler.common.text_density import compute_node_stats, select_content_block
+
+
+def is_container(tag):
+    return tag.name == 'div' and 'content' in ' '.join(tag.get('class', []))
+
+
+class TestTextDensity(unittest.TestCase):
+    """
+    Testfälle für die Textdichte-Analyse des Hauptinhalts.
+    """
+
+    def test_stats_match_get_text(self):
+        """Testet, dass die Textlaenge der von get_text(strip=True) entspricht und Links erfasst werden."""
+        print("\n[TEST] test_stats_match_get_text")
+        soup = BeautifulSoup("<div id='x'> Text <b> fett </b><!-- Kommentar --><script>var a = 1;</script>"
+                             "<a href='/'>Link</a></div>", 'html.parser')
+        div = soup.find('div')
+
+        stats, _ = compute_node_stats(soup)
+
+        self.assertEqual(stats[id(div)].text_length, len(div.get_text(strip=True)))
+        self.assertEqual(stats[id(div)].link_text_length, 4)
+        self.assertEqual(stats[id(div)].tag_count, 4)
+
+    def test_select_prefers_inner_text_block_over_link_wrappers(self):
+        """Testet, dass Navigationsbloecke ausscheiden und bei gleichem Text der innere Container gewinnt."""
+        print("\n[TEST] test_select_prefers_inner_text_block_over_link_wrappers")
+        links = "".join(f"<a href='/p{i}'>Weiterer Beitrag Nummer {i}</a>" for i in range(20))
+        soup = BeautifulSoup(f"""
+            <div class="page-content">
+                <div class="nav-content">{links}</div>
+                <div class="post-content"><p>{'Analyse der Kampagne. ' * 10}</p></div>
+                <div class="share-content"><a href="/share">Teilen</a></div>
+            </div>""", 'html.parser')
+
+        self.assertEqual(select_content_block(soup, is_container)['class'], ['post-content'])
+        self.assertIsNone(select_content_block(BeautifulSoup(f"<div class='content'>{links}</div>", 'html.parser'),
+                                               is_container))
+
+    def test_deeply_nested_document(self):
+        """Testet, dass sehr tief verschachtelte Dokumente ohne Rekursionsfehler verarbeitet werden."""
+        print("\n[TEST] test_deeply_nested_document")
+        depth = 3000
+        soup = BeautifulSoup("<div class='content'>" * depth + "Text" + "</div>" * depth, 'html.parser')
+
+        stats, candidates = compute_node_stats(soup, is_container)
+
+        self.assertEqual(len(candidates), depth)
+        self.assertEqual(stats[id(soup)].text_length, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
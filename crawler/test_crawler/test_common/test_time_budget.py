@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest
+
+from crawler.common.run_stats import run_stats
+from crawler.common.time_budget import BudgetExceeded, time_limit
+
+
+class TestTimeBudget(unittest.TestCase):
+    """
+    Testfälle für den Watchdog des Zeitbudgets pro Artikel.
+    """
+
+    def test_watchdog_interrupts_main_thread(self):
+        """Testet, dass ein zu langer Block im Haupt-Thread hart abgebrochen wird."""
+        print("\n[TEST] test_watchdog_interrupts_main_thread")
+        start = time.monotonic()
+        with self.assertRaises(BudgetExceeded) as context:
+            with time_limit(0.1, "parse"):
+                time.sleep(5)
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(context.exception.reason, "budget_exceeded:parse")
+
+    def test_no_limit_and_exhausted_budget(self):
+        """Testet None als unbegrenztes Budget und den sofortigen Abbruch bei aufgebrauchtem Budget."""
+        print("\n[TEST] test_no_limit_and_exhausted_budget")
+        with time_limit(None, "parse"):
+            time.sleep(0.01)
+        with time_limit(5, "parse"):
+            pass
+        with self.assertRaises(BudgetExceeded):
+            with time_limit(0, "ioc_extraction"):
+                self.fail("Block darf bei aufgebrauchtem Budget nicht laufen")
+
+    def test_worker_thread_keeps_result_and_counts_overrun(self):
+        """Testet, dass ausserhalb des Haupt-Threads nicht abgebrochen, sondern nur die Ueberschreitung gezaehlt wird."""
+        print("\n[TEST] test_worker_thread_keeps_result_and_counts_overrun")
+        run_stats.reset()
+        results, errors = [], []
+
+        def worker():
+            try:
+                with time_limit(0.05, "ioc_extraction"):
+                    time.sleep(0.1)
+                    results.append("IOCs")
+            except BudgetExceeded as e:
+                errors.append(e.reason)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(results, ["IOCs"])
+        self.assertEqual(errors, [])
+        self.assertEqual(run_stats.snapshot().get("budget_overruns"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from crawler.common.url_canonicalizer import canonical_link_from_soup, canonicalize_url, dedupe_by_canonical
+
+
+class TestUrlCanonicalizer(unittest.TestCase):
+    """
+    Testfälle für die URL-Normalisierung.
+    """
+
+    def test_variants_collapse_to_one_url(self):
+        """Testet, dass Schema-, Host-, Slash-, Fragment- und Tracking-Varianten zusammenfallen."""
+        print("\n[TEST] test_variants_collapse_to_one_url")
+        variants = [
+            "http://Example.COM/news/article-1/",
+            "https://example.com:443/news/article-1",
+            "https://example.com/news//article-1#comments",
+            "https://example.com/news/article-1?utm_source=rss&utm_medium=feed&fbclid=abc",
+        ]
+
+        self.assertEqual({canonicalize_url(url) for url in variants}, {"https://example.com/news/article-1"})
+
+    def test_meaningful_query_and_path_case_are_kept(self):
+        """Testet, dass inhaltliche Parameter (sortiert) und die Gross-/Kleinschreibung im Pfad erhalten bleiben."""
+        print("\n[TEST] test_meaningful_query_and_path_case_are_kept")
+        self.assertEqual(canonicalize_url("https://example.com/View/?p=12&id=7&utm_campaign=x"),
+                         "https://example.com/View?id=7&p=12")
+        self.assertEqual(canonicalize_url("https://example.com"), "https://example.com/")
+        self.assertEqual(canonicalize_url("mailto:news@example.com"), "mailto:news@example.com")
+
+    def test_dedupe_keeps_first_found_url(self):
+        """Testet, dass beim Zusammenfassen die gefundene URL (nicht die normalisierte) erhalten bleibt."""
+        print("\n[TEST] test_dedupe_keeps_first_found_url")
+        urls = ["http://legacy.example.com/story?ref=home", "https://legacy.example.com/story",
+                "https://example.com/view?amp=1", "https://example.com/view"]
+
+        self.assertEqual(dedupe_by_canonical(urls), ["http://legacy.example.com/story?ref=home",
+                                                     "https://example.com/view?amp=1"])
+
+    def test_malformed_urls_are_returned_unchanged(self):
+        """Testet, dass ein fehlerhafter Port oder Host keinen ValueError ausloest."""
+        print("\n[TEST] test_malformed_urls_are_returned_unchanged")
+        self.assertEqual(canonicalize_url("https://example.com:443x/a"), "https://example.com:443x/a")
+        self.assertEqual(canonicalize_url("http://[::1/a"), "http://[::1/a")
+
+    def test_canonical_link_from_soup(self):
+        """Testet rel=canonical inklusive relativer URLs und ignorierter Startseiten-Verweise."""
+        print("\n[TEST] test_canonical_link_from_soup")
+        soup = BeautifulSoup('<head><link rel="canonical" href="/2025/03/story/"></head>', 'html.parser')
+        homepage = BeautifulSoup('<head><link rel="canonical" href="https://example.com/"></head>', 'html.parser')
+
+        self.assertEqual(canonical_link_from_soup(soup, "https://m.example.com/story?amp=1"),
+                         "https://m.example.com/2025/03/story")
+        self.assertIsNone(canonical_link_from_soup(homepage, "https://example.com/story"))
+        self.assertIsNone(canonical_link_from_soup(BeautifulSoup('<p>x</p>', 'html.parser'), "https://example.com/a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
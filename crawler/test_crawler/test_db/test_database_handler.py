@@ -3,7 +3,7 @@ import datetime
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from db.database_models import Base, IOC, Sighting, APT, Country, CVE
+from db.database_models import Base, IOC, Sighting, APT, Country, CVE, ArticleScanHistory
 from db.crawler_db_handler import CrawlerDBHandler
 
 
@@ -174,5 +174,86 @@ class TestDatabaseHandler(unittest.TestCase):
             self.assertEqual(found_apt3.name, "New Group")
             self.assertEqual(session.query(APT).count(), 2)
 
+    def test_crawl_frontier_priorities_and_requeue(self):
+        """Testet Prioritaetsreihenfolge, Erledigt-Status und das Wiedereinreihen aktualisierter Artikel."""
+        print("[TEST] test_crawl_frontier_priorities_and_requeue")
+        self.db_handler.add_to_frontier([("https://a.com/deep", 2, 80), ("https://a.com/top", 0, 100)])
+        self.db_handler.add_to_frontier([("https://a.com/page/2/", 1, 90)], kind='listing')
+
+        self.assertEqual(self.db_handler.get_frontier_batch(10), [("https://a.com/top", 0), ("https://a.com/deep", 2)])
+        self.assertEqual(self.db_handler.get_frontier_batch(1), [("https://a.com/top", 0)])
+        self.assertEqual(self.db_handler.get_frontier_batch(10, kind='listing'), [("https://a.com/page/2/", 1)])
+
+        self.db_handler.mark_frontier_done(["https://a.com/top", "https://a.com/page/2/"])
+        self.assertEqual(self.db_handler.get_frontier_batch(10), [("https://a.com/deep", 2)])
+
+        # Ein erneut gefundener Artikel wird wieder offen, eine expandierte Listenseite nicht.
+        self.db_handler.add_to_frontier([("https://a.com/top", 0, 100)])
+        self.db_handler.add_to_frontier([("https://a.com/page/2/", 1, 90)], kind='listing')
+        self.assertEqual(self.db_handler.get_frontier_batch(10), [("https://a.com/top", 0), ("https://a.com/deep", 2)])
+        self.assertEqual(self.db_handler.get_frontier_batch(10, kind='listing'), [])
+
+    def test_fingerprints_and_duplicate_sightings(self):
+        """Testet das Speichern der SimHash-Fingerprints und das Uebernehmen der Sightings fuer Duplikate."""
+        print("[TEST] test_fingerprints_and_duplicate_sightings")
+        self.db_handler.add_structured_ioc_data(self.sample_ioc_data_1)
+        self.db_handler.update_article_scan_history(["http://test.com/article1", "http://mirror.com/a1"],
+                                                    {"http://test.com/article1": 0xABC})
+        self.db_handler.update_article_scan_history(["http://test.com/article1"], {"http://test.com/article1": 2 ** 63})
+
+        self.assertEqual(self.db_handler.get_article_fingerprints(), {"http://test.com/article1": 2 ** 63})
+
+        self.db_handler.add_duplicate_sightings({"http://mirror.com/a1": "http://test.com/article1"})
+        self.db_handler.add_duplicate_sightings({"http://mirror.com/a1": "http://test.com/article1"})
+        with self.TestingSessionLocal() as session:
+            copies = session.query(Sighting).filter_by(source_article_url="http://mirror.com/a1").all()
+            self.assertEqual(len(copies), 1)
+            self.assertEqual(copies[0].ioc.value, "evil.com")
+            self.assertEqual(copies[0].context_snippet, "evil.com context")
+            self.assertEqual([apt.name for apt in copies[0].apts], ["APT-TEST"])
+            self.assertEqual([cve.name for cve in copies[0].cves], ["CVE-2025-9999"])
+
+    def test_content_profiles_roundtrip(self):
+        """Testet das Speichern und Aktualisieren der Inhaltscontainer-Profile pro Domain."""
+        print("[TEST] test_content_profiles_roundtrip")
+        self.db_handler.save_content_profiles({"a.com": ("known", "div.articlebody"), "b.com": ("semantic", "article")})
+        self.db_handler.save_content_profiles({"a.com": ("keyword", "div#post")})
+
+        self.assertEqual(self.db_handler.get_content_profiles(),
+                         {"a.com": ("keyword", "div#post"), "b.com": ("semantic", "article")})
+
+    def test_source_fetch_times_roundtrip(self):
+        """Testet das Speichern und Aktualisieren des letzten erfolgreichen Abrufs pro Quell-URL."""
+        print("[TEST] test_source_fetch_times_roundtrip")
+        first = datetime.datetime(2025, 3, 1, 12, 0, tzinfo=datetime.timezone.utc)
+        second = datetime.datetime(2025, 3, 2, 12, 0, tzinfo=datetime.timezone.utc)
+        self.db_handler.update_source_fetch_times({"https://a.com/feed": first, "https://b.com/feed": first})
+        self.db_handler.update_source_fetch_times({"https://a.com/feed": second})
+
+        self.assertEqual(self.db_handler.get_source_fetch_times(),
+                         {"https://a.com/feed": second, "https://b.com/feed": first})
+
+    def test_abandoned_articles_are_requeued_once(self):
+        """Testet das Vermerken abgebrochener Artikel: einmal erneut einreihen, Grund bei Erfolg loeschen."""
+        print("[TEST] test_abandoned_articles_are_requeued_once")
+        url = "http://test.com/huge"
+        self.db_handler.update_article_scan_history([url])
+
+        self.assertEqual(self.db_handler.record_abandoned_articles({url: "budget_exceeded:parse"}), [url])
+        self.assertEqual(self.db_handler.get_abandoned_urls([url, "http://test.com/other"]), {url})
+        self.assertEqual(self.db_handler.record_abandoned_articles({url: "budget_exceeded:ioc_extraction"}), [])
+        with self.TestingSessionLocal() as session:
+            entry = session.query(ArticleScanHistory).filter_by(url=url).one()
+            self.assertEqual((entry.abandon_reason, entry.abandon_count), ("budget_exceeded:ioc_extraction", 2))
+
+        # Ein Lauf ohne extrahierten Text (304, Fehlabruf) setzt den Abbruch nicht zurueck.
+        self.db_handler.update_article_scan_history([url])
+        self.assertEqual(self.db_handler.get_abandoned_urls([url]), {url})
+
+        self.db_handler.update_article_scan_history([url], extracted_urls={url})
+        self.assertEqual(self.db_handler.get_abandoned_urls([url]), set())
+        self.assertEqual(self.db_handler.record_abandoned_articles({url: "budget_exceeded:parse"}), [url])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
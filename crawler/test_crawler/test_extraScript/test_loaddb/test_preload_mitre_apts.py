@@ -57,13 +57,14 @@ class TestPreloadMitreApts(unittest.TestCase):
         """Räumt nach jedem Test auf."""
         Base.metadata.drop_all(self.engine)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_scrape_and_load_apts(self, mock_requests_get):
         """Testet das erfolgreiche Scrapen und Speichern der APT-Gruppen."""
         print("\n[TEST] test_scrape_and_load_apts")
 
         mock_response = MagicMock()
         mock_response.status_code = 200
+        mock_response.headers = {'Content-Type': 'text/html; charset=utf-8'}
         mock_response.content = SAMPLE_HTML.encode('utf-8')
         mock_requests_get.return_value = mock_response
 
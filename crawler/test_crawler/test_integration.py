@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 
+from crawler.common.simhash import simhash
 from crawler.crawler_orch import CrawlerOrchestrator
 
 
@@ -10,6 +11,7 @@ class TestCrawlerOrchestrator(unittest.TestCase):
     Testet das Zusammenspiel der Prozessoren, indem die Prozessoren selbst gemockt werden.
     """
 
+    @patch('crawler.crawler_orch.HttpClient')
     @patch('crawler.crawler_orch.OutputProcessor')
     @patch('crawler.crawler_orch.EnrichmentProcessor')
     @patch('crawler.crawler_orch.IocExtractorProcessor')
@@ -18,7 +20,7 @@ class TestCrawlerOrchestrator(unittest.TestCase):
     @patch('crawler.crawler_orch.UserSettings')
     @patch('crawler.crawler_orch.CrawlerDBHandler')
     def test_run_happy_path(self, MockDBHandler, MockUserSettings, MockLinkFinder,
-                            MockContentExtractor, MockIocExtractor, MockEnrichment, MockOutput):
+                            MockContentExtractor, MockIocExtractor, MockEnrichment, MockOutput, MockHttpClient):
         """Testet den idealen Durchlauf, bei dem jeder Schritt Daten zurückgibt."""
         print("\n[TEST] Orchestrator: Happy Path")
 
@@ -26,7 +28,8 @@ class TestCrawlerOrchestrator(unittest.TestCase):
         mock_link_finder_instance.process.return_value = ['http://example.com/article1']
 
         mock_content_extractor_instance = MockContentExtractor.return_value
-        mock_content_extractor_instance.process.return_value = {'urls': [...], 'texts': {...}}
+        mock_content_extractor_instance.process.return_value = {'urls': ['http://example.com/article1'],
+                                                                'texts': {0: 'Artikeltext mit 1.1.1.1'}}
 
         mock_ioc_extractor_instance = MockIocExtractor.return_value
         mock_ioc_extractor_instance.process.return_value = [{'ioc_value': '1.1.1.1'}]
@@ -36,6 +39,9 @@ class TestCrawlerOrchestrator(unittest.TestCase):
 
         mock_output_instance = MockOutput.return_value
         mock_db_handler_instance = MockDBHandler.return_value
+        mock_db_handler_instance.get_frontier_batch.return_value = [('http://example.com/article1', 0)]
+        mock_db_handler_instance.get_article_fingerprints.return_value = {}
+        MockUserSettings.return_value.near_duplicate = {"enabled": True, "max_distance": 3}
 
         orchestrator = CrawlerOrchestrator()
         orchestrator.run()
@@ -46,18 +52,172 @@ class TestCrawlerOrchestrator(unittest.TestCase):
         mock_enrichment_instance.process.assert_called_once()
         mock_output_instance.process.assert_called_once()
 
+        mock_content_extractor_instance.process.assert_called_once_with(
+            ['http://example.com/article1'], mock_link_finder_instance.feed_contents,
+            mock_db_handler_instance.get_abandoned_urls.return_value)
+        mock_db_handler_instance.mark_frontier_done.assert_called_once_with(['http://example.com/article1'])
         mock_db_handler_instance.update_article_scan_history.assert_called_once()
+        mock_db_handler_instance.add_duplicate_sightings.assert_called_once_with({})
 
+    @patch('crawler.crawler_orch.HttpClient')
+    @patch('crawler.crawler_orch.OutputProcessor')
+    @patch('crawler.crawler_orch.EnrichmentProcessor')
+    @patch('crawler.crawler_orch.IocExtractorProcessor')
+    @patch('crawler.crawler_orch.ContentExtractor')
+    @patch('crawler.crawler_orch.LinkFinder')
+    @patch('crawler.crawler_orch.UserSettings')
+    @patch('crawler.crawler_orch.CrawlerDBHandler')
+    def test_near_duplicates_skip_ioc_analysis(self, MockDBHandler, MockUserSettings, MockLinkFinder,
+                                               MockContentExtractor, MockIocExtractor, MockEnrichment, MockOutput,
+                                               MockHttpClient):
+        """Testet, dass Beinahe-Duplikate nicht analysiert, aber als Sichtung und im Scan-Verlauf erfasst werden."""
+        print("\n[TEST] Orchestrator: Beinahe-Duplikate")
+        text = " ".join(f"Satz {i} beschreibt die Kampagne und den Indikator evil{i}.com ausfuehrlich." for i in range(40))
+        urls = ['https://a.com/original', 'https://b.com/copy', 'https://c.com/known-copy']
+        MockContentExtractor.return_value.process.return_value = {
+            'urls': list(urls), 'texts': {0: text, 1: "Quelle: b.com. " + text, 2: text + " Weiterlesen."}}
+        MockIocExtractor.return_value.process.return_value = []
+        mock_db_handler_instance = MockDBHandler.return_value
+        mock_db_handler_instance.get_frontier_batch.return_value = [(url, 0) for url in urls]
+        mock_db_handler_instance.get_article_fingerprints.return_value = {
+            'https://old.com/article': simhash(text), 'https://a.com/original': 0}
+        MockUserSettings.return_value.near_duplicate = {"enabled": True, "max_distance": 3}
+
+        orchestrator = CrawlerOrchestrator()
+        orchestrator.run()
+
+        analysed_map = MockIocExtractor.return_value.process.call_args[0][0]
+        self.assertEqual(analysed_map['texts'], {})
+        mock_db_handler_instance.add_duplicate_sightings.assert_called_once_with(
+            {url: 'https://old.com/article' for url in urls})
+        history_urls, fingerprints, extracted_urls = mock_db_handler_instance.update_article_scan_history.call_args[0]
+        self.assertEqual(history_urls, urls)
+        self.assertEqual(set(fingerprints), set(urls))
+        self.assertEqual(extracted_urls, set(urls))
+        MockEnrichment.return_value.process.assert_not_called()
+
+    @patch('crawler.crawler_orch.HttpClient')
+    @patch('crawler.crawler_orch.OutputProcessor')
+    @patch('crawler.crawler_orch.EnrichmentProcessor')
+    @patch('crawler.crawler_orch.IocExtractorProcessor')
+    @patch('crawler.crawler_orch.ContentExtractor')
+    @patch('crawler.crawler_orch.LinkFinder')
+    @patch('crawler.crawler_orch.UserSettings')
+    @patch('crawler.crawler_orch.CrawlerDBHandler')
+    def test_duplicates_of_abandoned_original_are_retried(self, MockDBHandler, MockUserSettings, MockLinkFinder,
+                                                          MockContentExtractor, MockIocExtractor, MockEnrichment,
+                                                          MockOutput, MockHttpClient):
+        """
+        Testet, dass ein in Modul 3 abgebrochenes Original weder seinen Fingerprint noch Sightings
+        an Duplikate weitergibt; das Duplikat wird wie das Original als abgebrochen vermerkt.
+        """
+        print("\n[TEST] Orchestrator: Duplikat eines abgebrochenen Originals")
+        text = " ".join(f"Satz {i} beschreibt die Kampagne und den Indikator evil{i}.com ausfuehrlich." for i in range(40))
+        urls = ['https://a.com/original', 'https://b.com/copy']
+        MockContentExtractor.return_value.process.return_value = {
+            'urls': list(urls), 'texts': {0: text, 1: "Quelle: a.com. " + text}, 'abandoned': {}}
+
+        def ioc_process(article_data_map):
+            article_data_map['abandoned']['https://a.com/original'] = "budget_exceeded:ioc_extraction"
+            return []
+
+        MockIocExtractor.return_value.process.side_effect = ioc_process
+        mock_db_handler_instance = MockDBHandler.return_value
+        mock_db_handler_instance.get_frontier_batch.return_value = [(url, 0) for url in urls]
+        mock_db_handler_instance.get_article_fingerprints.return_value = {}
+        mock_db_handler_instance.record_abandoned_articles.return_value = list(urls)
+        MockUserSettings.return_value.near_duplicate = {"enabled": True, "max_distance": 3}
+
+        orchestrator = CrawlerOrchestrator()
+        orchestrator.run()
+
+        mock_db_handler_instance.add_duplicate_sightings.assert_called_once_with({})
+        _, fingerprints, extracted_urls = mock_db_handler_instance.update_article_scan_history.call_args[0]
+        self.assertEqual(fingerprints, {})
+        self.assertEqual(extracted_urls, set())
+        mock_db_handler_instance.record_abandoned_articles.assert_called_once_with(
+            {url: "budget_exceeded:ioc_extraction" for url in urls})
+
+    @patch('crawler.crawler_orch.HttpClient')
+    @patch('crawler.crawler_orch.OutputProcessor')
+    @patch('crawler.crawler_orch.EnrichmentProcessor')
+    @patch('crawler.crawler_orch.IocExtractorProcessor')
+    @patch('crawler.crawler_orch.ContentExtractor')
+    @patch('crawler.crawler_orch.LinkFinder')
+    @patch('crawler.crawler_orch.UserSettings')
+    @patch('crawler.crawler_orch.CrawlerDBHandler')
+    def test_abandoned_articles_are_requeued(self, MockDBHandler, MockUserSettings, MockLinkFinder,
+                                             MockContentExtractor, MockIocExtractor, MockEnrichment, MockOutput,
+                                             MockHttpClient):
+        """Testet, dass nur Artikel mit extrahiertem Text als erfolgreich gelten und Abbrueche erneut eingereiht werden."""
+        print("\n[TEST] Orchestrator: Abgebrochene Artikel")
+        urls = ['https://a.com/ok', 'https://a.com/huge', 'https://a.com/unchanged', 'https://a.com/slow-iocs']
+        extracted_map = {'urls': list(urls), 'texts': {0: "Text A", 3: "Text D"},
+                         'abandoned': {'https://a.com/huge': "budget_exceeded:parse"}}
+        MockContentExtractor.return_value.process.return_value = extracted_map
+
+        def ioc_process(article_data_map):
+            article_data_map['abandoned']['https://a.com/slow-iocs'] = "budget_exceeded:ioc_extraction"
+            return []
+
+        MockIocExtractor.return_value.process.side_effect = ioc_process
+        mock_db_handler_instance = MockDBHandler.return_value
+        mock_db_handler_instance.get_frontier_batch.return_value = [(url, 0) for url in urls]
+        mock_db_handler_instance.record_abandoned_articles.return_value = ['https://a.com/huge']
+        MockUserSettings.return_value.near_duplicate = {"enabled": False}
+
+        orchestrator = CrawlerOrchestrator()
+        orchestrator.run()
+
+        _, _, extracted_urls = mock_db_handler_instance.update_article_scan_history.call_args[0]
+        self.assertEqual(extracted_urls, {'https://a.com/ok'})
+        mock_db_handler_instance.record_abandoned_articles.assert_called_once_with(
+            {'https://a.com/huge': "budget_exceeded:parse", 'https://a.com/slow-iocs': "budget_exceeded:ioc_extraction"})
+        mock_db_handler_instance.add_to_frontier.assert_called_once_with([('https://a.com/huge', 0, 0)])
+
+    @patch('crawler.crawler_orch.HttpClient')
+    @patch('crawler.crawler_orch.OutputProcessor')
+    @patch('crawler.crawler_orch.EnrichmentProcessor')
+    @patch('crawler.crawler_orch.IocExtractorProcessor')
+    @patch('crawler.crawler_orch.ContentExtractor')
+    @patch('crawler.crawler_orch.LinkFinder')
+    @patch('crawler.crawler_orch.UserSettings')
+    @patch('crawler.crawler_orch.CrawlerDBHandler')
+    def test_temporarily_failed_articles_stay_pending(self, MockDBHandler, MockUserSettings, MockLinkFinder,
+                                                      MockContentExtractor, MockIocExtractor, MockEnrichment,
+                                                      MockOutput, MockHttpClient):
+        """Testet, dass voruebergehend gescheiterte Abrufe weder erledigt noch im Scan-Verlauf gestempelt werden."""
+        print("\n[TEST] Orchestrator: Voruebergehend gescheiterte Artikel")
+        urls = ['https://a.com/ok', 'https://a.com/gone', 'https://b.com/circuit-open', 'https://c.com/timeout']
+        MockContentExtractor.return_value.process.return_value = {
+            'urls': list(urls), 'texts': {0: "Text A"}, 'abandoned': {},
+            'pending': ['https://b.com/circuit-open', 'https://c.com/timeout']}
+        MockIocExtractor.return_value.process.return_value = []
+        mock_db_handler_instance = MockDBHandler.return_value
+        mock_db_handler_instance.get_frontier_batch.return_value = [(url, 0) for url in urls]
+        MockUserSettings.return_value.near_duplicate = {"enabled": False}
+
+        orchestrator = CrawlerOrchestrator()
+        orchestrator.run()
+
+        mock_db_handler_instance.mark_frontier_done.assert_called_once_with(['https://a.com/ok', 'https://a.com/gone'])
+        history_urls, _, extracted_urls = mock_db_handler_instance.update_article_scan_history.call_args[0]
+        self.assertEqual(history_urls, ['https://a.com/ok', 'https://a.com/gone'])
+        self.assertEqual(extracted_urls, {'https://a.com/ok'})
+
+    @patch('crawler.crawler_orch.HttpClient')
     @patch('crawler.crawler_orch.LinkFinder')
     @patch('crawler.crawler_orch.ContentExtractor')
     @patch('crawler.crawler_orch.UserSettings')
     @patch('crawler.crawler_orch.CrawlerDBHandler')
-    def test_run_stops_if_no_links_found(self, MockDBHandler, MockUserSettings, MockContentExtractor, MockLinkFinder):
-        """Testet, dass der Workflow korrekt abbricht, wenn keine Links gefunden werden."""
+    def test_run_stops_if_no_links_found(self, MockDBHandler, MockUserSettings, MockContentExtractor, MockLinkFinder,
+                                         MockHttpClient):
+        """Testet, dass der Workflow korrekt abbricht, wenn die Frontier keine offenen Artikel enthaelt."""
         print("\n[TEST] Orchestrator: Stoppt bei keinen Links")
 
         mock_link_finder_instance = MockLinkFinder.return_value
         mock_link_finder_instance.process.return_value = []  # Keine Links gefunden
+        MockDBHandler.return_value.get_frontier_batch.return_value = []
 
         mock_content_extractor_instance = MockContentExtractor.return_value
 
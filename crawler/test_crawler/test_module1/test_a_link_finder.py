@@ -1,11 +1,16 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import datetime
+import gzip
+import time
 from bs4 import BeautifulSoup
+from feedparser import FeedParserDict
 
 from settings.user_settings import UserSettings
 from db.crawler_db_handler import CrawlerDBHandler
-from crawler.processors.a_link_finder import LinkFinder
+from crawler.common.http_client import FetchOutcome, FetchResult
+from crawler.processors.a_link_finder import (LinkFinder, entry_timestamp, filter_links_by_timestamp,
+                                            host_watermarks)
 
 
 class TestLinkFinder(unittest.TestCase):
@@ -17,42 +22,66 @@ class TestLinkFinder(unittest.TestCase):
         """Erstellt eine saubere LinkFinder-Instanz mit gemockten Abhängigkeiten vor jedem Test."""
         self.mock_settings = MagicMock(spec=UserSettings)
         self.mock_settings.blacklist_keywords = ["/ignore-this/"]  # Beispiel-Blacklist
+        self.mock_settings.link_rules = {"default": {"min_score": 3}, "domains": {}}
+        self.mock_settings.fetch_engine = "threads"
+        self.mock_settings.max_requests_in_flight = 10
+        self.mock_settings.max_requests_per_host = 2
+        self.mock_settings.concurrency = {"initial": 2, "min": 1, "max": 4, "per_host_initial": 1}
+        self.mock_settings.use_feed_content = True
+        self.mock_settings.feed_max_age_days = 30
+        self.mock_settings.sitemap_discovery = {"enabled": False, "max_sitemaps": 20}
+        self.mock_settings.frontier = {"max_depth": 0, "listing_pages_per_run": 10, "batch_size": 300}
 
         self.mock_db_handler = MagicMock(spec=CrawlerDBHandler)
         self.mock_db_handler.get_article_scan_history.return_value = {}
+        self.mock_db_handler.get_frontier_batch.return_value = []
+        self.mock_db_handler.get_source_fetch_times.return_value = {}
 
         self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
 
+    @patch('crawler.processors.a_link_finder.HttpClient')
     @patch('crawler.processors.a_link_finder.feedparser.parse')
-    def test_process_source_rss_success(self, mock_feedparser_parse):
-        """Testet die erfolgreiche Extraktion von Links aus einem RSS-Feed."""
+    def test_process_source_rss_success(self, mock_feedparser_parse, MockHttpClient):
+        """Testet die Extraktion von Links aus einem RSS-Feed ueber den streamenden Parser."""
         print("\n[TEST] test_process_source_rss_success")
-        mock_entry1 = MagicMock()
-        mock_entry1.link = "https://example.com/rss-article1"
-        mock_entry2 = MagicMock()
-        mock_entry2.link = "https://example.com/rss-article2"
-        mock_parsed_feed = MagicMock()
-        mock_parsed_feed.entries = [mock_entry1, mock_entry2]
-        mock_feedparser_parse.return_value = mock_parsed_feed
-
+        feed_xml = b"""<?xml version="1.0"?><rss version="2.0"><channel>
+            <link>https://example.com/</link>
+            <item><link>https://example.com/rss-article1</link></item>
+            <item><guid>https://example.com/rss-article2</guid></item>
+        </channel></rss>"""
         source_url = "https://example.com/feed.rss"
         expected_links = ["https://example.com/rss-article1", "https://example.com/rss-article2"]
+        MockHttpClient.return_value.fetch.return_value = FetchResult(source_url, content=feed_xml)
 
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
         actual_links = self.link_finder._process_source(source_url)
 
         self.assertEqual(sorted(actual_links), sorted(expected_links))
-        mock_feedparser_parse.assert_called_once()  # Die genauen Argumente sind hier weniger wichtig
+        mock_feedparser_parse.assert_not_called()
 
     @patch('crawler.processors.a_link_finder.HttpClient')
     @patch('crawler.processors.a_link_finder.feedparser.parse')
-    def test_process_source_html_fallback_success(self, mock_feedparser_parse, MockHttpClient):
-        """Testet den Fallback auf HTML-Extraktion, wenn der RSS-Feed leer ist."""
-        print("\n[TEST] test_process_source_html_fallback_success")
-        # RSS ist leer
+    def test_process_source_malformed_feed_uses_feedparser(self, mock_feedparser_parse, MockHttpClient):
+        """Testet den Rueckfall auf feedparser, wenn der Feed kein wohlgeformtes XML ist."""
+        print("\n[TEST] test_process_source_malformed_feed_uses_feedparser")
         mock_parsed_feed = MagicMock()
-        mock_parsed_feed.entries = []
+        mock_parsed_feed.entries = [FeedParserDict(link="https://example.com/a?x=1&y=2")]
         mock_feedparser_parse.return_value = mock_parsed_feed
+        source_url = "https://example.com/feed.rss"
+        MockHttpClient.return_value.fetch.return_value = FetchResult(
+            source_url, content=b"<rss><channel><item><link>https://example.com/a?x=1&y=2</link></item></channel></rss>")
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        actual_links = self.link_finder._process_source(source_url)
+
+        self.assertEqual(actual_links, ["https://example.com/a?x=1&y=2"])
+        mock_feedparser_parse.assert_called_once()
 
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    @patch('crawler.processors.a_link_finder.feedparser.parse')
+    def test_process_source_html_fallback_success(self, mock_feedparser_parse, MockHttpClient):
+        """Testet, dass eine HTML-Quelle direkt an den HTML-Parser geht, ohne feedparser zu bemuehen."""
+        print("\n[TEST] test_process_source_html_fallback_success")
         mock_http_instance = MockHttpClient.return_value
 
         html_content = """
@@ -64,9 +93,9 @@ class TestLinkFinder(unittest.TestCase):
             </article>
         </body></html>
         """
-        mock_http_instance.get_soup.return_value = BeautifulSoup(html_content, 'html.parser')
-
         source_url = "https://example.com/"
+        mock_http_instance.fetch.return_value = FetchResult(source_url, content=html_content.encode())
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
         expected_links = [
             "https://example.com/news/article-1.html",
             "https://example.com/news/article-2.html"
@@ -76,7 +105,300 @@ class TestLinkFinder(unittest.TestCase):
         actual_links = self.link_finder._process_source(source_url)
 
         self.assertEqual(sorted(actual_links), sorted(expected_links))
-        mock_http_instance.get_soup.assert_called_once_with(source_url)
+        mock_http_instance.fetch.assert_called_once_with(source_url, revalidate=True, store_validators=False)
+        mock_feedparser_parse.assert_not_called()
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    @patch('crawler.processors.a_link_finder.feedparser.parse')
+    def test_process_source_not_modified(self, mock_feedparser_parse, MockHttpClient):
+        """Testet, dass eine unveraenderte Quelle (304) keine weitere Verarbeitung ausloest."""
+        print("\n[TEST] test_process_source_not_modified")
+        source_url = "https://example.com/"
+        MockHttpClient.return_value.fetch.return_value = FetchResult(source_url, FetchOutcome.NOT_MODIFIED,
+                                                                     status_code=304)
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        actual_links = self.link_finder._process_source(source_url)
+
+        self.assertEqual(actual_links, [])
+        mock_feedparser_parse.assert_not_called()
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_process_source_keeps_feed_bodies(self, MockHttpClient):
+        """Testet, dass mitgelieferte Artikel-Bodies (content:encoded) fuer Modul 2 gemerkt werden."""
+        print("\n[TEST] test_process_source_keeps_feed_bodies")
+        feed_xml = b"""<?xml version="1.0"?>
+        <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+            <item><link>https://example.com/full</link><description>Teaser</description>
+                <content:encoded><![CDATA[<p>Der komplette Artikel.</p>]]></content:encoded></item>
+            <item><link>https://example.com/teaser</link><description>Nur ein Teaser</description></item>
+        </channel></rss>"""
+        source_url = "https://example.com/feed"
+        MockHttpClient.return_value.fetch.return_value = FetchResult(source_url, content=feed_xml,
+                                                                     content_type="application/rss+xml")
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        links = self.link_finder._process_source(source_url)
+
+        self.assertEqual(links, ["https://example.com/full", "https://example.com/teaser"])
+        self.assertEqual(self.link_finder.feed_contents, {"https://example.com/full": "<p>Der komplette Artikel.</p>"})
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_links_disallowed_by_robots_are_dropped(self, MockHttpClient):
+        """Testet, dass per robots.txt gesperrte Links gar nicht erst eingereiht werden."""
+        print("\n[TEST] test_links_disallowed_by_robots_are_dropped")
+        feed_xml = b"""<rss><channel>
+            <item><link>https://example.com/news/1</link></item>
+            <item><link>https://example.com/private/2</link></item>
+        </channel></rss>"""
+        source_url = "https://example.com/feed"
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.return_value = FetchResult(source_url, content=feed_xml)
+        mock_http_instance.is_allowed.side_effect = lambda url: "/private/" not in url
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+
+        self.assertEqual(self.link_finder._process_source(source_url), ["https://example.com/news/1"])
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_sitemap_discovery_replaces_html_scoring(self, MockHttpClient):
+        """Testet die inkrementelle Link-Suche ueber Sitemap-Index und lastmod-Wasserstand."""
+        print("\n[TEST] test_sitemap_discovery_replaces_html_scoring")
+        self.mock_settings.sitemap_discovery = {"enabled": True, "max_sitemaps": 5}
+        source_url = "https://example.com/news/"
+        index_xml = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <sitemap><loc>https://example.com/sitemap-2025.xml.gz</loc><lastmod>2025-03-02</lastmod></sitemap>
+            <sitemap><loc>https://example.com/sitemap-2019.xml</loc><lastmod>2019-12-31</lastmod></sitemap>
+        </sitemapindex>"""
+        urlset_gz = gzip.compress(b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/news/new-article</loc><lastmod>2025-03-02T10:00:00Z</lastmod></url>
+            <url><loc>https://example.com/news/old-article</loc><lastmod>2025-02-01T10:00:00Z</lastmod></url>
+            <url><loc>https://example.com/shop/product</loc><lastmod>2025-03-02T10:00:00Z</lastmod></url>
+        </urlset>""")
+        responses = {
+            source_url: FetchResult(source_url, content=b"<html><body></body></html>", content_type="text/html"),
+            "https://example.com/sitemap_index.xml": FetchResult("", content=index_xml),
+            "https://example.com/sitemap-2025.xml.gz": FetchResult("", content=urlset_gz),
+        }
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, **kwargs: responses[url]
+        mock_http_instance.sitemaps_for.return_value = ["https://example.com/sitemap_index.xml"]
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        self.link_finder.host_watermarks = {
+            "example.com": datetime.datetime(2025, 3, 1, tzinfo=datetime.timezone.utc)}
+        links = self.link_finder._process_source(source_url)
+
+        self.assertEqual(links, ["https://example.com/news/new-article"])
+        self.assertEqual(self.link_finder.entry_dates["https://example.com/news/new-article"],
+                         datetime.datetime(2025, 3, 2, 10, 0, tzinfo=datetime.timezone.utc))
+        mock_http_instance.parse_html.assert_not_called()
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_listing_pages_are_followed_up_to_max_depth(self, MockHttpClient):
+        """Testet, dass Paginierungs-Links in die Frontier kommen und nur bis zur maximalen Tiefe expandiert werden."""
+        print("\n[TEST] test_listing_pages_are_followed_up_to_max_depth")
+        self.mock_settings.frontier = {"max_depth": 1, "listing_pages_per_run": 10, "batch_size": 300}
+        source_url = "https://example.com/news/"
+        source_html = b"""<html><head><link rel="next" href="/news/page/2/"></head><body><article>
+            <a href="/news/2025/03/first-article.html">Ein erster Artikel mit vielen Woertern</a>
+            <a href="/news/page/2/">2</a><a class="next-posts" href="/news/?page=2">Weiter</a>
+            <a href="https://other.com/page/2/">Fremde Seite</a></article></body></html>"""
+        page_two_html = b"""<html><body><article>
+            <a href="/news/2025/01/older-article.html">Ein aelterer Artikel mit vielen Woertern</a>
+            <a href="/news/page/3/">3</a></article></body></html>"""
+        responses = {
+            source_url: FetchResult(source_url, content=source_html, content_type="text/html"),
+            "https://example.com/news/page/2/": FetchResult("", content=page_two_html, content_type="text/html"),
+        }
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, **kwargs: responses[url]
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+        self.mock_db_handler.get_frontier_batch.side_effect = lambda limit, kind: (
+            [("https://example.com/news/page/2/", 1)] if kind == 'listing' else [])
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        links = self.link_finder.process([source_url])
+
+        self.assertEqual(links, ["https://example.com/news/2025/01/older-article.html",
+                                 "https://example.com/news/2025/03/first-article.html"])
+        frontier_calls = self.mock_db_handler.add_to_frontier.call_args_list
+        self.assertEqual(frontier_calls[0].args[0], [("https://example.com/news/?page=2", 1, 90),
+                                                     ("https://example.com/news/page/2/", 1, 90)])
+        self.assertEqual(frontier_calls[0].kwargs, {'kind': 'listing'})
+        self.assertEqual(frontier_calls[1].args[0], [])  # Seite 3 laege jenseits der maximalen Tiefe
+        self.assertEqual(frontier_calls[2].args[0], [
+            ("https://example.com/news/2025/01/older-article.html", 1, 90),
+            ("https://example.com/news/2025/03/first-article.html", 0, 100)])
+        self.mock_db_handler.mark_frontier_done.assert_called_once_with(["https://example.com/news/page/2/"])
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_source_validators_are_stored_only_after_queuing_all_links(self, MockHttpClient):
+        """
+        Testet, dass die Validatoren einer Quelle erst nach dem Einreihen ihrer Links gespeichert
+        werden und gar nicht, wenn robots.txt Links der Quelle verworfen hat.
+        """
+        print("\n[TEST] test_source_validators_are_stored_only_after_queuing_all_links")
+        feed = """<rss><channel>
+            <item><title>1</title><link>https://{host}/news/1</link></item>
+            <item><title>2</title><link>https://{host}/private/2</link></item>
+        </channel></rss>"""
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, **kwargs: FetchResult(
+            url, content=feed.format(host=url.split('/')[2]).encode(), content_type="application/rss+xml",
+            validators={'ETag': '"v1"'})
+        mock_http_instance.is_allowed.side_effect = lambda url: url != "https://b.com/private/2"
+        events = []
+        self.mock_db_handler.add_to_frontier.side_effect = lambda entries, kind: events.append(("queue", kind))
+        mock_http_instance.remember_validators.side_effect = lambda url, v: events.append(("remember", url))
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        self.link_finder.process(["https://a.com/feed", "https://b.com/feed"])
+
+        self.assertEqual(events[-1], ("remember", "https://a.com/feed"))
+        self.assertEqual(events.count(("remember", "https://a.com/feed")), 1)
+        self.assertLess(events.index(("queue", "article")), events.index(("remember", "https://a.com/feed")))
+        self.assertNotIn(("remember", "https://b.com/feed"), events)
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_pagination_ignores_lookalikes_and_keeps_failed_listings_open(self, MockHttpClient):
+        """
+        Testet, dass ?p=N und Klassen wie "nextgen-gallery" nicht als Paginierung gelten und
+        Listenseiten mit voruebergehendem Abruffehler in der Frontier offen bleiben.
+        """
+        print("\n[TEST] test_pagination_ignores_lookalikes_and_keeps_failed_listings_open")
+        soup = BeautifulSoup("""<a href="/?p=4711">Artikel</a><a class="nextgen-gallery" href="/gallery">Bilder</a>
+            <a class="nav-next" href="/news/page/2/">Weitere</a>""", 'html.parser')
+        self.assertEqual(self.link_finder._extract_pagination_links(soup, "https://example.com/news/"),
+                         ["https://example.com/news/page/2/"])
+
+        responses = {
+            "https://example.com/news/page/2/": FetchResult("", content=b"<html><body></body></html>",
+                                                            content_type="text/html"),
+            "https://example.com/news/page/3/": FetchResult("", FetchOutcome.TIMEOUT),
+        }
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, **kwargs: responses[url]
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+        self.mock_db_handler.get_frontier_batch.return_value = [("https://example.com/news/page/2/", 1),
+                                                                ("https://example.com/news/page/3/", 1)]
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        self.link_finder._expand_listings()
+
+        self.mock_db_handler.mark_frontier_done.assert_called_once_with(["https://example.com/news/page/2/"])
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_feed_links_are_canonicalized_before_filtering(self, MockHttpClient):
+        """
+        Testet, dass URL-Varianten eines Artikels zusammenfallen und gegen die normalisierte Historie
+        laufen, abgerufen aber die zuerst gefundene URL wird (z.B. fuer Hosts ohne https).
+        """
+        print("\n[TEST] test_feed_links_are_canonicalized_before_filtering")
+        feed_xml = b"""<rss><channel>
+            <item><link>http://Example.com/news/a1/?utm_source=rss&amp;utm_medium=feed</link></item>
+            <item><link>https://example.com/news/a1#comments</link></item>
+            <item><link>https://EXAMPLE.com/news/a2/</link></item>
+        </channel></rss>"""
+        MockHttpClient.return_value.fetch.return_value = FetchResult("https://example.com/feed", content=feed_xml)
+        self.mock_db_handler.get_article_scan_history.return_value = {
+            "http://example.com/news/a2/": datetime.datetime.now() - datetime.timedelta(days=1)}
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        links = self.link_finder.process(["https://example.com/feed"])
+
+        self.assertEqual(links, ["http://Example.com/news/a1/?utm_source=rss&utm_medium=feed"])
+
+    @patch('crawler.processors.a_link_finder.feedparser.parse')
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_feed_reading_stops_at_source_watermark(self, MockHttpClient, mock_feedparser_parse):
+        """
+        Testet, dass der Feed nach mehreren Eintraegen vor dem letzten erfolgreichen Abruf der Quelle
+        nicht weitergelesen wird, ohne einzelne Eintraege zu verwerfen, und dass fuer den
+        feedparser-Fallback dieselbe Regel gilt. Der neue Abrufzeitpunkt wird erst nach dem Einreihen gespeichert.
+        """
+        print("\n[TEST] test_feed_reading_stops_at_source_watermark")
+        now = datetime.datetime.now(datetime.timezone.utc)
+        entries = [{'link': f"https://example.com/news/{hours}",
+                    'published_parsed': (now - datetime.timedelta(hours=hours)).utctimetuple()}
+                   for hours in (1, 30, 2, 40, 50, 60, 70)]
+        items = "".join(
+            f"<item><link>{entry['link']}</link>"
+            f"<pubDate>{time.strftime('%a, %d %b %Y %H:%M:%S +0000', entry['published_parsed'])}</pubDate></item>"
+            for entry in entries)
+        source_url = "https://example.com/feed"
+        MockHttpClient.return_value.fetch.return_value = FetchResult(
+            source_url, content=f"<rss><channel>{items}</channel></rss>".encode())
+        self.mock_db_handler.get_source_fetch_times.return_value = {source_url: now - datetime.timedelta(hours=24)}
+        expected = ["https://example.com/news/1", "https://example.com/news/30", "https://example.com/news/2",
+                    "https://example.com/news/40", "https://example.com/news/50", "https://example.com/news/60"]
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        self.assertEqual(self.link_finder.process([source_url]), sorted(expected))
+        self.mock_db_handler.update_source_fetch_times.assert_called_once_with({source_url: self.link_finder.run_started})
+
+        MockHttpClient.return_value.fetch.return_value = FetchResult(source_url, content=b"<rss><channel><item>&bad;")
+        mock_feedparser_parse.return_value = FeedParserDict(entries=[dict(entry) for entry in entries])
+        self.assertEqual(self.link_finder._process_source(source_url), expected)
+
+    @patch('crawler.processors.a_link_finder.HttpClient')
+    def test_malformed_feed_link_does_not_abort_link_search(self, MockHttpClient):
+        """Testet, dass ein Feed-Eintrag mit fehlerhaftem Port die Link-Suche nicht abbricht."""
+        print("\n[TEST] test_malformed_feed_link_does_not_abort_link_search")
+        feed_xml = b"""<rss><channel>
+            <item><link>https://example.com:443x/a</link></item>
+            <item><link>https://example.com/news/b</link></item>
+        </channel></rss>"""
+        MockHttpClient.return_value.fetch.return_value = FetchResult("https://example.com/feed", content=feed_xml)
+
+        self.link_finder = LinkFinder(self.mock_settings, self.mock_db_handler)
+        links = self.link_finder.process(["https://example.com/feed"])
+
+        self.assertIn("https://example.com/news/b", links)
+
+    def test_host_watermarks(self):
+        """Testet, dass pro Host der juengste Scan-Zeitpunkt als Wasserstand gilt."""
+        print("\n[TEST] test_host_watermarks")
+        history = {
+            "https://a.com/1": datetime.datetime(2025, 1, 1),
+            "https://a.com/2": datetime.datetime(2025, 2, 1),
+            "https://b.com/1": None,
+        }
+
+        self.assertEqual(host_watermarks(history),
+                         {"a.com": datetime.datetime(2025, 2, 1, tzinfo=datetime.timezone.utc)})
+
+    def test_filter_links_by_feed_dates(self):
+        """Testet das Verwerfen alter Feed-Eintraege und die Wiederaufnahme aktualisierter Eintraege."""
+        print("\n[TEST] test_filter_links_by_feed_dates")
+        now = datetime.datetime.now(datetime.timezone.utc)
+        last_scan = (now - datetime.timedelta(days=10)).replace(tzinfo=None)
+        entry_dates = {
+            "https://site.com/ancient": now - datetime.timedelta(days=400),
+            "https://site.com/unchanged": now - datetime.timedelta(days=12),
+            "https://site.com/updated": now - datetime.timedelta(days=2),
+            "https://site.com/fresh": now - datetime.timedelta(hours=3),
+        }
+        scan_history = {
+            "https://site.com/unchanged": last_scan,
+            "https://site.com/updated": last_scan,
+            "https://site.com/html-only": last_scan,
+        }
+        links = list(entry_dates) + ["https://site.com/html-only"]
+
+        actual = filter_links_by_timestamp(links, scan_history, entry_dates=entry_dates, max_age_days=30)
+
+        self.assertEqual(actual, ["https://site.com/updated", "https://site.com/fresh", "https://site.com/html-only"])
+
+    def test_entry_timestamp_prefers_latest_update(self):
+        """Testet, dass der juengere Zeitpunkt aus updated/published verwendet wird."""
+        print("\n[TEST] test_entry_timestamp_prefers_latest_update")
+        entry = FeedParserDict(published_parsed=time.struct_time((2024, 1, 5, 8, 0, 0, 4, 5, 0)),
+                               updated_parsed=time.struct_time((2025, 3, 1, 12, 30, 0, 5, 60, 0)))
+
+        self.assertEqual(entry_timestamp(entry),
+                         datetime.datetime(2025, 3, 1, 12, 30, tzinfo=datetime.timezone.utc))
+        self.assertIsNone(entry_timestamp(FeedParserDict(link="https://site.com/x")))
 
     @patch('crawler.processors.a_link_finder.LinkFinder._process_source')
     def test_process_with_scan_history_filter(self, mock_process_source):
@@ -1,8 +1,12 @@
 import unittest
-from unittest.mock import patch, call
+import time
+from types import SimpleNamespace
+from unittest.mock import patch, call, MagicMock
 from bs4 import BeautifulSoup
 
+from crawler.common.http_client import FetchOutcome, FetchResult
 from crawler.processors.b_content_extractor import ContentExtractor
+from settings.user_settings import UserSettings
 
 
 class TestContentExtractor(unittest.TestCase):
@@ -12,8 +16,18 @@ class TestContentExtractor(unittest.TestCase):
 
     def setUp(self):
         """Erstellt eine saubere ContentExtractor-Instanz vor jedem Test."""
+        self.mock_settings = MagicMock(spec=UserSettings)
+        self.mock_settings.fetch_engine = "threads"
+        self.mock_settings.max_requests_in_flight = 10
+        self.mock_settings.max_requests_per_host = 2
+        self.mock_settings.concurrency = {"initial": 2, "min": 1, "max": 4, "per_host_initial": 1}
+        self.mock_settings.feed_fulltext_min_chars = 100
+        self.mock_settings.text_extraction = "tree"
+        self.mock_settings.parse_pool = {"enabled": False}
+        self.mock_settings.article_budget = {"enabled": False}
+
         # Diese Instanz wird in den Tests, die HttpClient mocken, neu erstellt.
-        self.extractor = ContentExtractor()
+        self.extractor = ContentExtractor(self.mock_settings)
 
     @patch('crawler.processors.b_content_extractor.HttpClient')
     def test_extract_worker_success(self, MockHttpClient):
@@ -32,33 +46,75 @@ class TestContentExtractor(unittest.TestCase):
             </div>
         </body></html>
         """
-        mock_http_instance.get_soup.return_value = BeautifulSoup(html_content, 'html.parser')
+        mock_http_instance.fetch.return_value = FetchResult(url, content=html_content.encode())
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
 
-        extractor = ContentExtractor()
+        extractor = ContentExtractor(self.mock_settings)
         expected_content = "Test Title\nThis is the main article content that should be long enough."
 
         result_url, actual_content = extractor._extract_worker(url)
 
         self.assertEqual(result_url, url)
         self.assertEqual(actual_content, expected_content)
-        mock_http_instance.get_soup.assert_called_once_with(url)
+        mock_http_instance.fetch.assert_called_once_with(url, revalidate=True, store_validators=False)
 
+    @patch('crawler.processors.b_content_extractor.time.sleep')
     @patch('crawler.processors.b_content_extractor.HttpClient')
-    def test_extract_worker_network_error(self, MockHttpClient):
+    def test_extract_worker_network_error(self, MockHttpClient, mock_sleep):
         """Testet, dass der Worker bei einem Netzwerkfehler None zurückgibt."""
         print("\n[TEST] test_extract_worker_network_error")
 
         mock_http_instance = MockHttpClient.return_value
-        mock_http_instance.get_soup.return_value = None  # Simuliere einen permanenten Fehler
+        mock_http_instance.fetch.return_value = FetchResult("https://example.com/network-error",
+                                                            FetchOutcome.NETWORK_ERROR,
+                                                            error="down")  # Simuliere einen anhaltenden Fehler
 
-        extractor = ContentExtractor()
+        extractor = ContentExtractor(self.mock_settings)
         url = "https://example.com/network-error"
 
         result_url, actual_content = extractor._extract_worker(url)
 
         self.assertEqual(result_url, url)
         self.assertIsNone(actual_content)
-        self.assertEqual(mock_http_instance.get_soup.call_count, 3)
+        self.assertEqual(mock_http_instance.fetch.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch('crawler.processors.b_content_extractor.time.sleep')
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_extract_worker_permanent_error_not_retried(self, MockHttpClient, mock_sleep):
+        """Testet, dass dauerhafte Fehler wie 404 nicht wiederholt werden."""
+        print("\n[TEST] test_extract_worker_permanent_error_not_retried")
+        url = "https://example.com/gone"
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.return_value = FetchResult(url, FetchOutcome.CLIENT_ERROR, status_code=404)
+
+        extractor = ContentExtractor(self.mock_settings)
+        result_url, actual_content = extractor._extract_worker(url)
+
+        self.assertIsNone(actual_content)
+        mock_http_instance.fetch.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('crawler.common.retry_policy.random.uniform', return_value=0.0)
+    @patch('crawler.processors.b_content_extractor.time.sleep')
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_extract_worker_honours_retry_after(self, MockHttpClient, mock_sleep, mock_uniform):
+        """Testet, dass die Wartezeit aus dem Retry-After-Header uebernommen wird."""
+        print("\n[TEST] test_extract_worker_honours_retry_after")
+        url = "https://example.com/busy"
+        html_content = "<html><body><article><p>This is the main article content that should be long enough.</p></article></body></html>"
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = [
+            FetchResult(url, FetchOutcome.THROTTLED, status_code=429, retry_after=7.0),
+            FetchResult(url, content=html_content.encode())
+        ]
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+
+        extractor = ContentExtractor(self.mock_settings)
+        result_url, actual_content = extractor._extract_worker(url)
+
+        self.assertIsNotNone(actual_content)
+        mock_sleep.assert_called_once_with(7.0)
 
     @patch('crawler.processors.b_content_extractor.HttpClient')
     def test_extract_worker_no_content_found(self, MockHttpClient):
@@ -67,15 +123,66 @@ class TestContentExtractor(unittest.TestCase):
 
         mock_http_instance = MockHttpClient.return_value
         html_content = "<html><body><article></article></body></html>"
-        mock_http_instance.get_soup.return_value = BeautifulSoup(html_content, 'html.parser')
-
-        extractor = ContentExtractor()
         url = "https://example.com/no-content"
+        mock_http_instance.fetch.return_value = FetchResult(url, content=html_content.encode())
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+
+        extractor = ContentExtractor(self.mock_settings)
+
+        result_url, actual_content = extractor._extract_worker(url)
+
+        self.assertEqual(result_url, url)
+        self.assertIsNone(actual_content)
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_extract_worker_not_modified(self, MockHttpClient):
+        """Testet, dass eine unveraenderte Seite (304) ohne Wiederholung und ohne Parsing uebersprungen wird."""
+        print("\n[TEST] test_extract_worker_not_modified")
 
+        mock_http_instance = MockHttpClient.return_value
+        url = "https://example.com/unchanged"
+        mock_http_instance.fetch.return_value = FetchResult(url, FetchOutcome.NOT_MODIFIED, status_code=304)
+
+        extractor = ContentExtractor(self.mock_settings)
         result_url, actual_content = extractor._extract_worker(url)
 
         self.assertEqual(result_url, url)
         self.assertIsNone(actual_content)
+        mock_http_instance.fetch.assert_called_once_with(url, revalidate=True, store_validators=False)
+        mock_http_instance.parse_html.assert_not_called()
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_validators_are_stored_only_for_extracted_articles(self, MockHttpClient):
+        """Testet, dass ETag/Last-Modified erst nach erfolgreicher Extraktion gespeichert werden."""
+        print("\n[TEST] test_validators_are_stored_only_for_extracted_articles")
+        pages = {
+            "https://example.com/good": b"<body><article><p>" + b"Ein ausreichend langer Artikeltext. " * 5 + b"</p></article></body>",
+            "https://example.com/short": b"<body><article><p>Zu kurz.</p></article></body>",
+        }
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(
+            url, content=pages[url], validators={'ETag': f'"{url}"'})
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+
+        actual_map = ContentExtractor(self.mock_settings).process(list(pages))
+
+        self.assertEqual(list(actual_map['texts']), [0])
+        mock_http_instance.remember_validators.assert_called_once_with(
+            "https://example.com/good", {'ETag': '"https://example.com/good"'})
+
+    @patch('crawler.processors.b_content_extractor.ContentExtractor._extract_worker')
+    def test_process_submits_urls_round_robin_by_host(self, mock_extract_worker):
+        """Testet, dass ein nach Host gruppierter Batch reihum an die Worker geht, die Ergebnisse aber zugeordnet bleiben."""
+        print("\n[TEST] test_process_submits_urls_round_robin_by_host")
+        urls = ["https://a.com/1", "https://a.com/2", "https://a.com/3", "https://b.com/1"]
+        mock_extract_worker.side_effect = lambda url: (url, f"Text von {url}")
+        self.mock_settings.concurrency = {"max": 1}
+
+        actual_map = ContentExtractor(self.mock_settings).process(urls)
+
+        self.assertEqual([c.args[0] for c in mock_extract_worker.call_args_list],
+                         ["https://a.com/1", "https://b.com/1", "https://a.com/2", "https://a.com/3"])
+        self.assertEqual(actual_map['texts'][3], "Text von https://b.com/1")
 
     @patch('crawler.processors.b_content_extractor.ContentExtractor._extract_worker')
     def test_process_method_parallel_execution(self, mock_extract_worker):
@@ -100,7 +207,10 @@ class TestContentExtractor(unittest.TestCase):
             'texts': {
                 0: "Content for article 1",
                 2: "Content for article 3"
-            }
+            },
+            'budgets': {},
+            'abandoned': {},
+            'pending': []
         }
 
         actual_map = self.extractor.process(urls)
@@ -110,6 +220,230 @@ class TestContentExtractor(unittest.TestCase):
         expected_calls = [call(urls[0]), call(urls[1]), call(urls[2])]
         mock_extract_worker.assert_has_calls(expected_calls, any_order=True)
 
+    @patch('crawler.common.async_fetcher.HttpClient.fetch')
+    def test_process_method_asyncio_engine(self, mock_fetch):
+        """Testet, dass die asynchrone Engine die geladenen Bytes an die bestehende Extraktion uebergibt."""
+        print("\n[TEST] test_process_method_asyncio_engine")
+        self.mock_settings.fetch_engine = "asyncio"
+        html_content = b"""
+        <html><body>
+            <div class="articlebody"><p>This is the main article content that should be long enough.</p></div>
+        </body></html>
+        """
+        mock_fetch.side_effect = lambda url, revalidate, paced, store_validators: (
+            FetchResult(url, FetchOutcome.NETWORK_ERROR, error="down") if url.endswith("error") else FetchResult(url, content=html_content))
+        urls = ["https://example.com/article1", "https://other.com/article2-error"]
+
+        extractor = ContentExtractor(self.mock_settings)
+        with patch('crawler.common.async_fetcher.asyncio.sleep'):
+            actual_map = extractor.process(urls)
+
+        self.assertEqual(actual_map['urls'], urls)
+        self.assertEqual(actual_map['texts'],
+                         {0: "This is the main article content that should be long enough."})
+
+    @patch('crawler.processors.b_content_extractor.ContentExtractor._extract_worker')
+    def test_process_uses_full_text_from_feed(self, mock_extract_worker):
+        """Testet, dass nur Artikel ohne vollstaendigen Feed-Body geladen werden."""
+        print("\n[TEST] test_process_uses_full_text_from_feed")
+        paragraph = "<p>APT99 nutzt die Domain evil.example fuer die Verteilung der Malware.</p>"
+        feed_contents = {
+            "https://example.com/full": f"<h2>Analyse</h2>{paragraph * 3}<script>x()</script>",
+            "https://example.com/teaser": f"{paragraph * 3}<p>Continue reading &raquo;</p>",
+            "https://example.com/short": "<p>Kurz.</p>",
+        }
+        urls = list(feed_contents) + ["https://example.com/plain"]
+        mock_extract_worker.side_effect = lambda url: (url, f"Geladen: {url}")
+
+        actual_map = self.extractor.process(urls, feed_contents)
+
+        self.assertTrue(actual_map['texts'][0].startswith("Analyse\nAPT99 nutzt"))
+        self.assertNotIn("x()", actual_map['texts'][0])
+        self.assertEqual(actual_map['texts'][1], "Geladen: https://example.com/teaser")
+        self.assertEqual(actual_map['texts'][2], "Geladen: https://example.com/short")
+        self.assertEqual(actual_map['texts'][3], "Geladen: https://example.com/plain")
+        self.assertEqual(mock_extract_worker.call_count, 3)
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_process_uses_rel_canonical_and_dedups(self, MockHttpClient):
+        """Testet, dass rel=canonical die gespeicherte URL bestimmt und Duplikate nur einmal extrahiert werden."""
+        print("\n[TEST] test_process_uses_rel_canonical_and_dedups")
+        html_content = b"""<html><head><link rel="canonical" href="https://example.com/story"></head><body>
+            <div class="articlebody"><p>This is the main article content that should be long enough.</p></div>
+        </body></html>"""
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(url, content=html_content)
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+        urls = ["https://example.com/story-amp", "https://mirror.example.com/story"]
+
+        extractor = ContentExtractor(self.mock_settings)
+        actual_map = extractor.process(urls)
+
+        self.assertEqual(actual_map['urls'], ["https://example.com/story", "https://mirror.example.com/story"])
+        self.assertEqual(list(actual_map['texts']), [0])
+        self.assertEqual(urls, ["https://example.com/story-amp", "https://mirror.example.com/story"])
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_learned_content_profile_is_tried_first(self, MockHttpClient):
+        """
+        Testet, dass der Keyword-Container als Domain-Profil gespeichert und beim naechsten Lauf
+        zuerst verwendet wird; artikelspezifische ids und Klassen (mit Ziffern) gehen nicht ins Profil ein.
+        """
+        print("\n[TEST] test_learned_content_profile_is_tried_first")
+        pages = {
+            "https://example.com/a": b'<body><div id="post-4711" class="entry-content post-4711"><p>Erster Artikel mit ausreichend langem Inhalt fuer den Test.</p></div></body>',
+            "https://example.com/b": b'<body><main><p>Navigation</p></main><div class="entry-content"><p>Zweiter Artikel mit ausreichend langem Inhalt fuer den Test.</p></div></body>',
+        }
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(url, content=pages[url])
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+        mock_db_handler = MagicMock()
+        mock_db_handler.get_content_profiles.return_value = {}
+
+        extractor = ContentExtractor(self.mock_settings, mock_db_handler)
+        extractor.process(["https://example.com/a"])
+        mock_db_handler.save_content_profiles.assert_called_once_with({"example.com": ("keyword", "div.entry-content")})
+
+        mock_db_handler.get_content_profiles.return_value = {"example.com": ("keyword", "div.entry-content")}
+        actual_map = extractor.process(["https://example.com/b"])
+
+        self.assertTrue(actual_map['texts'][0].startswith("Zweiter Artikel"))
+        self.assertEqual(mock_db_handler.save_content_profiles.call_count, 1)
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_streaming_mode_extracts_without_tree(self, MockHttpClient):
+        """Testet den Streaming-Modus inklusive rel=canonical und den Rueckfall auf den DOM-Baum ohne Container."""
+        print("\n[TEST] test_streaming_mode_extracts_without_tree")
+        pages = {
+            "https://example.com/a": b"""<html><head><link rel="canonical" href="/story-a"></head><body>
+                <nav><p>Menu</p></nav><div class="article-body"><h2>Analyse</h2>
+                <p>APT99 nutzt die Domain evil.example fuer die Verteilung der Malware.</p></div></body></html>""",
+            "https://example.com/b": b"""<body><div class="entry-content">
+                <p>Ohne bekannten Container wird der Text ueber den DOM-Baum extrahiert.</p></div></body>""",
+        }
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(url, content=pages[url])
+        mock_http_instance.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+        self.mock_settings.text_extraction = "streaming"
+
+        extractor = ContentExtractor(self.mock_settings)
+        actual_map = extractor.process(list(pages))
+
+        self.assertEqual(actual_map['urls'], ["https://example.com/story-a", "https://example.com/b"])
+        self.assertEqual(actual_map['texts'][0],
+                         "Analyse\nAPT99 nutzt die Domain evil.example fuer die Verteilung der Malware.")
+        self.assertTrue(actual_map['texts'][1].startswith("Ohne bekannten Container"))
+        mock_http_instance.parse_html.assert_called_once()
+
+    def test_parse_pool_parses_in_separate_processes(self):
+        """Testet die zweistufige Extraktion: Downloads in Threads, Parsen im Prozess-Pool inkl. canonical und Profilen."""
+        print("\n[TEST] test_parse_pool_parses_in_separate_processes")
+        pages = {
+            "https://example.com/a": b"""<html><head><link rel="canonical" href="/story-a"></head><body>
+                <div class="articlebody"><p>Erster Artikel mit ausreichend langem Inhalt fuer den Test.</p></div></body></html>""",
+            "https://example.com/b": b"""<body><article><p>Zweiter Artikel mit ausreichend langem Inhalt fuer den Test.</p></article></body>""",
+            "https://example.com/missing": None,
+        }
+        settings = SimpleNamespace(fetch_engine="threads", concurrency={"max": 2}, text_extraction="tree",
+                                   parse_pool={"enabled": True, "max_workers": 2}, article_budget={"enabled": False})
+        extractor = ContentExtractor(settings)
+        extractor._fetch_document = lambda url: FetchResult(url, content=pages[url]) if pages[url] else None
+
+        actual_map = extractor.process(list(pages))
+
+        self.assertEqual(actual_map['urls'][:2], ["https://example.com/story-a", "https://example.com/b"])
+        self.assertTrue(actual_map['texts'][0].startswith("Erster Artikel"))
+        self.assertTrue(actual_map['texts'][1].startswith("Zweiter Artikel"))
+        self.assertNotIn(2, actual_map['texts'])
+        self.assertIn(extractor.content_profiles["example.com"], [("known", "div.articlebody"), ("semantic", "article")])
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_article_budget_abandons_and_light_retry(self, MockHttpClient):
+        """
+        Testet den Abbruch am Zeitbudget (mit Grund) und den erneuten Versuch mit der leichteren
+        Strategie, der ohne Conditional GET laedt, obwohl der Server sonst mit 304 antwortet.
+        """
+        print("\n[TEST] test_article_budget_abandons_and_light_retry")
+        url = "https://example.com/huge"
+        page = b"<body><div><p>" + b"Sehr langer Artikel ohne bekannten Container. " * 20 + b"</p></div></body>"
+        mock_http_instance = MockHttpClient.return_value
+        mock_http_instance.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(
+            url, FetchOutcome.THROTTLED, status_code=429, retry_after=10)
+        self.mock_settings.article_budget = {"enabled": True, "seconds": 5, "light_max_chars": 60}
+
+        extractor = ContentExtractor(self.mock_settings)
+        actual_map = extractor.process([url])
+
+        self.assertEqual(actual_map['texts'], {})
+        self.assertEqual(actual_map['abandoned'], {url: "budget_exceeded:fetch"})
+
+        mock_http_instance.fetch.side_effect = lambda url, revalidate, store_validators: (
+            FetchResult(url, FetchOutcome.NOT_MODIFIED, status_code=304) if revalidate else FetchResult(url, content=page))
+        actual_map = extractor.process([url], light_urls={url})
+
+        self.assertEqual(actual_map['texts'][0], ("Sehr langer Artikel ohne bekannten Container. " * 2)[:60])
+        self.assertEqual(actual_map['abandoned'], {})
+        self.assertLessEqual(actual_map['budgets'][0], 5)
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_scheduler_wait_does_not_count_against_budget(self, MockHttpClient):
+        """Testet, dass nur die Dauer der Anfrage (elapsed), nicht das Warten auf den Host-Slot, aufs Budget zaehlt."""
+        print("\n[TEST] test_scheduler_wait_does_not_count_against_budget")
+        page = b"<body><article><p>" + b"Kurzer Artikel, der lange auf seinen Host-Slot warten musste. " * 2 + b"</p></article></body>"
+        MockHttpClient.return_value.fetch.side_effect = lambda url, revalidate, store_validators: (
+            time.sleep(0.1) or FetchResult(url, content=page, elapsed=0.01))
+        MockHttpClient.return_value.parse_html.side_effect = lambda content, encoding=None: BeautifulSoup(content, 'html.parser')
+        self.mock_settings.article_budget = {"enabled": True, "seconds": 0.05}
+
+        extractor = ContentExtractor(self.mock_settings)
+        actual_map = extractor.process(["https://example.com/short"])
+
+        self.assertTrue(actual_map['texts'][0].startswith("Kurzer Artikel"))
+        self.assertEqual(actual_map['abandoned'], {})
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_temporary_fetch_failures_are_reported_as_pending(self, MockHttpClient):
+        """Testet, dass offene Circuits und Timeouts in `pending` landen, dauerhafte 4xx-Fehler nicht."""
+        print("\n[TEST] test_temporary_fetch_failures_are_reported_as_pending")
+        outcomes = {"https://a.com/gone": FetchOutcome.CLIENT_ERROR, "https://b.com/x": FetchOutcome.CIRCUIT_OPEN,
+                    "https://c.com/x": FetchOutcome.TIMEOUT}
+        MockHttpClient.return_value.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(
+            url, outcomes[url])
+
+        extractor = ContentExtractor(self.mock_settings)
+        with patch('crawler.processors.b_content_extractor.time.sleep'):
+            actual_map = extractor.process(list(outcomes))
+
+        self.assertEqual(actual_map['texts'], {})
+        self.assertEqual(actual_map['pending'], ["https://b.com/x", "https://c.com/x"])
+
+    def test_light_extraction_truncates_after_decoding(self):
+        """Testet, dass die leichte Strategie erst dekodiert und dann kuerzt (kein zerteiltes Umlaut-Zeichen)."""
+        print("\n[TEST] test_light_extraction_truncates_after_decoding")
+        page = ("<body><p>" + "Größere Lücke im Übertragungsweg. " * 10 + "</p></body>").encode("utf-8")
+        self.mock_settings.article_budget = {"enabled": True, "seconds": 5, "light_max_bytes": 106}
+
+        text = self.extractor._extract_text_light("https://example.com/a", FetchResult(
+            "https://example.com/a", content=page, encoding="utf-8"))
+
+        self.assertTrue(text.startswith("Größere Lücke"))
+        self.assertNotIn("\ufffd", text)
+
+    @patch('crawler.processors.b_content_extractor.HttpClient')
+    def test_budget_overrun_in_worker_thread_keeps_text(self, MockHttpClient):
+        """Testet, dass ein nicht unterbrechbares Parsen in Worker-Threads sein Ergebnis trotz Ueberschreitung behaelt."""
+        print("\n[TEST] test_budget_overrun_in_worker_thread_keeps_text")
+        MockHttpClient.return_value.fetch.side_effect = lambda url, revalidate, store_validators: FetchResult(
+            url, content=b"<p>x</p>")
+        self.mock_settings.article_budget = {"enabled": True, "seconds": 0.05}
+
+        extractor = ContentExtractor(self.mock_settings)
+        extractor._extract_text_from_document = lambda url, result: time.sleep(0.1) or "Langsam geparster Text"
+        actual_map = extractor.process(["https://example.com/slow"])
+
+        self.assertEqual(actual_map['texts'], {0: "Langsam geparster Text"})
+        self.assertEqual(actual_map['abandoned'], {})
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,7 +2,8 @@ import datetime
 
 from sqlalchemy import func
 from .database_handler_base import DatabaseHandlerBase, _normalize_name
-from .database_models import IOC, Sighting, APT, Country, CVE, ArticleScanHistory
+from .database_models import IOC, Sighting, APT, Country, CVE, ArticleScanHistory, FrontierEntry, ContentProfile, \
+    SourceFetch
 
 
 class CrawlerDBHandler(DatabaseHandlerBase):
@@ -126,14 +127,19 @@ class CrawlerDBHandler(DatabaseHandlerBase):
                 print(f"[DB Handler] Fehler beim Laden des Scan-Verlaufs: {e}")
                 return {}
 
-    def update_article_scan_history(self, processed_urls: list):
+    def update_article_scan_history(self, processed_urls: list, fingerprints: dict | None = None,
+                                    extracted_urls: set | None = None):
         """
         Aktualisiert den Scan-Zeitstempel fuer eine Liste von URLs.
-        Fuegt neue URLs hinzu, falls sie noch nicht existieren.
+        Fuegt neue URLs hinzu, falls sie noch nicht existieren. Optional wird je URL der
+        SimHash-Fingerprint des extrahierten Textes gespeichert. Nur fuer URLs, aus denen
+        tatsaechlich Text extrahiert wurde (`extracted_urls`), werden Abbruchgrund und
+        -zaehler zurueckgesetzt; ein 304 oder Fehlabruf gilt nicht als erfolgreicher Scan.
         """
         if not processed_urls:
             return
 
+        fingerprints = fingerprints or {}
         print(f"[DB Handler] Aktualisiere Scan-Verlauf fuer {len(processed_urls)} URLs...")
         with self.Session() as session:
             try:
@@ -142,7 +148,7 @@ class CrawlerDBHandler(DatabaseHandlerBase):
                     session.query(ArticleScanHistory.url).filter(ArticleScanHistory.url.in_(processed_urls))
                 }
 
-                urls_to_add = [url for url in processed_urls if url not in existing_urls]
+                urls_to_add = [url for url in dict.fromkeys(processed_urls) if url not in existing_urls]
 
                 if existing_urls:
                     session.query(ArticleScanHistory).filter(
@@ -151,12 +157,235 @@ class CrawlerDBHandler(DatabaseHandlerBase):
                         {ArticleScanHistory.last_scanned: datetime.datetime.now(datetime.timezone.utc)},
                         synchronize_session=False
                     )
+                    succeeded_urls = existing_urls & set(extracted_urls or ())
+                    if succeeded_urls:
+                        session.query(ArticleScanHistory).filter(
+                            ArticleScanHistory.url.in_(succeeded_urls)
+                        ).update(
+                            {ArticleScanHistory.abandon_reason: None, ArticleScanHistory.abandon_count: None},
+                            synchronize_session=False
+                        )
+                    for url in existing_urls & fingerprints.keys():
+                        session.query(ArticleScanHistory).filter(ArticleScanHistory.url == url).update(
+                            {ArticleScanHistory.simhash: f"{fingerprints[url]:016x}"}, synchronize_session=False
+                        )
 
                 if urls_to_add:
-                    new_entries = [ArticleScanHistory(url=url) for url in urls_to_add]
+                    new_entries = [
+                        ArticleScanHistory(url=url, simhash=f"{fingerprints[url]:016x}" if url in fingerprints else None)
+                        for url in urls_to_add
+                    ]
                     session.bulk_save_objects(new_entries)
 
                 session.commit()
             except Exception as e:
                 print(f"[DB Handler] FEHLER beim Aktualisieren des Scan-Verlaufs: {e}")
                 session.rollback()
+
+    def record_abandoned_articles(self, reasons: dict[str, str]) -> list[str]:
+        """
+        Vermerkt am Zeitbudget abgebrochene Artikel ({URL: Grund}) im Scan-Verlauf. Gibt die
+        URLs zurueck, die zum ersten Mal abgebrochen wurden und daher spaeter mit der
+        leichteren Strategie erneut versucht werden sollen.
+        """
+        if not reasons:
+            return []
+
+        print(f"[DB Handler] Vermerke {len(reasons)} abgebrochene Artikel im Scan-Verlauf...")
+        with self.Session() as session:
+            try:
+                existing = {entry.url: entry for entry in
+                            session.query(ArticleScanHistory).filter(ArticleScanHistory.url.in_(list(reasons)))}
+                retry_urls = []
+                for url, reason in reasons.items():
+                    entry = existing.get(url)
+                    if entry is None:
+                        entry = ArticleScanHistory(url=url)
+                        session.add(entry)
+                    entry.abandon_reason = reason
+                    entry.abandon_count = (entry.abandon_count or 0) + 1
+                    if entry.abandon_count == 1:
+                        retry_urls.append(url)
+                session.commit()
+                return retry_urls
+            except Exception as e:
+                print(f"[DB Handler] FEHLER beim Vermerken abgebrochener Artikel: {e}")
+                session.rollback()
+                return []
+
+    def get_abandoned_urls(self, urls: list[str]) -> set[str]:
+        """Gibt die URLs zurueck, deren letzter Scan am Zeitbudget abgebrochen wurde."""
+        if not urls:
+            return set()
+        with self.Session() as session:
+            try:
+                return {url for (url,) in session.query(ArticleScanHistory.url).filter(
+                    ArticleScanHistory.url.in_(urls), ArticleScanHistory.abandon_reason.isnot(None))}
+            except Exception as e:
+                print(f"[DB Handler] Fehler beim Laden abgebrochener Artikel: {e}")
+                return set()
+
+    def get_article_fingerprints(self) -> dict[str, int]:
+        """Gibt die gespeicherten SimHash-Fingerprints aller bereits verarbeiteten Artikel zurueck."""
+        with self.Session() as session:
+            try:
+                rows = session.query(ArticleScanHistory.url, ArticleScanHistory.simhash).filter(
+                    ArticleScanHistory.simhash.isnot(None)
+                ).all()
+                return {url: int(fingerprint, 16) for url, fingerprint in rows}
+            except Exception as e:
+                print(f"[DB Handler] Fehler beim Laden der Artikel-Fingerprints: {e}")
+                return {}
+
+    def add_duplicate_sightings(self, duplicates: dict[str, str]):
+        """
+        Uebernimmt fuer Beinahe-Duplikate ({neue URL: Original-URL}) die Sightings des
+        Originalartikels: jede IOC-Sichtung wird mit der neuen Quelle erneut erfasst,
+        ohne den Text ein zweites Mal zu analysieren.
+        """
+        if not duplicates:
+            return
+
+        print(f"[DB Handler] Uebernehme Sightings fuer {len(duplicates)} Beinahe-Duplikate...")
+        with self.Session() as session:
+            try:
+                now = datetime.datetime.now(datetime.timezone.utc)
+                for new_url, original_url in duplicates.items():
+                    known_iocs = {ioc_id for (ioc_id,) in
+                                  session.query(Sighting.ioc_id).filter(Sighting.source_article_url == new_url)}
+                    for original in session.query(Sighting).filter(Sighting.source_article_url == original_url).all():
+                        if original.ioc_id in known_iocs:
+                            continue
+                        known_iocs.add(original.ioc_id)
+                        new_sighting = Sighting(
+                            ioc_id=original.ioc_id, source_article_url=new_url, sighting_timestamp=now,
+                            context_snippet=original.context_snippet, country_id=original.country_id
+                        )
+                        new_sighting.apts.extend(original.apts)
+                        new_sighting.countries.extend(original.countries)
+                        new_sighting.cves.extend(original.cves)
+                        session.add(new_sighting)
+                session.commit()
+            except Exception as e:
+                print(f"[DB Handler] FEHLER beim Uebernehmen der Duplikat-Sightings: {e}")
+                session.rollback()
+
+    def add_to_frontier(self, entries: list[tuple[str, int, int]], kind: str = 'article'):
+        """
+        Fuegt (URL, Tiefe, Prioritaet)-Eintraege in die Crawl-Frontier ein. Bereits bekannte
+        Artikel werden wieder auf 'pending' gesetzt (z.B. nach einer Aktualisierung);
+        bereits expandierte Listenseiten bleiben erledigt.
+        """
+        if not entries:
+            return
+
+        print(f"[DB Handler] Fuege {len(entries)} Eintraege ({kind}) in die Frontier ein...")
+        with self.Session() as session:
+            try:
+                urls = [url for url, _, _ in entries]
+                existing = {entry.url: entry for entry in
+                            session.query(FrontierEntry).filter(FrontierEntry.url.in_(urls))}
+                for url, depth, priority in entries:
+                    entry = existing.get(url)
+                    if entry is None:
+                        entry = FrontierEntry(url=url, kind=kind, depth=depth, priority=priority)
+                        session.add(entry)
+                        existing[url] = entry
+                        continue
+                    if entry.kind != kind:
+                        continue
+                    entry.depth = min(entry.depth, depth)
+                    if entry.status == 'pending':
+                        entry.priority = max(entry.priority, priority)
+                    elif kind == 'article':
+                        entry.status, entry.priority = 'pending', priority
+                session.commit()
+            except Exception as e:
+                print(f"[DB Handler] FEHLER beim Befuellen der Frontier: {e}")
+                session.rollback()
+
+    def get_frontier_batch(self, limit: int, kind: str = 'article') -> list[tuple[str, int]]:
+        """Gibt die naechsten offenen Frontier-Eintraege als (URL, Tiefe) nach Prioritaet sortiert zurueck."""
+        with self.Session() as session:
+            try:
+                rows = session.query(FrontierEntry.url, FrontierEntry.depth).filter(
+                    FrontierEntry.kind == kind, FrontierEntry.status == 'pending'
+                ).order_by(
+                    FrontierEntry.priority.desc(), FrontierEntry.discovered_at, FrontierEntry.id
+                ).limit(limit).all()
+                return [(url, depth) for url, depth in rows]
+            except Exception as e:
+                print(f"[DB Handler] Fehler beim Lesen der Frontier: {e}")
+                return []
+
+    def mark_frontier_done(self, urls: list[str]):
+        """Markiert Frontier-Eintraege als erledigt."""
+        if not urls:
+            return
+        with self.Session() as session:
+            try:
+                session.query(FrontierEntry).filter(FrontierEntry.url.in_(urls)).update(
+                    {FrontierEntry.status: 'done'}, synchronize_session=False
+                )
+                session.commit()
+            except Exception as e:
+                print(f"[DB Handler] FEHLER beim Aktualisieren der Frontier: {e}")
+                session.rollback()
+
+    def get_content_profiles(self) -> dict[str, tuple[str, str]]:
+        """Gibt die gelernten Inhaltscontainer-Profile als {Domain: (Strategie, Selektor)} zurueck."""
+        with self.Session() as session:
+            try:
+                return {profile.domain: (profile.strategy, profile.selector)
+                        for profile in session.query(ContentProfile).all()}
+            except Exception as e:
+                print(f"[DB Handler] Fehler beim Laden der Inhaltsprofile: {e}")
+                return {}
+
+    def save_content_profiles(self, profiles: dict[str, tuple[str, str]]):
+        """Speichert neue bzw. geaenderte Inhaltscontainer-Profile ({Domain: (Strategie, Selektor)})."""
+        if not profiles:
+            return
+        with self.Session() as session:
+            try:
+                existing = {profile.domain: profile for profile in
+                            session.query(ContentProfile).filter(ContentProfile.domain.in_(list(profiles)))}
+                for domain, (strategy, selector) in profiles.items():
+                    profile = existing.get(domain)
+                    if profile is None:
+                        session.add(ContentProfile(domain=domain, strategy=strategy, selector=selector))
+                    else:
+                        profile.strategy, profile.selector = strategy, selector
+                session.commit()
+            except Exception as e:
+                print(f"[DB Handler] FEHLER beim Speichern der Inhaltsprofile: {e}")
+                session.rollback()
+
+    def get_source_fetch_times(self) -> dict[str, datetime.datetime]:
+        """Gibt den letzten erfolgreichen Abruf pro Quell-URL als {URL: Zeitpunkt (UTC)} zurueck."""
+        with self.Session() as session:
+            try:
+                return {fetch.url: fetch.last_fetched.replace(tzinfo=datetime.timezone.utc)
+                        for fetch in session.query(SourceFetch).all()}
+            except Exception as e:
+                print(f"[DB Handler] Fehler beim Laden der Quell-Abrufzeiten: {e}")
+                return {}
+
+    def update_source_fetch_times(self, fetch_times: dict[str, datetime.datetime]):
+        """Speichert den Zeitpunkt des letzten erfolgreichen Abrufs pro Quell-URL."""
+        if not fetch_times:
+            return
+        with self.Session() as session:
+            try:
+                existing = {fetch.url: fetch for fetch in
+                            session.query(SourceFetch).filter(SourceFetch.url.in_(list(fetch_times)))}
+                for url, fetched_at in fetch_times.items():
+                    fetch = existing.get(url)
+                    if fetch is None:
+                        session.add(SourceFetch(url=url, last_fetched=fetched_at))
+                    else:
+                        fetch.last_fetched = fetched_at
+                session.commit()
+            except Exception as e:
+                print(f"[DB Handler] FEHLER beim Speichern der Quell-Abrufzeiten: {e}")
+                session.rollback()
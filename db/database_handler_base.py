@@ -1,5 +1,5 @@
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from .database_models import Base
 
@@ -46,8 +46,26 @@ class DatabaseHandlerBase:
 
         self.engine = create_engine(db_connection_string)
         Base.metadata.create_all(self.engine)
+        self._add_missing_columns()
         self.Session = sessionmaker(bind=self.engine)
 
+    def _add_missing_columns(self):
+        """
+        Ergaenzt in bestehenden Datenbanken Spalten, die nachtraeglich zu den Modellen
+        hinzugekommen sind. create_all legt nur fehlende Tabellen an; neue Spalten muessen
+        nullable sein, damit bestehende Zeilen gueltig bleiben.
+        """
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing_columns or not column.nullable:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    print(f"[DB Handler] Ergaenze Spalte '{column.name}' in Tabelle '{table.name}'.")
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
     def _get_or_create(self, session, model, defaults=None, **kwargs):
         """
         Sucht ein Objekt. Wenn es nicht existiert, wird es mit den Suchkriterien
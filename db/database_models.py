@@ -106,11 +106,70 @@ class ArticleScanHistory(Base):
     url = Column(String, unique=True, nullable=False)
     last_scanned = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc),
                           onupdate=datetime.datetime.now(datetime.timezone.utc))
+    # 64-Bit-SimHash des extrahierten Textes (hexadezimal) fuer die Erkennung von Beinahe-Duplikaten
+    simhash = Column(String(16))
+    # Grund des letzten Abbruchs am Zeitbudget (z.B. 'budget_exceeded:parse'); None nach erfolgreichem Scan
+    abandon_reason = Column(String)
+    abandon_count = Column(Integer)
 
     def __repr__(self):
         return f"<ArticleScanHistory(url='{self.url}', last_scanned='{self.last_scanned}')>"
 
 
+class FrontierEntry(Base):
+    """
+    Persistente Crawl-Frontier: zu verarbeitende Artikel ('article') und noch nicht
+    expandierte Listen-/Archivseiten ('listing') mit Prioritaet und Tiefe.
+    """
+    __tablename__ = 'crawl_frontier'
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String, unique=True, nullable=False)
+    kind = Column(String, nullable=False, default='article', index=True)
+    depth = Column(Integer, nullable=False, default=0)
+    priority = Column(Integer, nullable=False, default=0, index=True)
+    status = Column(String, nullable=False, default='pending', index=True)
+    discovered_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    updated_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc),
+                        onupdate=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def __repr__(self):
+        return f"<FrontierEntry(url='{self.url}', kind='{self.kind}', priority={self.priority}, status='{self.status}')>"
+
+
+class ContentProfile(Base):
+    """
+    Gelerntes Inhaltscontainer-Profil pro Domain: welcher CSS-Selektor (und mit welcher
+    Strategie gefunden) den Hauptinhalt der Artikel dieser Domain enthaelt.
+    """
+    __tablename__ = 'content_profiles'
+
+    id = Column(Integer, primary_key=True)
+    domain = Column(String, unique=True, nullable=False)
+    strategy = Column(String, nullable=False)
+    selector = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc),
+                        onupdate=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def __repr__(self):
+        return f"<ContentProfile(domain='{self.domain}', strategy='{self.strategy}', selector='{self.selector}')>"
+
+
+class SourceFetch(Base):
+    """
+    Zeitpunkt des letzten erfolgreichen Abrufs einer Quell-URL (Feed oder Listenseite).
+    Dient beim Lesen von Feeds als Wasserstand, ab dem nicht mehr weitergelesen wird.
+    """
+    __tablename__ = 'source_fetches'
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String, unique=True, nullable=False)
+    last_fetched = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<SourceFetch(url='{self.url}', last_fetched='{self.last_fetched}')>"
+
+
 def setup_database(db_name="ioc_database.sqlite"):
     """Erstellt die SQLite-Datenbank und die Tabellen, falls sie nicht existieren."""
     engine = create_engine(f'sqlite:///{db_name}')
@@ -7,6 +7,8 @@ from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 
+from crawler.common.html_parser import charset_from_content_type
+from crawler.common.http_client import HttpClient
 from db.crawler_db_handler import CrawlerDBHandler
 from db.database_models import APT
 
@@ -15,10 +17,8 @@ class BasePreloader(ABC):
     """
     Eine abstrakte Basisklasse, die die gemeinsame Logik fuer alle Preloader kapselt.
     Definiert den Workflow: Fetch -> Extract -> Load.
+    Alle Abrufe laufen ueber den geteilten Verbindungspool des HttpClient.
     """
-    HEADERS = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
-    }
 
     def __init__(self, name: str, source_url: str):
         self.name = name
@@ -29,9 +29,10 @@ class BasePreloader(ABC):
         """Laedt den Inhalt der Quell-URL herunter und gibt ein BeautifulSoup-Objekt zurueck."""
         print(f"[{self.name} Preloader] Rufe Daten von {self.source_url} ab...")
         try:
-            response = requests.get(self.source_url, headers=self.HEADERS, timeout=20)
+            response = HttpClient.get(self.source_url, timeout=20)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            encoding = charset_from_content_type(response.headers.get('Content-Type'))
+            return HttpClient.parse_html(response.content, encoding)
         except requests.exceptions.RequestException as e:
             print(f"[{self.name} Preloader] FEHLER beim Abrufen der Webseite: {e}")
             return None
@@ -204,6 +205,7 @@ class PreloaderManager:
 
         self.user_settings = user_settings
         self.db_handler = db_handler
+        HttpClient.configure(self.user_settings)
 
         self.preloaders = {
             "tlds": TldPreloader(),
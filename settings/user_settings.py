@@ -29,6 +29,10 @@ class UserSettings:
             "https://blog.talosintelligence.com/"
         ]
         self.blacklist_keywords = ["/offer/", "/deals/"]
+        self.link_rules = {
+            "default": {"min_score": 3, "blacklist_keywords": [], "article_pattern": None, "article_pattern_bonus": 2},
+            "domains": {}
+        }
         self.schedule = {"day": "Montag", "time": "17:00", "enabled": False}
 
         self.export_formats = {
@@ -37,6 +41,35 @@ class UserSettings:
             "stix": True
         }
 
+        # "asyncio" aendert nur die Planung (Wartezeiten belegen keinen Thread); die Anfragen laufen
+        # in beiden Engines in hoechstens concurrency["max"] Threads. max_requests_in_flight begrenzt
+        # die gleichzeitig bearbeiteten URLs der asyncio-Engine inklusive wartender und darf daher
+        # groesser als concurrency["max"] sein.
+        self.fetch_engine = "threads"
+        self.max_requests_in_flight = 200
+        self.max_requests_per_host = 8
+        self.http_cache_enabled = True
+        self.http_cache_retention = {"max_age_days": 30, "max_entries": 20000}
+        self.max_body_bytes = 5 * 1024 * 1024
+        self.html_parser = "auto"
+        self.text_extraction = "tree"
+        self.parse_pool = {"enabled": True, "max_workers": 0}
+        self.article_budget = {"enabled": True, "seconds": 60, "light_max_bytes": 512 * 1024, "light_max_chars": 100000}
+        self.use_feed_content = True
+        self.feed_fulltext_min_chars = 800
+        self.feed_max_age_days = 30
+        self.sitemap_discovery = {"enabled": False, "max_sitemaps": 20}
+        self.frontier = {"max_depth": 2, "listing_pages_per_run": 10, "batch_size": 300}
+        self.near_duplicate = {"enabled": True, "max_distance": 3}
+        self.host_politeness = {
+            "default": {"rate": 2.0, "burst": 4, "crawl_delay": 0.0},
+            "domains": {}
+        }
+        self.concurrency = {"initial": 4, "min": 1, "max": 32, "per_host_initial": 2, "latency_factor": 3.0}
+        self.circuit_breaker = {"failure_threshold": 5, "reset_timeout": 300}
+        self.robots_txt = {"enabled": True, "ttl": 86400, "error_ttl": 600, "user_agent": "*"}
+        self.dns_cache = {"enabled": True, "ttl": 300}
+
         self.load()
 
     def load(self):
@@ -49,9 +82,31 @@ class UserSettings:
 
                 self.source_urls = settings_data.get('source_urls', self.source_urls)
                 self.blacklist_keywords = settings_data.get('blacklist_keywords', self.blacklist_keywords)
+                self.link_rules = settings_data.get('link_rules', self.link_rules)
                 self.schedule = settings_data.get('schedule', self.schedule)
                 self.last_preload_timestamp = settings_data.get(LAST_PRELOAD_KEY, None)
                 self.export_formats = settings_data.get('export_formats', self.export_formats)
+                self.fetch_engine = settings_data.get('fetch_engine', self.fetch_engine)
+                self.max_requests_in_flight = settings_data.get('max_requests_in_flight', self.max_requests_in_flight)
+                self.max_requests_per_host = settings_data.get('max_requests_per_host', self.max_requests_per_host)
+                self.http_cache_enabled = settings_data.get('http_cache_enabled', self.http_cache_enabled)
+                self.http_cache_retention = settings_data.get('http_cache_retention', self.http_cache_retention)
+                self.max_body_bytes = settings_data.get('max_body_bytes', self.max_body_bytes)
+                self.html_parser = settings_data.get('html_parser', self.html_parser)
+                self.text_extraction = settings_data.get('text_extraction', self.text_extraction)
+                self.parse_pool = settings_data.get('parse_pool', self.parse_pool)
+                self.article_budget = settings_data.get('article_budget', self.article_budget)
+                self.use_feed_content = settings_data.get('use_feed_content', self.use_feed_content)
+                self.feed_fulltext_min_chars = settings_data.get('feed_fulltext_min_chars', self.feed_fulltext_min_chars)
+                self.feed_max_age_days = settings_data.get('feed_max_age_days', self.feed_max_age_days)
+                self.sitemap_discovery = settings_data.get('sitemap_discovery', self.sitemap_discovery)
+                self.frontier = settings_data.get('frontier', self.frontier)
+                self.near_duplicate = settings_data.get('near_duplicate', self.near_duplicate)
+                self.host_politeness = settings_data.get('host_politeness', self.host_politeness)
+                self.concurrency = settings_data.get('concurrency', self.concurrency)
+                self.circuit_breaker = settings_data.get('circuit_breaker', self.circuit_breaker)
+                self.robots_txt = settings_data.get('robots_txt', self.robots_txt)
+                self.dns_cache = settings_data.get('dns_cache', self.dns_cache)
                 print(f"[UserSettings] Einstellungen erfolgreich aus '{self.filepath}' geladen.")
 
         except FileNotFoundError:
@@ -68,9 +123,31 @@ class UserSettings:
         settings_data = {
             'source_urls': self.source_urls,
             'blacklist_keywords': self.blacklist_keywords,
+            'link_rules': self.link_rules,
             'schedule': self.schedule,
             'last_preload_timestamp': self.last_preload_timestamp,
             'export_formats': self.export_formats,
+            'fetch_engine': self.fetch_engine,
+            'max_requests_in_flight': self.max_requests_in_flight,
+            'max_requests_per_host': self.max_requests_per_host,
+            'http_cache_enabled': self.http_cache_enabled,
+            'http_cache_retention': self.http_cache_retention,
+            'max_body_bytes': self.max_body_bytes,
+            'html_parser': self.html_parser,
+            'text_extraction': self.text_extraction,
+            'parse_pool': self.parse_pool,
+            'article_budget': self.article_budget,
+            'use_feed_content': self.use_feed_content,
+            'feed_fulltext_min_chars': self.feed_fulltext_min_chars,
+            'feed_max_age_days': self.feed_max_age_days,
+            'sitemap_discovery': self.sitemap_discovery,
+            'frontier': self.frontier,
+            'near_duplicate': self.near_duplicate,
+            'host_politeness': self.host_politeness,
+            'concurrency': self.concurrency,
+            'circuit_breaker': self.circuit_breaker,
+            'robots_txt': self.robots_txt,
+            'dns_cache': self.dns_cache,
             LAST_PRELOAD_KEY: self.last_preload_timestamp
         }
         try: